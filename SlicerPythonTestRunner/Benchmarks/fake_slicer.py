@@ -0,0 +1,163 @@
+"""
+Stand-in for the SlicerApp executable used by the runner benchmarks.
+
+The fake is launched with the same arguments as 3D Slicer (`--python-script <file> [Slicer args]`) and executes the
+runner's generated Python file. Instead of running PyTest, it writes a synthetic pytest-json-report file whose size and
+durations are driven by the configuration file passed with `--fake-config`:
+
+    {
+        "startupDelay_s": 2.0,       # Simulated Slicer start up time
+        "nFiles": 8,                 # Number of simulated test files
+        "nTestsPerFile": 10,         # Number of simulated tests per file
+        "testDuration_s": 0.05,      # Duration of each simulated test
+        "slowFileFactor": 1.0,       # Duration multiplier of the first test file (straggler simulation)
+        "outputSize": 100,           # Number of characters of captured stdout per test
+        "failureRatio": 0.0          # Ratio of failing tests
+    }
+"""
+
+import argparse
+import fnmatch
+import json
+import runpy
+import sys
+import time
+from pathlib import Path
+
+defaultConfig = {
+    "startupDelay_s": 2.0,
+    "nFiles": 8,
+    "nTestsPerFile": 10,
+    "testDuration_s": 0.05,
+    "slowFileFactor": 1.0,
+    "outputSize": 100,
+    "failureRatio": 0.0,
+}
+
+
+def loadConfig(configPath) -> dict:
+    config = dict(defaultConfig)
+    if configPath:
+        with open(configPath, "r") as f:
+            config.update(json.loads(f.read()))
+    return config
+
+
+def fileNames(config: dict) -> list[str]:
+    return [f"test_file_{i_file}.py" for i_file in range(config["nFiles"])]
+
+
+def testDuration(config: dict, i_file: int) -> float:
+    factor = config["slowFileFactor"] if i_file == 0 else 1.0
+    return config["testDuration_s"] * factor
+
+
+def fakeReportDict(config: dict, selectedFiles: list[str], doCollectOnly: bool, doSleep: bool = False) -> dict:
+    """
+    Creates a pytest-json-report compatible dictionary for the input configuration.
+    If doSleep is True, sleeps for each simulated test duration.
+    """
+    collectors = [{"nodeid": "", "outcome": "passed", "result": []}]
+    tests = []
+    output = "x" * config["outputSize"]
+    nFailing = int(config["nTestsPerFile"] * config["failureRatio"])
+
+    for i_file, fileName in enumerate(fileNames(config)):
+        if fileName not in selectedFiles:
+            continue
+
+        collectors[0]["result"].append({"nodeid": fileName, "type": "Module"})
+        nodeIds = [f"{fileName}::test_{i_test}" for i_test in range(config["nTestsPerFile"])]
+        collectors.append(
+            {
+                "nodeid": fileName,
+                "outcome": "passed",
+                "result": [{"nodeid": nodeId, "type": "Function", "lineno": 0} for nodeId in nodeIds],
+            }
+        )
+
+        if doCollectOnly:
+            continue
+
+        duration = testDuration(config, i_file)
+        for i_test, nodeId in enumerate(nodeIds):
+            if doSleep:
+                time.sleep(duration)
+
+            isFailing = i_test < nFailing
+            tests.append(
+                {
+                    "nodeid": nodeId,
+                    "lineno": 0,
+                    "outcome": "failed" if isFailing else "passed",
+                    "setup": {"duration": 0.0, "outcome": "passed"},
+                    "call": {
+                        "duration": duration,
+                        "outcome": "failed" if isFailing else "passed",
+                        "stdout": output,
+                        "longrepr": "assert False" if isFailing else "",
+                    },
+                    "teardown": {"duration": 0.0, "outcome": "passed"},
+                }
+            )
+
+    return {"created": time.time(), "root": Path.cwd().as_posix(), "collectors": collectors, "tests": tests}
+
+
+def writeFakeReport(jsonReportPath, config: dict, selectedFiles: list[str], doCollectOnly: bool, doSleep: bool):
+    with open(jsonReportPath, "w") as f:
+        f.write(json.dumps(fakeReportDict(config, selectedFiles, doCollectOnly, doSleep)))
+
+
+def selectFiles(config: dict, pytestArgs: list[str]) -> list[str]:
+    """
+    Returns the simulated file names matching the `-o python_files=...` filter if any.
+    """
+    patterns = [arg.split("=", 1)[1].strip("'\"") for arg in pytestArgs if arg.startswith("python_files=")]
+    files = fileNames(config)
+    if not patterns:
+        return files
+    return [f for f in files if any(fnmatch.fnmatch(f, pattern) for pattern in patterns)]
+
+
+def installFakePytest(config: dict) -> None:
+    """
+    Replaces RunnerLogic.runPyTest by a synthetic report writer.
+    """
+    sys.path.append(Path(__file__).parent.parent.resolve().as_posix())
+    from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic
+    from SlicerPythonTestRunnerLib.WorkerReport import WORKER_REPORT_KEY
+
+    def runPyTest(cls, exec_path, json_report_path, pytest_args, runnerPlugin=None, *_, **__):
+        workerTimings = runnerPlugin.timings if runnerPlugin is not None else None
+        doCollectOnly = "--collect-only" in pytest_args
+        selectedFiles = selectFiles(config, pytest_args)
+        if workerTimings is not None:
+            workerTimings.pytestStart = workerTimings.firstTestStart = time.time()
+
+        reportDict = fakeReportDict(config, selectedFiles, doCollectOnly, doSleep=True)
+        if workerTimings is not None:
+            workerTimings.sessionFinish = time.time()
+            reportDict[WORKER_REPORT_KEY] = {"timings": workerTimings.asDict()}
+
+        with open(json_report_path, "w") as f:
+            f.write(json.dumps(reportDict))
+        return 0
+
+    RunnerLogic.runPyTest = classmethod(runPyTest)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake 3D Slicer executable for the runner benchmarks.")
+    parser.add_argument("--python-script", required=True)
+    parser.add_argument("--fake-config", default=None)
+    args, _ = parser.parse_known_args(argv)
+
+    config = loadConfig(args.fake_config)
+    time.sleep(config["startupDelay_s"])
+    installFakePytest(config)
+    runpy.run_path(args.python_script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Runner benchmark suite.
+
+Measures the runner performance without a real 3D Slicer test process by substituting a fake SlicerApp executable
+(see fake_slicer.py) for RunnerLogic.slicer_path. The results are printed and optionally written as JSON for regression
+tracking.
+
+The report parsing and sequential run benchmarks run in any Python environment with the runner requirements installed:
+
+    python run_benchmarks.py --output benchmarks.json
+
+The parallel run (process pool) and TreeView benchmarks require Qt and are only executed when the script is run from
+within 3D Slicer:
+
+    Slicer --no-main-window --python-script run_benchmarks.py --output benchmarks.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import stat
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+_benchmarkDir = Path(__file__).parent.resolve()
+sys.path.extend([_benchmarkDir.as_posix(), _benchmarkDir.parent.as_posix()])
+
+import fake_slicer  # noqa: E402
+from SlicerPythonTestRunnerLib.Decorator import isRunningInSlicerGui  # noqa: E402
+from SlicerPythonTestRunnerLib.Results import Results  # noqa: E402
+from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic  # noqa: E402
+from SlicerPythonTestRunnerLib.Settings import RunSettings  # noqa: E402
+
+
+def createFakeSlicerLauncher(destDir: Path, config: dict) -> Path:
+    """
+    Writes the fake Slicer configuration and an executable launcher forwarding the Slicer args to fake_slicer.py.
+    """
+    configPath = destDir / "fake_slicer_config.json"
+    with open(configPath, "w") as f:
+        f.write(json.dumps(config))
+
+    fakeSlicerPath = _benchmarkDir / "fake_slicer.py"
+    if sys.platform == "win32":
+        launcherPath = destDir / "SlicerApp-fake.bat"
+        content = f'@"{sys.executable}" "{fakeSlicerPath}" --fake-config "{configPath}" %*\n'
+    else:
+        launcherPath = destDir / "SlicerApp-fake"
+        content = f'#!/bin/sh\nexec "{sys.executable}" "{fakeSlicerPath}" --fake-config "{configPath}" "$@"\n'
+
+    with open(launcherPath, "w") as f:
+        f.write(content)
+    launcherPath.chmod(launcherPath.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return launcherPath
+
+
+def writeTestFiles(testDir: Path, config: dict) -> None:
+    """
+    Writes empty files matching the simulated test files for the runner file pattern filters.
+    """
+    for fileName in fake_slicer.fileNames(config):
+        (testDir / fileName).touch()
+
+
+def casesConfig(nCases: int, outputSize: int) -> dict:
+    nTestsPerFile = min(nCases, 100)
+    return {
+        **fake_slicer.defaultConfig,
+        "nFiles": max(1, nCases // nTestsPerFile),
+        "nTestsPerFile": nTestsPerFile,
+        "outputSize": outputSize,
+        "failureRatio": 0.1,
+    }
+
+
+def benchmarkReportParsing(nCases: int, outputSize: int, tmpDir: Path) -> dict:
+    config = casesConfig(nCases, outputSize)
+    reportPath = tmpDir / f"report_{nCases}.json"
+    fake_slicer.writeFakeReport(reportPath, config, fake_slicer.fileNames(config), doCollectOnly=False, doSleep=False)
+
+    start = time.perf_counter()
+    results = Results.fromReportFile(reportPath)
+    parse_s = time.perf_counter() - start
+
+    return {
+        "name": "report_parsing",
+        "nCases": len(results.getAllCases()),
+        "reportSize_bytes": reportPath.stat().st_size,
+        "duration_s": parse_s,
+        "casesPerSecond": len(results.getAllCases()) / parse_s if parse_s else 0,
+    }
+
+
+def benchmarkTreeView(nCases: int, outputSize: int, tmpDir: Path) -> dict:
+    from SlicerPythonTestRunnerLib.TreeView import TreeView
+
+    config = casesConfig(nCases, outputSize)
+    reportPath = tmpDir / f"tree_report_{nCases}.json"
+    fake_slicer.writeFakeReport(reportPath, config, fake_slicer.fileNames(config), doCollectOnly=False, doSleep=False)
+    results = Results.fromReportFile(reportPath)
+
+    view = TreeView()
+    start = time.perf_counter()
+    view.appendResults(results)
+    append_s = time.perf_counter() - start
+
+    return {"name": "tree_view_append_results", "nCases": view.getCaseCount(), "duration_s": append_s}
+
+
+def workerUtilization(results: Results, startupDelay_s: float, poolSize: int, wall_s: float) -> float:
+    """
+    Ratio of the time the simulated Slicer processes were alive over the available pool time.
+    """
+    if not wall_s or not results.workerTimings:
+        return 0
+
+    busy_s = sum(t.sessionFinish - t.scriptStart + startupDelay_s for t in results.workerTimings if t.sessionFinish)
+    return busy_s / (wall_s * poolSize)
+
+
+def benchmarkSequentialRun(config: dict, tmpDir: Path) -> dict:
+    testDir = tmpDir / "sequential_tests"
+    testDir.mkdir()
+    writeTestFiles(testDir, config)
+
+    logic = RunnerLogic(slicer_path=createFakeSlicerLauncher(tmpDir, config))
+    start = time.perf_counter()
+    results = logic.runAndWaitFinished(testDir, RunSettings(doUseMainWindow=False))
+    wall_s = time.perf_counter() - start
+
+    return {
+        "name": "end_to_end_sequential",
+        "nCases": results.executedNumber,
+        "wall_s": wall_s,
+        "poolUtilization": workerUtilization(results, config["startupDelay_s"], 1, wall_s),
+        "timeToFirstTest_s": [t.timeToFirstTest for t in results.workerTimings],
+    }
+
+
+def benchmarkParallelRun(config: dict, poolSize: int, tmpDir: Path) -> dict:
+    from SlicerPythonTestRunnerLib.ProcessRunnerLogic import ProcessRunnerLogic
+
+    testDir = tmpDir / "parallel_tests"
+    testDir.mkdir()
+    writeTestFiles(testDir, config)
+
+    logic = ProcessRunnerLogic()
+    logic.logic.slicer_path = createFakeSlicerLauncher(tmpDir, config)
+
+    results = Results([])
+    logic.resultsAvailable.connect(lambda _path, pathResults: results.append(pathResults))
+
+    start = time.perf_counter()
+    logic.startTest(
+        testDir=testDir,
+        functionPattern="",
+        filePattern="",
+        runSettings=RunSettings(
+            doUseMainWindow=False, nParallelInstances=poolSize, doRunTestFilesIndependently=True, doRecordHistory=False
+        ),
+        doCollectOnly=False,
+    )
+    logic.waitForFinished()
+    wall_s = time.perf_counter() - start
+
+    timelineSummary = logic.lastTimelineSummary
+    return {
+        "name": "end_to_end_parallel",
+        "poolSize": poolSize,
+        "nCases": results.executedNumber,
+        "wall_s": wall_s,
+        "poolUtilization": timelineSummary["utilization"],
+        "startupOverhead_s": timelineSummary["startupOverhead_s"],
+        "timeToFirstTest_s": [t.timeToFirstTest for t in results.workerTimings],
+    }
+
+
+def runBenchmarks(args) -> dict:
+    runConfig = {
+        **fake_slicer.defaultConfig,
+        "startupDelay_s": args.startup_delay,
+        "nFiles": args.files,
+        "nTestsPerFile": args.tests_per_file,
+        "testDuration_s": args.test_duration,
+        "slowFileFactor": args.slow_file_factor,
+        "outputSize": args.output_size,
+    }
+
+    benchmarks = []
+    with TemporaryDirectory() as tmpDir:
+        tmpDir = Path(tmpDir)
+        for nCases in args.cases:
+            benchmarks.append(benchmarkReportParsing(nCases, args.output_size, tmpDir))
+
+        benchmarks.append(benchmarkSequentialRun(runConfig, tmpDir))
+
+        if isRunningInSlicerGui():
+            for nCases in args.cases:
+                benchmarks.append(benchmarkTreeView(nCases, args.output_size, tmpDir))
+            benchmarks.append(benchmarkParallelRun(runConfig, args.pool_size, tmpDir))
+
+    return {
+        "metadata": {
+            "created": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpuCount": os.cpu_count(),
+            "isRunningInSlicer": isRunningInSlicerGui(),
+            "fakeSlicerConfig": runConfig,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Slicer Python Test Runner benchmarks.")
+    parser.add_argument("--output", default=None, help="Path to the JSON file where the results are written.")
+    parser.add_argument("--cases", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--files", type=int, default=8, help="Number of simulated test files for end to end runs.")
+    parser.add_argument("--tests-per-file", type=int, default=10)
+    parser.add_argument("--startup-delay", type=float, default=2.0, help="Simulated Slicer start up delay (s).")
+    parser.add_argument("--test-duration", type=float, default=0.05, help="Simulated test duration (s).")
+    parser.add_argument("--slow-file-factor", type=float, default=1.0, help="Duration multiplier of the first file.")
+    parser.add_argument("--output-size", type=int, default=100, help="Captured output characters per test.")
+    parser.add_argument("--pool-size", type=int, default=4)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    resultsStr = json.dumps(runBenchmarks(args), indent=2)
+    print(resultsStr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(resultsStr)
+
+
+if __name__ == "__main__":
+    main()
+
+    if isRunningInSlicerGui():
+        import slicer
+
+        slicer.util.exit(0)
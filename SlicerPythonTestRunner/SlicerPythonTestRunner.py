@@ -37,6 +37,7 @@ class SlicerPythonTestRunner(ScriptedLoadableModule):
 class SlicerPythonTestRunnerWidget(ScriptedLoadableModuleWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.runnerWidget = None
 
     def setup(self):
         """
@@ -45,7 +46,15 @@ class SlicerPythonTestRunnerWidget(ScriptedLoadableModuleWidget):
         from SlicerPythonTestRunnerLib import RunnerWidget
 
         super().setup()
-        self.layout.addWidget(RunnerWidget())
+        self.runnerWidget = RunnerWidget()
+        self.layout.addWidget(self.runnerWidget)
+
+    def cleanup(self):
+        """
+        Called when the application closes and the module widget is destroyed.
+        """
+        if self.runnerWidget is not None:
+            self.runnerWidget.cleanup()
 
 
 class SlicerPythonTestRunnerTest(ScriptedLoadableModuleTest):
@@ -0,0 +1,62 @@
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, Optional
+
+
+def formatTime(duration_s: float) -> str:
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if abs(duration_s) >= scale:
+            return f"{duration_s / scale:.3g} {unit}"
+    return f"{duration_s / 1e-9:.3g} ns"
+
+
+@dataclass
+class BenchmarkStats:
+    """
+    Statistics of a pytest-benchmark benchmark, durations in seconds.
+    """
+
+    min: float = 0
+    max: float = 0
+    mean: float = 0
+    stddev: float = 0
+    median: float = 0
+    rounds: int = 0
+    ops: float = 0
+
+    @classmethod
+    def fromBenchmarkFixture(cls, benchmark) -> Optional["BenchmarkStats"]:
+        """
+        Returns the statistics of the input pytest-benchmark fixture, None if it didn't run.
+        """
+        metadata = getattr(benchmark, "stats", None)
+        stats = getattr(metadata, "stats", None)
+        if not stats:
+            return None
+        return cls(**{f.name: getattr(stats, f.name) for f in fields(cls)})
+
+    def asDict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def fromDict(cls, statsDict: Dict) -> "BenchmarkStats":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in statsDict.items() if k in names})
+
+    def getString(self) -> str:
+        return (
+            f"Benchmark: mean {formatTime(self.mean)} +/- {formatTime(self.stddev)}, min {formatTime(self.min)}, "
+            f"max {formatTime(self.max)}, {self.rounds} rounds"
+        )
+
+
+def benchmarkTrendString(trend: List[Dict]) -> str:
+    """
+    Returns the mean durations of the input benchmark executions, oldest first, with the change of the last execution
+    compared to the first one.
+    """
+    if not trend:
+        return ""
+
+    means = [execution["mean"] for execution in trend]
+    change = f" ({(means[-1] / means[0] - 1) * 100:+.0f}%)" if len(means) > 1 and means[0] else ""
+    return f"Mean over the last {len(means)} runs: " + " -> ".join(formatTime(m) for m in means) + change
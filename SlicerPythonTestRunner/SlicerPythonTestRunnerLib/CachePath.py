@@ -0,0 +1,18 @@
+from pathlib import Path
+
+
+def cacheDir() -> Path:
+    """
+    Returns the directory where the runner persists its caches, creating it if needed.
+    Uses 3D Slicer's cache directory when running in Slicer and the user's cache directory otherwise.
+    """
+    try:
+        import slicer
+
+        root = Path(slicer.app.cachePath)
+    except (ImportError, AttributeError):
+        root = Path.home().joinpath(".cache")
+
+    path = root.joinpath("SlicerPythonTestRunner")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
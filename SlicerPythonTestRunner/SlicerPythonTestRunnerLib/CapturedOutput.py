@@ -0,0 +1,150 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .TestProfile import profileFileName
+
+# Captured streams of a test stage in the pytest-json-report stage details
+capturedStreams = ("stdout", "stderr", "log")
+
+
+def outputsDir(jsonReportPath: Union[str, Path]) -> Path:
+    """
+    Returns the directory where the full captured outputs of a JSON report are spilled, next to the report.
+    """
+    jsonReportPath = Path(jsonReportPath)
+    return jsonReportPath.with_name(f"{jsonReportPath.stem}_outputs")
+
+
+def outputFileName(nodeid: str, when: str, stream: str) -> str:
+    """
+    Returns a file name unique to the input test node id, test stage and captured stream.
+    """
+    return Path(profileFileName(nodeid)).with_suffix(f".{when}.{stream}.log").name
+
+
+def truncateText(text: str, maxSize: int, outputPath: Union[str, Path]) -> str:
+    """
+    Keeps the beginning and the end of the input text if it is longer than maxSize characters.
+    """
+    if len(text) <= maxSize:
+        return text
+
+    half = maxSize // 2
+    marker = f"\n[... {len(text) - 2 * half} characters truncated, full output in {Path(outputPath).as_posix()} ...]\n"
+    return text[:half] + marker + text[len(text) - half :]
+
+
+def truncateLogRecords(records: List[Dict], maxSize: int, outputPath: Union[str, Path]) -> List[Dict]:
+    """
+    Keeps the first and last log records of the input records if their messages are longer than maxSize characters.
+    """
+    sizes = [len(str(record.get("msg", ""))) for record in records]
+    if sum(sizes) <= maxSize:
+        return records
+
+    half = maxSize // 2
+    nHead = _nFitting(sizes, half)
+    nTail = _nFitting(reversed(sizes[nHead:]), half)
+    marker = {
+        "name": "SlicerPythonTestRunner",
+        "levelname": "WARNING",
+        "levelno": 30,
+        "msg": f"[... {len(records) - nHead - nTail} log records truncated, full log in {Path(outputPath).as_posix()} ...]",
+    }
+    return records[:nHead] + [marker] + records[len(records) - nTail :]
+
+
+def _nFitting(sizes: Iterable[int], maxSize: int) -> int:
+    n, total = 0, 0
+    for size in sizes:
+        total += size
+        if total > maxSize:
+            break
+        n += 1
+    return n
+
+
+def logRecordsText(records: List[Dict]) -> str:
+    return "\n".join(f"[{record.get('levelname', '')}] {record.get('msg', '')}" for record in records)
+
+
+def spillStageOutput(stageDetails: Dict, nodeid: str, when: str, dirPath: Path, maxSize: int) -> Dict[str, str]:
+    """
+    Truncates the captured streams of the input pytest-json-report stage details longer than maxSize characters.
+    The full streams are written in the input directory.
+
+    :returns: Path of the spilled file by stream name.
+    """
+    spilled = {}
+    for stream in capturedStreams:
+        value = stageDetails.get(stream)
+        if not value:
+            continue
+
+        isLog = stream == "log"
+        size = sum(len(str(record.get("msg", ""))) for record in value) if isLog else len(value)
+        if size <= maxSize:
+            continue
+
+        dirPath.mkdir(parents=True, exist_ok=True)
+        outputPath = dirPath / outputFileName(nodeid, when, stream)
+        outputPath.write_text(logRecordsText(value) if isLog else value, encoding="utf-8")
+        outputPath = outputPath.resolve()
+        stageDetails[stream] = (
+            truncateLogRecords(value, maxSize, outputPath) if isLog else truncateText(value, maxSize, outputPath)
+        )
+        spilled[stream] = outputPath.as_posix()
+    return spilled
+
+
+class SpilledOutputReader:
+    """
+    Reads the spilled outputs of test cases chunk by chunk, so that huge outputs are only loaded on demand.
+    """
+
+    def __init__(self, outputPaths: Iterable[Tuple[str, Union[str, Path]]], chunkSize: int = 1024 * 1024):
+        """
+        :param outputPaths: (title, path) of the spilled files in reading order. Missing files are ignored.
+        :param chunkSize: Maximal number of bytes returned by a readChunk call.
+        """
+        self._outputs = [(title, Path(path)) for title, path in outputPaths if Path(path).is_file()]
+        self.chunkSize = chunkSize
+        self._iOutput = 0
+        self._offset = 0
+
+    def hasMore(self) -> bool:
+        return self._iOutput < len(self._outputs)
+
+    def readChunk(self) -> str:
+        """
+        Returns the next chunk of the spilled outputs, preceded by the title of the output when starting a new file.
+        """
+        if not self.hasMore():
+            return ""
+
+        title, path = self._outputs[self._iOutput]
+        header = f"{'-' * 40}[{title}]{'-' * 40}\n" if self._offset == 0 else ""
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(self.chunkSize)
+
+        # Don't split multi-byte UTF-8 characters between chunks
+        if len(data) == self.chunkSize:
+            data = data[: len(data) - _incompleteUtf8Tail(data)]
+        self._offset += len(data)
+        if self._offset >= path.stat().st_size:
+            self._iOutput += 1
+            self._offset = 0
+        return header + data.decode("utf-8", errors="replace")
+
+
+def _incompleteUtf8Tail(data: bytes) -> int:
+    """
+    Returns the number of bytes of the UTF-8 character incomplete at the end of the input data.
+    """
+    for i in range(1, min(4, len(data)) + 1):
+        byte = data[-i]
+        if byte & 0xC0 != 0x80:
+            expectedLength = 2 if byte & 0xE0 == 0xC0 else 3 if byte & 0xF0 == 0xE0 else 4 if byte & 0xF8 == 0xF0 else 1
+            return i if expectedLength > i else 0
+    return 0
@@ -1,7 +1,10 @@
 import re
 from dataclasses import dataclass, field
 from enum import IntEnum, auto, unique
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from .BenchmarkStats import BenchmarkStats
+from .MemoryProfile import MemoryProfile
 
 
 @unique
@@ -72,6 +75,14 @@ class Case:
     stdout: str = ""
     stderr: str = ""
     logs: List[str] = field(default_factory=list)
+    sceneLeaks: Dict = field(default_factory=dict)
+    memory: Optional[MemoryProfile] = None
+    profilePath: str = ""
+    durationBudget: float = 0
+    regression: str = ""
+    benchmark: Optional[BenchmarkStats] = None
+    # Paths of the spilled captured outputs by test stage and stream
+    outputPaths: Dict[str, Dict[str, str]] = field(default_factory=dict)
 
     @classmethod
     def fromExecutedTestDict(cls, case: Dict) -> "Case":
@@ -81,6 +92,7 @@ class Case:
             outcome = Outcome.unknown
 
         caseCall = case.get("call", {})
+        metadata = case.get("metadata", {})
         return cls(
             outcome=outcome,
             nodeid=case["nodeid"],
@@ -89,6 +101,12 @@ class Case:
             stdout=caseCall.get("stdout", ""),
             stderr=caseCall.get("stderr", ""),
             logs=[f"[{log['levelname']}] {log['msg']}" for log in caseCall.get("log", [])],
+            sceneLeaks=metadata.get("sceneLeaks", {}),
+            memory=MemoryProfile.fromDict(metadata["memory"]) if metadata.get("memory") else None,
+            profilePath=metadata.get("profile", ""),
+            durationBudget=metadata.get("durationBudget", 0),
+            benchmark=BenchmarkStats.fromDict(metadata["benchmark"]) if metadata.get("benchmark") else None,
+            outputPaths=metadata.get("outputs", {}),
         )
 
     @classmethod
@@ -0,0 +1,303 @@
+"""
+Command line interface of the test runner.
+
+Runs the tests of a directory in 3D Slicer processes without the runner's GUI:
+
+    cd SlicerPythonTestRunner
+    PythonSlicer -m SlicerPythonTestRunnerLib path/to/tests --parallel 4 --failed-first
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .DurationRegression import DurationRegressionChecker
+from .EnsureRequirements import ensureRequirements
+from .FileWatcher import pollChangedFiles
+from .ImportGraph import ImportGraph
+from .Results import Results
+from .ResultsHistory import ResultsHistory
+from .RunnerLogic import RunnerLogic
+from .Settings import RunSettings
+from .Sharding import shardNodeIds
+from .StartupProfile import startupPhasesString
+from .TestProfile import mergeProfiles
+
+
+def parseArgs(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="SlicerPythonTestRunner", description="Runs the PyTest tests of a directory in 3D Slicer processes."
+    )
+    parser.add_argument("testDir", help="Directory containing the tests.")
+    parser.add_argument("--slicer-path", default=None, help="Path to the Slicer executable.")
+    parser.add_argument("--settings", default=None, help="Path to a RunSettings JSON file.")
+    parser.add_argument("--file-pattern", default="", help="Only run the test files matching this pattern.")
+    parser.add_argument("-k", "--function-pattern", default="", help="PyTest -k filter expression.")
+    parser.add_argument(
+        "-n", "--parallel", type=int, default=0, help="Runs each test file in its own Slicer process with N processes."
+    )
+    parser.add_argument("--no-history", action="store_true", help="Don't store the results in the results history.")
+    parser.add_argument(
+        "--source-root",
+        action="append",
+        default=[],
+        help="Source directory of the tested code, watched in watch mode. Can be repeated.",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exits with a non-zero code if a test is slower than its duration budget or than its median duration.",
+    )
+    parser.add_argument(
+        "--profile-tests",
+        action="store_true",
+        help="Profiles each test using cProfile and prints the hot functions of the run.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Records the Slicer start up profile of each test process and prints the start up phase durations, "
+        "including module loading, scripted module initialization, slicerrc and settings loading.",
+    )
+    parser.add_argument(
+        "--watch", action="store_true", help="Reruns the test files affected by each change after the first run."
+    )
+
+    failedGroup = parser.add_mutually_exclusive_group()
+    failedGroup.add_argument(
+        "--rerun-failed", action="store_true", help="Only runs the tests which failed in their last run."
+    )
+    failedGroup.add_argument(
+        "--failed-first", action="store_true", help="Runs the tests which failed in their last run first."
+    )
+    return parser.parse_args(argv)
+
+
+class CliRunner:
+    """
+    Runs test jobs in concurrent Slicer processes and gathers their results.
+    Each job is a RunSettings instance, jobs are started in their submission order.
+    The reports are written in a new run directory of the input logic, if any.
+    """
+
+    def __init__(
+        self,
+        testDir: Path,
+        runSettings: RunSettings,
+        slicerPath: Optional[str] = None,
+        logic: Optional[RunnerLogic] = None,
+    ):
+        self.testDir = testDir
+        self.runSettings = runSettings
+        self.logic = logic or RunnerLogic(Path(slicerPath) if slicerPath else None)
+        self.logic.startNewRun(runSettings)
+        self.jobs: List[RunSettings] = []
+
+    def jobSettings(self, extraPytestArgs: Optional[List[str]] = None, nodeIds: Optional[List[str]] = None):
+        runSettings = deepcopy(self.runSettings)
+        runSettings.extraPytestArgs += extraPytestArgs or []
+        runSettings.testNodeIds = nodeIds or []
+        return runSettings
+
+    def addNodeIds(self, nodeIds: List[str], rootDir: Optional[Path] = None) -> None:
+        """
+        Adds the input node ids, relative to the PyTest root directory if given or to the test directory otherwise.
+        """
+        if not nodeIds:
+            return
+
+        nodeIdsByFile = RunSettings.absoluteNodeIdsByFile(rootDir or self.testDir, nodeIds)
+        if not self.runSettings.doRunTestFilesIndependently:
+            self.jobs.append(self.jobSettings(nodeIds=[n for fileIds in nodeIdsByFile.values() for n in fileIds]))
+            return
+
+        for fileNodeIds in nodeIdsByFile.values():
+            self.jobs.append(self.jobSettings(nodeIds=fileNodeIds))
+
+    def addFailedTests(self, history: ResultsHistory, doForgetMissingTests: bool = True) -> List[str]:
+        """
+        Adds the tests which failed in their last recorded run and are still collected. PyTest stops the whole run
+        when given a node id which doesn't exist anymore.
+
+        :param doForgetMissingTests: If True, the failed tests missing from the collection are removed from the
+         failing tests of the history. Should be False when the collection is filtered.
+        :returns: The added node ids.
+        """
+        failedNodeIds = history.failingNodeIds(self.testDir)
+        if not failedNodeIds:
+            return []
+
+        collected = self.logic.collectSubProcess(self.testDir, self.jobSettings())
+        if doForgetMissingTests:
+            history.forgetMissingTests(self.testDir, collected)
+        failedNodeIds = collected.filterCollectedNodeIds(failedNodeIds)
+        self.addNodeIds(failedNodeIds, collected.rootDir or history.lastRootDir(self.testDir))
+        return failedNodeIds
+
+    def addAllTests(self, deselectedNodeIds: List[str], durations: Optional[Dict[str, float]] = None) -> None:
+        """
+        Adds the tests of the directory except the deselected ones. When running the files independently, files whose
+        duration in the input historical durations exceeds the shard threshold are split in several jobs.
+        """
+        deselectArgs = RunSettings.pytestDeselectArgs(deselectedNodeIds)
+        if not self.runSettings.doRunTestFilesIndependently:
+            self.jobs.append(self.jobSettings(deselectArgs))
+            return
+
+        collected = self.logic.collectSubProcess(self.testDir, self.jobSettings(deselectArgs))
+        deselected = set(deselectedNodeIds)
+        nodeIdsByFile: Dict[str, List[str]] = {}
+        for case in collected.getAllCases():
+            if case.nodeid not in deselected:
+                nodeIdsByFile.setdefault(case.getRootId(), []).append(case.nodeid)
+
+        for filePath, fileNodeIds in sorted(nodeIdsByFile.items()):
+            shards = shardNodeIds(
+                fileNodeIds, durations or {}, self.runSettings.shardThreshold_s, self.runSettings.nParallelInstances
+            )
+            if len(shards) < 2:
+                self.jobs.append(self.jobSettings([*deselectArgs, *RunSettings.pytestFileFilterArgs(filePath)]))
+                continue
+
+            for shard in shards:
+                self.addNodeIds(shard, collected.rootDir)
+
+    def run(self) -> Results:
+        # Prepare the processes in the main thread as the preparation writes the runner temporary files
+        processes = [self.logic.prepareRun(self.testDir, jobSettings) for jobSettings in self.jobs]
+        nWorkers = max(1, self.runSettings.nParallelInstances if self.runSettings.doRunTestFilesIndependently else 1)
+
+        def runProcess(process) -> Results:
+            args, jsonReportPath = process
+            self.logic.runInSubProcessAndWaitFinished(args)
+            return Results.fromReportFile(jsonReportPath)
+
+        results = Results([])
+        with ThreadPoolExecutor(max_workers=nWorkers) as executor:
+            for jobResults in executor.map(runProcess, processes):
+                results.append(jobResults)
+        return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parseArgs(argv)
+    testDir = Path(args.testDir).resolve()
+    runSettings = (
+        RunSettings.fromFile(Path(args.settings))
+        if args.settings
+        else RunSettings(doUseMainWindow=False, doRunTestFilesIndependently=False)
+    )
+    runSettings.extraPytestArgs += [
+        *RunSettings.pytestPatternFilterArgs(args.function_pattern),
+        *RunSettings.pytestFileFilterArgs(args.file_pattern),
+    ]
+    if args.parallel:
+        runSettings.doRunTestFilesIndependently = True
+        runSettings.nParallelInstances = args.parallel
+
+    runSettings.sourceRoots += args.source_root
+    runSettings.doProfileTests = runSettings.doProfileTests or args.profile_tests
+    runSettings.doProfileStartup = runSettings.doProfileStartup or args.profile_startup
+    runSettings.doCheckDurationRegressions = runSettings.doCheckDurationRegressions or args.fail_on_regression
+
+    ensureRequirements(quiet=True)
+    history = ResultsHistory() if not args.no_history and runSettings.doRecordHistory else None
+    runner = CliRunner(testDir, runSettings, args.slicer_path)
+
+    failedNodeIds = []
+    if args.rerun_failed or args.failed_first:
+        failedNodeIds = runner.addFailedTests(
+            history or ResultsHistory(), doForgetMissingTests=not (args.file_pattern or args.function_pattern)
+        )
+    if not args.rerun_failed:
+        durations = ResultsHistory().meanDurations(testDir) if runSettings.shardThreshold_s > 0 else {}
+        runner.addAllTests(failedNodeIds, durations)
+
+    if not runner.jobs and not args.watch:
+        print("No failed tests to rerun.")
+        return 0
+
+    results = runAndReport(runner, history)
+    if args.profile_startup:
+        print("Start up phases measured by disabling each phase:")
+        print(startupPhasesString(runner.logic.profileStartupPhases(runSettings)))
+    if args.watch:
+        return watch(testDir, runSettings, args.slicer_path, history)
+    if args.fail_on_regression and results.getRegressionCases():
+        return 1
+    return 1 if results.failuresNumber else 0
+
+
+def runAndReport(runner: CliRunner, history: Optional[ResultsHistory]) -> Results:
+    start = time.time()
+
+    # Baselines are computed before the run results are added to the history
+    checker = None
+    if runner.runSettings.doCheckDurationRegressions:
+        baselines = (history or ResultsHistory()).durationBaselines(runner.testDir)
+        checker = DurationRegressionChecker.fromRunSettings(runner.testDir, runner.runSettings, baselines)
+
+    results = runner.run()
+    if checker is not None:
+        results.flagDurationRegressions(checker)
+    if history is not None:
+        history.addRun(runner.testDir, results, time.time() - start)
+    runner.logic.writeCoverageReport(runner.testDir.as_posix(), runner.runSettings)
+
+    if results.failuresNumber:
+        print(results.getFailingCasesString())
+    if results.getRegressionCases():
+        print(results.getRegressionsString())
+    if results.getBenchmarkCases():
+        trendF = (lambda nodeId: history.benchmarkTrend(runner.testDir, nodeId)) if history is not None else None
+        print(results.getBenchmarksString(trendF))
+    if results.getLeakingCases():
+        print(results.getSceneLeaksString())
+    if results.getProfiledMemoryCases():
+        print(results.getMemoryString())
+    if runner.runSettings.doProfileTests:
+        runProfilePath = mergeProfiles(
+            results.getProfilePaths(), Path(runner.logic.tmp_path).joinpath("run_profile.prof")
+        )
+        if runProfilePath is not None:
+            print(f"Run profile: {runProfilePath}")
+            print(results.getHotFunctionsString())
+    if results.startupProfiles:
+        print(results.getStartupProfileString())
+    if history is not None and runner.runSettings.doProfileMemory:
+        growing = history.growingMemoryTests(runner.testDir)
+        if growing:
+            print("Tests whose memory grew in each of their last runs:")
+            print("\n".join(f"  {test['nodeid']}: {test['meanGrowth']:+.1f} MB" for test in growing))
+    print(results.getSummaryString())
+    return results
+
+
+def watch(testDir: Path, runSettings: RunSettings, slicerPath: Optional[str], history: Optional[ResultsHistory]) -> int:
+    """
+    Reruns the test files affected by the changes of the test directory and source roots until interrupted.
+    Changes made while the tests are running are picked up once the run is finished.
+    """
+    # The runs are blocking: changes saved during a run are detected and rerun once it is finished instead of
+    # cancelling the run as the widget does.
+    watchedDirs = runSettings.watchedDirs(testDir)
+    importGraph = ImportGraph.cached(watchedDirs)
+    logic = RunnerLogic(Path(slicerPath) if slicerPath else None)
+    print("Watching for changes...")
+    try:
+        for changedFiles in pollChangedFiles(watchedDirs):
+            importGraph.updateFiles(changedFiles)
+            testFiles = importGraph.dependentTestFiles(changedFiles, testDir)
+            if not testFiles:
+                continue
+
+            print("Running " + ", ".join(f.relative_to(testDir).as_posix() for f in testFiles))
+            runner = CliRunner(testDir, runSettings, slicerPath, logic)
+            runner.addNodeIds([f.relative_to(testDir).as_posix() for f in testFiles])
+            runAndReport(runner, history)
+    except KeyboardInterrupt:
+        pass
+    return 0
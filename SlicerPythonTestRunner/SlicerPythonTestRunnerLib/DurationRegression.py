@@ -0,0 +1,118 @@
+import fnmatch
+import json
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .Case import Case
+from .Settings import RunSettings
+
+# Scale factor of the median absolute deviation to estimate the standard deviation of normally distributed durations
+_madToStd = 1.4826
+
+
+@dataclass
+class DurationBaseline:
+    """
+    Reference duration of a test computed from its previous passing executions.
+    """
+
+    median: float = 0
+    mad: float = 0
+    nRuns: int = 0
+
+    @classmethod
+    def fromDurations(cls, durations: List[float]) -> "DurationBaseline":
+        if not durations:
+            return cls()
+
+        median = statistics.median(durations)
+        return cls(median, statistics.median(abs(d - median) for d in durations), len(durations))
+
+
+def loadDurationBudgets(budgetsPath: Union[str, Path]) -> Dict[str, float]:
+    """
+    Loads the duration budgets JSON file mapping test node ids or node id glob patterns to their budget in seconds.
+    """
+    budgetsPath = Path(budgetsPath)
+    if not budgetsPath.is_file():
+        return {}
+
+    with open(budgetsPath, "r") as f:
+        return {pattern: float(budget) for pattern, budget in json.loads(f.read()).items()}
+
+
+class DurationRegressionChecker:
+    """
+    Flags the tests slower than their duration budget or than their baseline.
+
+    The explicit budget of a test is taken from its duration_budget marker, or from the first matching pattern of the
+    budgets file. Tests without budget are compared to the median of their previous passing durations. To ignore the
+    noise, a test is flagged only if it has enough previous runs and if its duration exceeds the median times the ratio
+    by more than both the minimal delta and three times the estimated standard deviation of its durations.
+    """
+
+    def __init__(
+        self,
+        baselines: Dict[str, DurationBaseline],
+        budgets: Optional[Dict[str, float]] = None,
+        ratio: float = 2.0,
+        minDelta_s: float = 0.5,
+        minRuns: int = 3,
+    ):
+        self.baselines = baselines
+        self.budgets = budgets or {}
+        self.ratio = ratio
+        self.minDelta_s = minDelta_s
+        self.minRuns = minRuns
+
+    @classmethod
+    def fromRunSettings(
+        cls, testDir: Union[str, Path], runSettings: RunSettings, baselines: Dict[str, DurationBaseline]
+    ) -> "DurationRegressionChecker":
+        budgetsPath = runSettings.durationBudgetsPath
+        return cls(
+            baselines,
+            loadDurationBudgets(Path(testDir).joinpath(budgetsPath)) if budgetsPath else {},
+            runSettings.regressionRatio,
+            runSettings.regressionMinDelta_s,
+        )
+
+    def budget(self, case: Case) -> Optional[float]:
+        if case.durationBudget:
+            return case.durationBudget
+
+        for pattern, budget in self.budgets.items():
+            if case.nodeid == pattern or fnmatch.fnmatchcase(case.nodeid, pattern):
+                return budget
+        return None
+
+    def check(self, case: Case) -> str:
+        """
+        Returns the description of the duration regression of the input case, empty if the case didn't regress.
+        """
+        if not case.outcome.isExecuted() or case.outcome.isIgnored():
+            return ""
+
+        budget = self.budget(case)
+        if budget is not None:
+            return (
+                f"Duration {case.duration:.2f} s exceeds its budget of {budget:.2f} s" if case.duration > budget else ""
+            )
+
+        baseline = self.baselines.get(case.nodeid)
+        if baseline is None or baseline.nRuns < self.minRuns:
+            return ""
+
+        threshold = max(
+            baseline.median * self.ratio,
+            baseline.median + self.minDelta_s,
+            baseline.median + 3 * _madToStd * baseline.mad,
+        )
+        if case.duration <= threshold:
+            return ""
+        return (
+            f"Duration {case.duration:.2f} s is {case.duration / max(baseline.median, 1e-6):.1f}x its median of "
+            f"{baseline.median:.2f} s over the last {baseline.nRuns} runs"
+        )
@@ -1,9 +1,9 @@
 import os.path
+import re
 import shutil
 from pathlib import Path
 from tempfile import TemporaryDirectory
-
-import slicer.util
+from typing import Optional
 
 from .QWidget import QDialog
 
@@ -23,19 +23,56 @@ class ExportLogic:
         files = [f for f in files if f.is_file()]
         return files
 
-    @staticmethod
-    def combineXmlReportFiles(reportFiles: list[Path], outFilePath: Path) -> None:
+    @classmethod
+    def combineXmlReportFiles(
+        cls, reportFiles: list[Path], outFilePath: Path, excludedNodeIds: Optional[dict[Path, set[str]]] = None
+    ) -> None:
+        """
+        :param excludedNodeIds: Node ids of the test cases left out of the combined report, by XML report path.
+        """
         from junitparser import JUnitXml
 
         if not reportFiles:
             return
 
-        report = JUnitXml.fromfile(reportFiles[0].as_posix())
-        for f in reportFiles[1:]:
-            report += JUnitXml.fromfile(f.as_posix())
+        excludedNodeIds = excludedNodeIds or {}
+        reports = [JUnitXml.fromfile(f.as_posix()) for f in reportFiles]
+        for f, fileReport in zip(reportFiles, reports):
+            cls._removeTestCases(fileReport, excludedNodeIds.get(f, set()))
+
+        report = reports[0]
+        for fileReport in reports[1:]:
+            report += fileReport
 
         report.write(outFilePath.as_posix())
 
+    @classmethod
+    def _removeTestCases(cls, report, nodeIds: set[str]) -> None:
+        from junitparser import TestSuite
+
+        if not nodeIds:
+            return
+
+        testCaseKeys = {cls.junitTestCaseKey(nodeId) for nodeId in nodeIds}
+        suites = [report] if isinstance(report, TestSuite) else list(report)
+        for suite in suites:
+            for testCase in [c for c in suite if (c.classname, c.name) in testCaseKeys]:
+                suite.remove_testcase(testCase)
+            suite.update_statistics()
+        if not isinstance(report, TestSuite):
+            report.update_statistics()
+
+    @staticmethod
+    def junitTestCaseKey(nodeId: str) -> tuple[str, str]:
+        """
+        Returns the JUnit (classname, name) of the input node id, as written by the PyTest junitxml plugin.
+        """
+        path, bracket, params = nodeId.partition("[")
+        names = path.split("::")
+        names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+        names[-1] += bracket + params
+        return ".".join(names[:-1]), names[-1]
+
     @staticmethod
     def convertJunitXmlToHtml(filePath: Path, outFilePath: Path) -> None:
         from junit2htmlreport.runner import run
@@ -135,6 +172,8 @@ class ExportDialog(QDialog):
         self.exportPath.text = Path(savePath).as_posix()
 
     def onAccept(self):
+        import slicer.util
+
         selectedPath = Path(self.exportPath.text)
         if selectedPath.suffix not in [".html", ".xml"]:
             slicer.util.warningDisplay("Unsupported export format. Please select either XML or HTML")
@@ -0,0 +1,112 @@
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+
+from .ImportGraph import pythonFiles
+from .Signal import Signal
+
+FileMTimes = Dict[Path, float]
+
+
+def pythonFileMTimes(rootDirs: Iterable[Union[str, Path]]) -> FileMTimes:
+    mTimes = {}
+    for filePath in pythonFiles(rootDirs):
+        try:
+            mTimes[filePath] = filePath.stat().st_mtime
+        except OSError:
+            continue
+    return mTimes
+
+
+def changedFiles(before: FileMTimes, after: FileMTimes) -> List[Path]:
+    """
+    Returns the files modified, added or removed between the two snapshots.
+    """
+    return sorted(f for f in set(before) | set(after) if before.get(f) != after.get(f))
+
+
+def pollChangedFiles(
+    rootDirs: Iterable[Union[str, Path]],
+    interval_s: float = 0.5,
+    debounce_s: float = 0.5,
+) -> Iterator[List[Path]]:
+    """
+    Yields the Python files changed in the input directories, once the changes have settled for the debounce duration.
+    Polling based version of the FileWatcher for the command line where no Qt event loop is running.
+    """
+    rootDirs = list(rootDirs)
+    snapshot = pythonFileMTimes(rootDirs)
+    while True:
+        time.sleep(interval_s)
+        current = pythonFileMTimes(rootDirs)
+        if not changedFiles(snapshot, current):
+            continue
+
+        # Wait for the editors and formatters to finish writing
+        while True:
+            time.sleep(debounce_s)
+            settled = pythonFileMTimes(rootDirs)
+            if settled == current:
+                break
+            current = settled
+
+        changed = changedFiles(snapshot, current)
+        snapshot = current
+        if changed:
+            yield changed
+
+
+class FileWatcher:
+    """
+    Watches the Python files of the input directories and notifies the changed files.
+
+    The QFileSystemWatcher notifications are debounced as saving a file usually triggers several notifications.
+    The changed files are computed from the files modification times once the debounce delay is elapsed, which also
+    catches the files replaced or added by the editors.
+    """
+
+    def __init__(self, rootDirs: Iterable[Union[str, Path]], debounce_ms: int = 500):
+        import qt
+
+        self.filesChanged = Signal("list[Path]")
+        self.rootDirs = [Path(rootDir).resolve() for rootDir in rootDirs]
+
+        self._watcher = qt.QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self.onPathChanged)
+        self._watcher.directoryChanged.connect(self.onPathChanged)
+
+        self._debounceTimer = qt.QTimer()
+        self._debounceTimer.setSingleShot(True)
+        self._debounceTimer.setInterval(debounce_ms)
+        self._debounceTimer.timeout.connect(self.onDebounceTimeout)
+
+        self._snapshot: FileMTimes = {}
+
+    def start(self) -> None:
+        self._snapshot = pythonFileMTimes(self.rootDirs)
+        self._updateWatchedPaths()
+
+    def stop(self) -> None:
+        self._debounceTimer.stop()
+        watched = [*self._watcher.files(), *self._watcher.directories()]
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _updateWatchedPaths(self) -> None:
+        # Editors saving by replacing files drop them from the watcher, re-add the current files on each change
+        watched = {*self._watcher.files(), *self._watcher.directories()}
+        dirs = {f.parent for f in self._snapshot} | {d for d in self.rootDirs if d.is_dir()}
+        paths = [p.as_posix() for p in [*dirs, *self._snapshot] if p.as_posix() not in watched]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def onPathChanged(self, *_) -> None:
+        self._debounceTimer.start()
+
+    def onDebounceTimeout(self) -> None:
+        current = pythonFileMTimes(self.rootDirs)
+        changed = changedFiles(self._snapshot, current)
+        self._snapshot = current
+        self._updateWatchedPaths()
+        if changed:
+            self.filesChanged.emit(changed)
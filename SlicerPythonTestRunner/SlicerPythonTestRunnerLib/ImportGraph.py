@@ -0,0 +1,282 @@
+import ast
+import fnmatch
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .CachePath import cacheDir
+
+_cacheVersion = 1
+
+# PyTest default test file patterns
+testFilePatterns = ["test_*.py", "*_test.py"]
+
+_ignoredDirNames = {"__pycache__", "node_modules", "build", "dist"}
+
+
+def isTestFile(filePath: Path) -> bool:
+    return any(fnmatch.fnmatch(filePath.name, pattern) for pattern in testFilePatterns)
+
+
+def pythonFiles(rootDirs: Iterable[Union[str, Path]]) -> List[Path]:
+    """
+    Returns the Python files of the input directories, ignoring the hidden and build directories.
+    """
+    files = set()
+    for rootDir in rootDirs:
+        rootDir = Path(rootDir).resolve()
+        if not rootDir.is_dir():
+            continue
+
+        for filePath in rootDir.rglob("*.py"):
+            relParts = filePath.relative_to(rootDir).parts[:-1]
+            if any(part.startswith(".") or part in _ignoredDirNames for part in relParts):
+                continue
+            files.add(filePath)
+    return sorted(files)
+
+
+def moduleName(filePath: Path) -> str:
+    """
+    Returns the importable module name of the input file.
+    The package root is the first parent directory without __init__.py, as for PyTest's default import mode.
+    """
+    parts = [] if filePath.name == "__init__.py" else [filePath.stem]
+    parent = filePath.parent
+    while parent.joinpath("__init__.py").exists() and parent.parent != parent:
+        parts.insert(0, parent.name)
+        parent = parent.parent
+    return ".".join(parts)
+
+
+def importedModuleNames(source: str, fileModuleName: str, isPackage: bool) -> Set[str]:
+    """
+    Returns the absolute names of the modules imported by the input source.
+    Imported names are returned both as module and attribute (from a import b -> a and a.b) as the parse can't tell
+    one from the other. Relative imports are resolved using the input file module name.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return set()
+
+    package = fileModuleName.split(".") if isPackage else fileModuleName.split(".")[:-1]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                baseName = ".".join(base + ([node.module] if node.module else []))
+            else:
+                baseName = node.module or ""
+
+            if not baseName:
+                continue
+
+            names.add(baseName)
+            names.update(f"{baseName}.{alias.name}" for alias in node.names if alias.name != "*")
+    return names
+
+
+@dataclass
+class FileEntry:
+    """
+    Indexed state of a Python file. The file is parsed again only if its content hash changed.
+    """
+
+    hash: str = ""
+    mtime: float = 0
+    size: int = 0
+    module: str = ""
+    imports: List[str] = field(default_factory=list)
+
+
+class ImportGraph:
+    """
+    Static import graph of the Python files of a test directory and its source roots.
+
+    The graph maps each file to the files it imports and allows to find the test files depending on changed files.
+    Only the imports between the indexed files are kept.
+
+    If a cache path is given, the parsed files are stored on disk. Building the graph again only parses the files
+    whose content hash changed, files with unchanged modification time and size are not read.
+    """
+
+    def __init__(self, rootDirs: Iterable[Union[str, Path]], cachePath: Optional[Union[str, Path]] = None):
+        self.rootDirs = [Path(rootDir).resolve() for rootDir in rootDirs]
+        self.cachePath = Path(cachePath) if cachePath else None
+        self._entries: Dict[Path, FileEntry] = {}
+        self._modules: Dict[str, Path] = {}
+        self._importers: Optional[Dict[Path, Set[Path]]] = None
+
+    @classmethod
+    def defaultCachePath(cls, rootDirs: Iterable[Union[str, Path]]) -> Path:
+        key = hashlib.sha1(";".join(sorted(Path(d).resolve().as_posix() for d in rootDirs)).encode()).hexdigest()
+        return cacheDir().joinpath(f"import_graph_{key}.json")
+
+    @classmethod
+    def cached(cls, rootDirs: Iterable[Union[str, Path]]) -> "ImportGraph":
+        """
+        Returns the graph of the input directories, updated from its on disk cache.
+        """
+        rootDirs = list(rootDirs)
+        return cls(rootDirs, cls.defaultCachePath(rootDirs)).build()
+
+    def build(self) -> "ImportGraph":
+        self._entries = self._loadCache()
+        filePaths = pythonFiles(self.rootDirs)
+        removed = set(self._entries) - set(filePaths)
+        for filePath in removed:
+            del self._entries[filePath]
+
+        isChanged = any([self._updateEntry(filePath) for filePath in filePaths])
+        self._onEntriesChanged()
+        if isChanged or removed:
+            self._saveCache()
+        return self
+
+    def updateFiles(self, filePaths: Iterable[Path]) -> None:
+        """
+        Parses the input files again if their content changed. Files which don't exist anymore are removed.
+        """
+        for filePath in filePaths:
+            filePath = Path(filePath).resolve()
+            if filePath.suffix != ".py":
+                continue
+
+            if not filePath.is_file() or not self._isIndexed(filePath):
+                self._entries.pop(filePath, None)
+                continue
+            self._updateEntry(filePath)
+
+        self._onEntriesChanged()
+        self._saveCache()
+
+    def _updateEntry(self, filePath: Path) -> bool:
+        """
+        Updates the entry of the input file. Returns True if the entry changed.
+        """
+        stat = filePath.stat()
+        entry = self._entries.get(filePath)
+        if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return False
+
+        content = filePath.read_bytes()
+        contentHash = hashlib.sha1(content).hexdigest()
+        if entry is None or entry.hash != contentHash:
+            name = moduleName(filePath)
+            source = content.decode("utf-8", errors="replace")
+            imports = importedModuleNames(source, name, filePath.name == "__init__.py")
+            entry = FileEntry(hash=contentHash, module=name, imports=sorted(imports))
+
+        entry.mtime = stat.st_mtime
+        entry.size = stat.st_size
+        self._entries[filePath] = entry
+        return True
+
+    def _onEntriesChanged(self) -> None:
+        self._modules = {entry.module: filePath for filePath, entry in self._entries.items()}
+        self._importers = None
+
+    def _loadCache(self) -> Dict[Path, FileEntry]:
+        if self.cachePath is None or not self.cachePath.is_file():
+            return {}
+
+        try:
+            with open(self.cachePath, "r") as f:
+                cache = json.loads(f.read())
+            if cache.get("version") != _cacheVersion:
+                return {}
+            return {Path(filePath): FileEntry(**entry) for filePath, entry in cache["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _saveCache(self) -> None:
+        if self.cachePath is None:
+            return
+
+        cache = {
+            "version": _cacheVersion,
+            "files": {filePath.as_posix(): asdict(entry) for filePath, entry in self._entries.items()},
+        }
+        with open(self.cachePath, "w") as f:
+            f.write(json.dumps(cache))
+
+    def _isIndexed(self, filePath: Path) -> bool:
+        return any(rootDir in filePath.parents for rootDir in self.rootDirs)
+
+    @property
+    def files(self) -> List[Path]:
+        return sorted(self._entries.keys())
+
+    def imports(self, filePath: Path) -> Set[Path]:
+        """
+        Returns the indexed files directly imported by the input file, including the packages of the imported modules.
+        """
+        imported = set()
+        entry = self._entries.get(Path(filePath).resolve())
+        for name in entry.imports if entry else []:
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                importedPath = self._modules.get(".".join(parts[:i]))
+                if importedPath is not None:
+                    imported.add(importedPath)
+        imported.discard(Path(filePath).resolve())
+        return imported
+
+    @property
+    def importers(self) -> Dict[Path, Set[Path]]:
+        if self._importers is None:
+            self._importers = {}
+            for filePath in self._entries:
+                for importedPath in self.imports(filePath):
+                    self._importers.setdefault(importedPath, set()).add(filePath)
+        return self._importers
+
+    def dependentFiles(self, changedFiles: Iterable[Path]) -> Set[Path]:
+        """
+        Returns the input files and the files transitively importing them.
+        """
+        dependents = set()
+        toVisit = [Path(f).resolve() for f in changedFiles]
+        while toVisit:
+            filePath = toVisit.pop()
+            if filePath in dependents:
+                continue
+            dependents.add(filePath)
+            toVisit.extend(self.importers.get(filePath, set()))
+        return dependents
+
+    def dependentTestFiles(self, changedFiles: Iterable[Path], testDir: Union[str, Path]) -> List[Path]:
+        """
+        Returns the test files of the input test directory affected by the changed files.
+        Changes to a conftest.py file affect all the test files of its directory.
+        """
+        testDir = Path(testDir).resolve()
+        testFiles = [f for f in self.files if testDir in f.parents and isTestFile(f)]
+
+        affected = set()
+        for filePath in self.dependentFiles(changedFiles):
+            if filePath.name == "conftest.py":
+                affected.update(f for f in testFiles if filePath.parent in f.parents)
+            elif filePath in testFiles:
+                affected.add(filePath)
+        return sorted(affected)
+
+    def moduleFiles(self, name: str) -> List[Path]:
+        """
+        Returns the files of the input module and of its sub modules if it is a package.
+        """
+        return sorted(
+            filePath for module, filePath in self._modules.items() if module == name or module.startswith(name + ".")
+        )
+
+    def testsDependingOnModule(self, name: str, testDir: Union[str, Path]) -> List[Path]:
+        """
+        Returns the test files of the input test directory importing the input module directly or transitively.
+        """
+        return self.dependentTestFiles(self.moduleFiles(name), testDir)
@@ -0,0 +1,83 @@
+import tracemalloc
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Optional
+
+_mb = 1024 * 1024
+
+
+@dataclass
+class MemoryProfile:
+    """
+    Memory use of the worker process around a test, in MB.
+
+    - rss: Resident set size of the worker after the test
+    - rssGrowth: Resident set size growth during the test
+    - tracemallocPeak: Peak of the Python allocations traced during the test (0 if allocations were not traced)
+    - topAllocations: Source lines which allocated the most Python memory during the test and was not released
+    """
+
+    rss: float = 0
+    rssGrowth: float = 0
+    tracemallocPeak: float = 0
+    topAllocations: List[str] = field(default_factory=list)
+
+    def asDict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def fromDict(cls, profileDict: Dict) -> "MemoryProfile":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in profileDict.items() if k in names})
+
+    def getString(self) -> str:
+        lines = [f"Memory: RSS {self.rss:.1f} MB, growth {self.rssGrowth:+.1f} MB"]
+        if self.tracemallocPeak:
+            lines.append(f"  Python allocations peak: {self.tracemallocPeak:.1f} MB")
+        lines += [f"  {allocation}" for allocation in self.topAllocations]
+        return "\n".join(lines)
+
+
+def currentRss_mb() -> float:
+    import psutil
+
+    return psutil.Process().memory_info().rss / _mb
+
+
+class MemoryRecorder:
+    """
+    Records the memory profile of the tests run by a worker.
+    RSS is measured using psutil. Python allocations are optionally traced using tracemalloc, which slows the tests down.
+    """
+
+    def __init__(self, doTraceAllocations: bool = False, nTopAllocations: int = 5):
+        self.doTraceAllocations = doTraceAllocations
+        self.nTopAllocations = nTopAllocations
+        self._rssBefore = 0.0
+        self._snapshotBefore: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        if self.doTraceAllocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._snapshotBefore = self._takeSnapshot()
+        self._rssBefore = currentRss_mb()
+
+    def stop(self) -> MemoryProfile:
+        rss = currentRss_mb()
+        profile = MemoryProfile(rss=rss, rssGrowth=rss - self._rssBefore)
+        if self.doTraceAllocations and tracemalloc.is_tracing():
+            profile.tracemallocPeak = tracemalloc.get_traced_memory()[1] / _mb
+            if self._snapshotBefore is not None:
+                stats = self._takeSnapshot().compare_to(self._snapshotBefore, "lineno")
+                profile.topAllocations = [
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}: {stat.size_diff / _mb:+.2f} MB"
+                    for stat in stats[: self.nTopAllocations]
+                    if stat.size_diff > 0
+                ]
+        self._snapshotBefore = None
+        return profile
+
+    @staticmethod
+    def _takeSnapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
@@ -0,0 +1,206 @@
+import ast
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .CachePath import cacheDir
+from .Results import Results
+from .StartupProfile import findReferencedModules, recommendModulesToIgnore
+
+# Modules kept loaded in minimal launches as they provide the MRML scene IO and display used implicitly by the tests
+# (for instance, slicer.util.loadVolume requires the Volumes module without referencing it).
+essentialModules = [
+    "Cameras",
+    "Colors",
+    "Data",
+    "Markups",
+    "Models",
+    "Plots",
+    "Reformat",
+    "Segmentations",
+    "Sequences",
+    "SubjectHierarchy",
+    "Tables",
+    "Terminologies",
+    "Texts",
+    "Transforms",
+    "Units",
+    "ViewControllers",
+    "Volumes",
+]
+
+
+class ModuleDependencyGraph:
+    """
+    Dependency graph of the modules available in a 3D Slicer application.
+
+    The graph is extracted from the running 3D Slicer application and cached on disk for the application path, which
+    allows the command line and the GUI runs to reuse it.
+    """
+
+    def __init__(self, dependencies: Dict[str, List[str]], builtInModules: Optional[List[str]] = None):
+        self.dependencies = dependencies
+        self.builtInModules = builtInModules or []
+
+    @property
+    def moduleNames(self) -> List[str]:
+        return sorted(self.dependencies.keys())
+
+    def modulesToIgnore(self, usedModules: Iterable[str]) -> List[str]:
+        """
+        Returns the modules which are neither used, essential, built in nor a dependency of these modules.
+        """
+        return recommendModulesToIgnore(
+            self.moduleNames, [*usedModules, *essentialModules, *self.builtInModules], self.dependencies
+        )
+
+    def asDict(self) -> Dict:
+        return {"dependencies": self.dependencies, "builtInModules": self.builtInModules}
+
+    @classmethod
+    def fromDict(cls, graphDict: Dict) -> "ModuleDependencyGraph":
+        return cls(graphDict.get("dependencies", {}), graphDict.get("builtInModules", []))
+
+    def toFile(self, filePath: Path) -> None:
+        with open(filePath, "w") as f:
+            f.write(json.dumps(self.asDict()))
+
+    @classmethod
+    def fromFile(cls, filePath: Path) -> "ModuleDependencyGraph":
+        with open(filePath, "r") as f:
+            return cls.fromDict(json.loads(f.read()))
+
+    @classmethod
+    def fromCurrentApplication(cls) -> Optional["ModuleDependencyGraph"]:
+        try:
+            import slicer
+
+            manager = slicer.app.moduleManager()
+            names = manager.factoryManager().loadedModuleNames()
+        except (ImportError, AttributeError):
+            return None
+
+        dependencies = {}
+        builtIn = []
+        for name in names:
+            module = manager.module(name)
+            if module is None:
+                continue
+
+            moduleDependencies = getattr(module, "dependencies", [])
+            dependencies[name] = list(moduleDependencies() if callable(moduleDependencies) else moduleDependencies)
+            isBuiltIn = getattr(module, "isBuiltIn", False)
+            if isBuiltIn() if callable(isBuiltIn) else isBuiltIn:
+                builtIn.append(name)
+
+        return cls(dependencies, builtIn)
+
+    @staticmethod
+    def cachePath(slicerPath: Union[str, Path]) -> Path:
+        slicerPath = Path(slicerPath)
+        mtime = slicerPath.stat().st_mtime if slicerPath.exists() else 0
+        key = hashlib.sha1(f"{slicerPath.resolve().as_posix()}:{mtime}".encode()).hexdigest()
+        return cacheDir().joinpath(f"module_graph_{key}.json")
+
+    @classmethod
+    def cached(cls, slicerPath: Union[str, Path]) -> Optional["ModuleDependencyGraph"]:
+        """
+        Returns the module graph of the input Slicer application.
+        Loads the graph from the cache if available. Otherwise, extracts it from the current application if it
+        corresponds to the input path and caches it. Returns None if the graph is not available.
+        """
+        cachePath = cls.cachePath(slicerPath)
+        if cachePath.is_file():
+            try:
+                return cls.fromFile(cachePath)
+            except (OSError, ValueError):
+                pass
+
+        if not cls._isCurrentApplication(slicerPath):
+            return None
+
+        graph = cls.fromCurrentApplication()
+        if graph is not None:
+            graph.toFile(cachePath)
+        return graph
+
+    @staticmethod
+    def _isCurrentApplication(slicerPath: Union[str, Path]) -> bool:
+        try:
+            import slicer
+
+            return Path(slicer.app.applicationFilePath()).resolve() == Path(slicerPath).resolve()
+        except (ImportError, AttributeError):
+            return False
+
+
+def readLocalSources(filePaths: Iterable[Union[str, Path]], rootDirs: Iterable[Union[str, Path]]) -> List[str]:
+    """
+    Returns the sources of the input Python files and of the local modules they import transitively.
+    Local modules are searched relative to the importing file and in the input root directories.
+    """
+    rootDirs = [Path(d) for d in rootDirs]
+    toVisit = [Path(p) for p in filePaths]
+    visited = set()
+    sources = []
+
+    while toVisit:
+        filePath = toVisit.pop()
+        if filePath in visited or not filePath.is_file():
+            continue
+        visited.add(filePath)
+
+        source = filePath.read_text(errors="ignore")
+        sources.append(source)
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            continue
+
+        for node in ast.walk(tree):
+            for moduleName in _importedModuleNames(node):
+                toVisit.extend(_localModulePaths(moduleName, [filePath.parent, *rootDirs]))
+
+    return sources
+
+
+def _importedModuleNames(node) -> List[str]:
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    if isinstance(node, ast.ImportFrom) and node.module:
+        return [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+    return []
+
+
+def _localModulePaths(moduleName: str, searchDirs: List[Path]) -> List[Path]:
+    relPath = Path(*moduleName.split("."))
+    candidates = [relPath.with_suffix(".py"), relPath.joinpath("__init__.py")]
+    return [d.joinpath(c) for d in searchDirs for c in candidates if d.joinpath(c).is_file()]
+
+
+def isMissingModuleFailure(results: Results) -> bool:
+    """
+    Returns True if one of the failing cases failed due to a missing import or Slicer module.
+    """
+    pattern = re.compile(r"ImportError|ModuleNotFoundError|AttributeError: module '(slicer\.)?modules'")
+    return any(pattern.search(case.message or "") for case in results.getFailingCases())
+
+
+def minimalModulesSlicerArgs(
+    slicerPath: Union[str, Path], testFilePaths: Iterable[Union[str, Path]], rootDirs: Iterable[Union[str, Path]]
+) -> List[str]:
+    """
+    Returns the Slicer args ignoring the modules the input test files don't need.
+    Returns an empty list if the module graph of the application isn't available.
+    """
+    graph = ModuleDependencyGraph.cached(slicerPath)
+    if graph is None:
+        return []
+
+    usedModules = findReferencedModules(readLocalSources(testFilePaths, rootDirs), graph.moduleNames)
+    modulesToIgnore = graph.modulesToIgnore(usedModules)
+    if not modulesToIgnore:
+        return []
+    return ["--modules-to-ignore", ",".join(modulesToIgnore)]
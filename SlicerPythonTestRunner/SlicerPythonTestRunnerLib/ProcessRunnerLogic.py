@@ -1,28 +1,42 @@
+import tempfile
 from enum import Enum, auto, unique
+from functools import partial
 from pathlib import Path
 from queue import Queue
-from time import sleep
+from time import sleep, time
 from typing import Callable, Optional
 
 import slicer
 
+from .DurationRegression import DurationRegressionChecker
+from .ModuleDependencies import isMissingModuleFailure, minimalModulesSlicerArgs
+from .ResultsHistory import ResultsHistory
 from .RunnerLogic import Results, RunnerLogic, RunSettings
 from .Settings import ModuleSettings
+from .Sharding import dispatchGroups, fixtureAwareGroups, shardNodeIds
 from .Signal import Signal
+from .TestCoverage import CoverageCombiner, coverage_data_suffix
+from .TestImpact import findImpactedTests, findImportImpactedTestFiles
+from .TestProfile import mergeProfiles
+from .Timeline import ProcessRecord, RunTimeline
+from .WorkerReport import WorkerTimings
+from .WorkQueue import WorkQueue
 
 
 class TestProcess:
     """
     Wrapper around a QProcess and keeping the information of the results dir.
+    Records the process queued, started and finished timestamps.
     """
 
-    def __init__(self, args, path):
+    def __init__(self, args, path, name=""):
         self.processStarted = Signal()
         self.processFinished = Signal(TestProcess)
         self.resultsAvailable = Signal(TestProcess, Path)
 
         self._args = args
         self._path = path
+        self.record = ProcessRecord(name=name, queued=time(), reportPath=path)
         self._initProcess()
 
     def __del__(self):
@@ -35,6 +49,7 @@ class TestProcess:
         self._process.finished.connect(self.onProcessFinished)
 
     def start(self):
+        self.record.started = time()
         self._process.start(self._args[0], self._args[1:])
         self.processStarted()
 
@@ -47,12 +62,14 @@ class TestProcess:
             child.kill()
 
         # Stop process itself
+        self.record.finished = time()
         self._process.kill()
         self._process.close()
         self._process.deleteLater()
         self._initProcess()
 
     def onProcessFinished(self, *_):
+        self.record.finished = time()
         self.resultsAvailable(self, self._path)
         self.processFinished(self)
 
@@ -69,6 +86,10 @@ class ProcessPool:
         self._queuedProcesses: list[TestProcess] = []
         self._poolSize = 1
         self._isStopping = False
+        self.timeline = RunTimeline()
+
+    def resetTimeline(self):
+        self.timeline = RunTimeline(self._poolSize)
 
     @property
     def nQueued(self):
@@ -82,7 +103,7 @@ class ProcessPool:
         self._poolSize = max(1, poolSize)
         self._startNext()
 
-    def addProcess(self, args, path, resultsAvailableCallback: Callable):
+    def addProcess(self, args, path, resultsAvailableCallback: Callable, name=""):
         if self._isStopping:
             return
 
@@ -91,7 +112,7 @@ class ProcessPool:
                 return
             resultsAvailableCallback(results)
 
-        process = TestProcess(args, path)
+        process = TestProcess(args, path, name)
         process.processFinished.connect(self.onProcessFinished)
         process.resultsAvailable.connect(processResults)
         self._queuedProcesses.append(process)
@@ -102,12 +123,43 @@ class ProcessPool:
         try:
             for proc in self._processes:
                 proc.stop()
+                self.timeline.addProcess(proc.record)
             self._queuedProcesses.clear()
             self._processes.clear()
         finally:
             self._isStopping = False
             self.processFinished()
 
+    def cancel(self, name: str) -> int:
+        """
+        Removes the queued processes with the input name, or the shards of the input name, and stops the running ones.
+        Returns the number of cancelled processes.
+        """
+        queued = [proc for proc in self._queuedProcesses if self._hasProcessName(proc, name)]
+        running = [proc for proc in self._processes if self._hasProcessName(proc, name)]
+        for proc in queued:
+            self._queuedProcesses.remove(proc)
+
+        for proc in running:
+            self._processes.remove(proc)
+            proc.stop()
+            self.timeline.addProcess(proc.record)
+
+        self._startNext()
+        return len(queued) + len(running)
+
+    @staticmethod
+    def _hasProcessName(proc: TestProcess, name: str) -> bool:
+        return proc.record.name == name or proc.record.name.startswith(f"{name} [")
+
+    def setWorkerTimings(self, reportPath: Path, workerTimings: list[WorkerTimings]) -> None:
+        """
+        Sets the worker timings of the running process writing the input report, from its parsed results.
+        """
+        for proc in self._processes:
+            if workerTimings and proc.record.reportPath == Path(reportPath):
+                proc.record.workerTimings = workerTimings[0]
+
     def isFinished(self):
         return not self._queuedProcesses and not self._processes
 
@@ -116,6 +168,7 @@ class ProcessPool:
             return
 
         self._processes.remove(proc)
+        self.timeline.addProcess(proc.record)
         self._startNext()
         if self.isFinished():
             self.processFinished()
@@ -123,9 +176,14 @@ class ProcessPool:
     def _startNext(self):
         while self._canStartNext():
             proc = self._queuedProcesses.pop(0)
+            proc.record.slot = self._nextFreeSlot()
             proc.start()
             self._processes.append(proc)
 
+    def _nextFreeSlot(self) -> int:
+        usedSlots = {proc.record.slot for proc in self._processes}
+        return next(slot for slot in range(len(self._processes) + 1) if slot not in usedSlots)
+
     def _canStartNext(self):
         return self._queuedProcesses and len(self._processes) < self._poolSize and not self._isStopping
 
@@ -155,7 +213,7 @@ class ProcessRunnerLogic:
         self.logic = RunnerLogic()
         self.processFinished = Signal()
         self.processStarted = Signal()
-        self.resultsAvailable = Signal(Path)
+        self.resultsAvailable = Signal(Path, Results)
         self.progressUpdate = Signal(int, int, str)
         self._nResults = 0
         self._iResult = 0
@@ -169,48 +227,440 @@ class ProcessRunnerLogic:
 
         self._runSettings: Optional[RunSettings] = None
         self._testDir = None
+        self._deselectedNodeIds: list[str] = []
+        self._iRun = 0
+        self.lastTimelinePath: Optional[Path] = None
+        self.lastRunProfilePath: Optional[Path] = None
+        self._coverageCombiner: Optional[CoverageCombiner] = None
+
+        self._history: Optional[ResultsHistory] = None
+        self._rootDirs: dict[Path, Path] = {}
+        self.durationChecker: Optional[DurationRegressionChecker] = None
+        self._historyRunId: Optional[int] = None
+
+        self._queue: Optional[WorkQueue] = None
+        self._dispatchTimer = None
+        self._nWorkersStarted = 0
+        self._maxWorkers = 0
+
+    @property
+    def history(self) -> ResultsHistory:
+        if self._history is None:
+            self._history = ResultsHistory()
+        return self._history
 
     def stopTests(self):
         self._state = _State.STOPPING
+        if self._queue is not None:
+            self._queue.clear()
         self._pool.stop()
 
     def startTest(
-        self, *, testDir: Path, functionPattern: str, filePattern: str, runSettings: RunSettings, doCollectOnly: bool
+        self,
+        *,
+        testDir: Path,
+        functionPattern: str,
+        filePattern: str,
+        runSettings: RunSettings,
+        doCollectOnly: bool,
+        doRunFailedOnly: bool = False,
+        doRunFailedFirst: bool = False,
+        nodeIds: Optional[list[str]] = None,
+        testFiles: Optional[list[Path]] = None,
+        keepReports: Optional[list[Path]] = None,
     ):
+        """
+        Starts the test run in the process pool.
+
+        :param doRunFailedOnly: If True, only runs the tests which failed in their last recorded run.
+        :param doRunFailedFirst: If True, starts the tests which failed in their last recorded run before the others.
+        :param nodeIds: If set, only runs the input test node ids (relative to the test directory) and their children.
+        :param testFiles: If set, only runs the input test files, each in its own process.
+        :param keepReports: Reports of the previous runs still displayed, whose run directories are kept.
+        """
         self._runSettings = runSettings
         self._testDir = testDir
         self._functionPattern = functionPattern
         self._filePattern = filePattern
+        self._deselectedNodeIds = []
+        self.logic.startNewRun(runSettings, keepReports or [])
+        self._coverageCombiner = CoverageCombiner(testDir) if runSettings.doRunCoverage else None
 
         self._pool.setPoolSize(runSettings.nParallelInstances)
+        self._pool.resetTimeline()
         self._iResult = 0
-        self._nResults = 1
+        self._nResults = 0
+
+        # Baselines are computed before the run results are added to the history
+        self.durationChecker = (
+            DurationRegressionChecker.fromRunSettings(testDir, runSettings, self.history.durationBaselines(testDir))
+            if runSettings.doCheckDurationRegressions and not doCollectOnly
+            else None
+        )
+        self._historyRunId = (
+            self.history.startRun(testDir) if runSettings.doRecordHistory and not doCollectOnly else None
+        )
 
         if doCollectOnly:
+            self._nResults = 1
             self._startCollect()
-        else:
-            if not self._runSettings.doRunTestFilesIndependently:
-                self._startTest()
-            else:
-                self._startCollect(resultsAvailableCallback=self._startCollected)
+        elif nodeIds:
+            self._startNodeIds(nodeIds)
+        elif testFiles:
+            self._startTestFiles(testFiles)
+        elif doRunFailedOnly or doRunFailedFirst:
+            self._startFailedTests(doRunOthers=doRunFailedFirst)
+        elif not self._startImpactedTests():
+            self._startAllTests()
 
         self.processStarted()
 
+        # Nothing to run (no impacted or failed tests)
+        if self._state == _State.IDLE:
+            self._onRunFinished()
+
+    @property
+    def _needsCollection(self) -> bool:
+        return self._runSettings.doRunTestFilesIndependently or self._runSettings.doUseMinimalModules
+
+    def _startAllTests(self):
+        self._nResults += 1
+        if not self._needsCollection:
+            self._startTest()
+        else:
+            self._startCollect(resultsAvailableCallback=self._startCollected)
+
     def _startCollected(self, resultsPath: Path):
-        filePaths = Results.fromReportFile(resultsPath).getFilePathList()
+        results = Results.fromReportFile(resultsPath)
+        self._forgetMissingTests(results)
+        deselected = set(self._deselectedNodeIds)
+        nodeIdsByFile: dict[str, list[str]] = {}
+        for case in results.getAllCases():
+            if case.nodeid not in deselected:
+                nodeIdsByFile.setdefault(case.getRootId(), []).append(case.nodeid)
+
+        filePaths = sorted(nodeIdsByFile)
         if not filePaths:
-            self._state = _State.IDLE
-            self.processFinished()
+            # Let the pool finish the run once the collect process and the other running processes are done
+            self._state = _State.TESTING
             self._reportProgress()
             return
 
-        self._nResults = len(filePaths)
+        rootDir = results.rootDir or Path(self._testDir)
+        if self._runSettings.doRunTestFilesIndependently and self._runSettings.doDispatchTests:
+            nodeIds = [nodeId for f in filePaths for nodeId in nodeIdsByFile[f]]
+            self._startDispatch(rootDir, filePaths, nodeIds, results.fixtureUsage)
+            return
+
+        if not self._runSettings.doRunTestFilesIndependently:
+            self._startTest(extraSlicerArgs=self._minimalModulesArgs([rootDir.joinpath(f) for f in filePaths]))
+            return
+
+        self._nResults += len(filePaths) - 1
+        durations = self.history.meanDurations(self._testDir) if self._runSettings.shardThreshold_s > 0 else {}
         for filePath in filePaths:
-            self._startTest(filePath)
+            shards = shardNodeIds(
+                nodeIdsByFile[filePath],
+                durations,
+                self._runSettings.shardThreshold_s,
+                self._runSettings.nParallelInstances,
+            )
+            self._startFileShards(rootDir, filePath, shards)
+
+    def _startFileShards(self, rootDir: Path, filePath: str, shards: list[list[str]]):
+        """
+        Starts the input test file in one process or, if it was split, one process per node ids shard.
+        The shards results are merged under the same file node by the results consumers.
+        """
+        extraSlicerArgs = self._minimalModulesArgs([rootDir.joinpath(filePath)])
+        name = self._processName(rootDir.joinpath(filePath))
+        if len(shards) < 2:
+            self._startTest(filePath, extraSlicerArgs, processName=name)
+            return
+
+        self._nResults += len(shards) - 1
+        for iShard, shard in enumerate(shards):
+            nodeIds = [nodeId for ids in RunSettings.absoluteNodeIdsByFile(rootDir, shard).values() for nodeId in ids]
+            self._startTest(filePath, extraSlicerArgs, nodeIds, processName=f"{name} [{iShard + 1}/{len(shards)}]")
+
+    def _startDispatch(
+        self, rootDir: Path, filePaths: list[str], nodeIds: list[str], fixtureUsage: Optional[dict] = None
+    ):
+        """
+        Puts the input node ids in a work queue, grouped by dispatch scope, and starts persistent workers pulling the
+        groups on demand until the queue is empty. Each group is reported as soon as it is done.
+        The groups sharing a costly shared fixture, according to the measured set up durations, are dispatched
+        together for the fixture to be set up once.
+        """
+        durations = self.history.meanDurations(self._testDir)
+        groups = dispatchGroups(nodeIds, self._runSettings.dispatchScope, durations)
+        groups = fixtureAwareGroups(
+            groups,
+            fixtureUsage or {},
+            self.history.meanFixtureSetupDurations(self._testDir),
+            durations,
+            self._runSettings.nParallelInstances,
+        )
+        self._queue = WorkQueue(tempfile.mkdtemp(prefix="queue_", dir=self.logic.tmp_path))
+        for group in groups:
+            self._queue.put(
+                [nodeId for ids in RunSettings.absoluteNodeIdsByFile(rootDir, group).values() for nodeId in ids]
+            )
+        self._queue.close()
+        self._nResults += len(groups) - 1
+
+        nWorkers = min(self._runSettings.nParallelInstances, len(groups))
+        self._nWorkersStarted = 0
+        self._maxWorkers = nWorkers + len(groups)
+        extraSlicerArgs = self._minimalModulesArgs([rootDir.joinpath(f) for f in filePaths])
+        for _ in range(nWorkers):
+            self._startWorker(extraSlicerArgs)
+
+        if self._dispatchTimer is None:
+            import qt
+
+            self._dispatchTimer = qt.QTimer()
+            self._dispatchTimer.setInterval(100)
+            self._dispatchTimer.timeout.connect(self._reportFinishedItems)
+        self._dispatchTimer.start()
+
+    def _startWorker(self, extraSlicerArgs: list[str]):
+        self._state = _State.TESTING
+        workerName = f"worker_{self._nWorkersStarted}"
+        self._nWorkersStarted += 1
+        self._startProcess(
+            self._testDir,
+            partial(self.logic.prepareWorker, queueDir=self._queue.queueDir, workerName=workerName),
+            "",
+            partial(self._onWorkerFinished, extraSlicerArgs),
+            processName=workerName,
+            extraSlicerArgs=extraSlicerArgs,
+        )
+
+    def _onWorkerFinished(self, extraSlicerArgs: list[str], workerReportPath: Path):
+        """
+        Reports the items done by the finished worker. Replaces the worker if it exited while items are still pending,
+        for instance after a crash. Once the last worker is finished, the items claimed by crashed workers are reported
+        without results.
+        """
+        self._pool.setWorkerTimings(workerReportPath, Results.fromReportFile(workerReportPath).workerTimings)
+        self._reportFinishedItems()
+        if self._state != _State.TESTING:
+            return
+
+        if self._queue.nPending and self._nWorkersStarted < self._maxWorkers:
+            self._startWorker(extraSlicerArgs)
+            return
+
+        if self._pool.nRunning <= 1 and not self._pool.nQueued:
+            for reportPath in self._queue.takeLostItems():
+                self.onResultsAvailable(reportPath)
+
+    def _reportFinishedItems(self):
+        if self._queue is None:
+            return
+
+        for reportPath in self._queue.takeFinishedItems():
+            self.onResultsAvailable(reportPath)
+
+    def _startImpactedTests(self) -> bool:
+        """
+        Starts the tests impacted by the changes since the last coverage run if the impacted tests run is enabled.
+        Returns False if the impacted tests cannot be determined and the full test suite should be run instead.
+        """
+        if not self._runSettings.doRunImpactedTestsOnly:
+            return False
+
+        nodeIds = findImpactedTests(self._testDir, self._runSettings.impactBaseRef, self._nodeIdsRootDir())
+        if nodeIds is None:
+            nodeIds = self._importImpactedTests()
+        if nodeIds is None:
+            return False
+
+        self._startNodeIds(nodeIds)
+        return True
+
+    def _importImpactedTests(self) -> Optional[list[str]]:
+        """
+        Returns the test files affected by the changes according to the import graph of the test directory and source
+        roots. The changes are computed against the impact base revision if set, or since the previous recorded run.
+        """
+        since = 0
+        if not self._runSettings.impactBaseRef:
+            previousRuns = [run for run in self.history.runs(self._testDir, limit=2) if run["id"] != self._historyRunId]
+            since = previousRuns[0]["created"] if previousRuns else 0
+
+        testFiles = findImportImpactedTestFiles(
+            self._testDir, self._runSettings.watchedDirs(self._testDir), self._runSettings.impactBaseRef, since
+        )
+        if testFiles is None:
+            return None
+
+        return [Path(filePath).resolve().as_posix() for filePath in testFiles]
+
+    def _startFailedTests(self, doRunOthers: bool):
+        """
+        Starts the tests which failed in their last recorded run. If doRunOthers is True, the other tests are started
+        afterward with the failed tests deselected.
+        The tests are collected first, so that the failed tests deleted or renamed since their last run are neither
+        started nor kept as failing in the history.
+        """
+        self._startCollect(resultsAvailableCallback=partial(self._startCollectedFailedTests, doRunOthers=doRunOthers))
+
+    def _startCollectedFailedTests(self, resultsPath: Path, doRunOthers: bool):
+        results = Results.fromReportFile(resultsPath)
+        if results.rootDir is not None:
+            self._rootDirs[Path(self._testDir).resolve()] = results.rootDir
+        self._forgetMissingTests(results)
 
-    def _startTest(self, filePattern=None):
         self._state = _State.TESTING
-        return self._startProcess(self._testDir, self.logic.prepareRun, filePattern or self._filePattern)
+        failedNodeIds = results.filterCollectedNodeIds(self.history.failingNodeIds(self._testDir))
+        if failedNodeIds:
+            self._startNodeIds(failedNodeIds)
+
+        if not doRunOthers:
+            self._reportProgress()
+            return
+
+        self._deselectedNodeIds = failedNodeIds
+        self._nResults += 1
+        if self._needsCollection:
+            self._startCollected(resultsPath)
+        else:
+            self._startTest()
+
+    def _forgetMissingTests(self, collected: Results):
+        """
+        Removes the tests missing from the input collection from the failing tests of the history, if the collection
+        was not filtered.
+        """
+        if self._functionPattern or self._filePattern or self._deselectedNodeIds:
+            return
+        if self._runSettings.doRecordHistory:
+            self.history.forgetMissingTests(self._testDir, collected)
+
+    def _startNodeIds(self, nodeIds: list[str]):
+        """
+        Starts the input test node ids, in one process per test file if the files are run independently.
+        """
+        if not nodeIds:
+            self._state = _State.IDLE
+            return
+
+        nodeIdsByFile = RunSettings.absoluteNodeIdsByFile(self._nodeIdsRootDir(), nodeIds)
+        if not self._runSettings.doRunTestFilesIndependently:
+            allNodeIds = [nodeId for fileNodeIds in nodeIdsByFile.values() for nodeId in fileNodeIds]
+            self._nResults += 1
+            self._startTest(extraSlicerArgs=self._minimalModulesArgs(list(nodeIdsByFile)), nodeIds=allNodeIds)
+            return
+
+        self._nResults += len(nodeIdsByFile)
+        for filePath, fileNodeIds in nodeIdsByFile.items():
+            self._startTest(
+                filePath.name, self._minimalModulesArgs([filePath]), fileNodeIds, self._processName(filePath)
+            )
+
+    def _nodeIdsRootDir(self) -> Path:
+        """
+        Returns the PyTest root directory the node ids of the tree and of the history are relative to.
+        Uses the root directory of the last results of the test directory, or of its last recorded run.
+        """
+        testDir = Path(self._testDir).resolve()
+        if testDir in self._rootDirs:
+            return self._rootDirs[testDir]
+        return self.history.lastRootDir(testDir) or testDir
+
+    def rerunTestFiles(
+        self, testDir: Path, testFiles: list[Path], runSettings: RunSettings, keepReports: Optional[list[Path]] = None
+    ):
+        """
+        Runs the input test files, each in its own process.
+        If a run is in progress, the queued or running processes of the same files are cancelled and the files are
+        added to the current run. Otherwise, a new run is started.
+        """
+        if self._state == _State.IDLE:
+            self.startTest(
+                testDir=testDir,
+                functionPattern="",
+                filePattern="",
+                runSettings=runSettings,
+                doCollectOnly=False,
+                testFiles=testFiles,
+                keepReports=keepReports,
+            )
+            return
+
+        if self._state in [_State.COLLECT_ONLY, _State.STOPPING]:
+            return
+
+        self._startTestFiles(testFiles)
+
+    def _processName(self, filePath: Path) -> str:
+        """
+        Returns the name of the processes running the input test file: its path relative to the test directory, or
+        its absolute path if outside. Allows cancelling the processes of a file, whichever way they were started.
+        """
+        testDir = Path(self._testDir).resolve()
+        filePath = Path(filePath).resolve()
+        return filePath.relative_to(testDir).as_posix() if testDir in filePath.parents else filePath.as_posix()
+
+    def _startTestFiles(self, testFiles: list[Path]):
+        for filePath in testFiles:
+            filePath = Path(filePath).resolve()
+            name = self._processName(filePath)
+            self._nResults += 1 - self._pool.cancel(name)
+            self._startTest(
+                extraSlicerArgs=self._minimalModulesArgs([filePath]),
+                nodeIds=[filePath.as_posix()],
+                processName=name,
+            )
+
+    def _minimalModulesArgs(self, testFilePaths: list[Path]) -> list[str]:
+        """
+        Returns the Slicer args ignoring the modules the input test files don't need.
+        Modules explicitly ignored by the user's Slicer args are left untouched.
+        """
+        if not self._runSettings.doUseMinimalModules:
+            return []
+
+        if any(arg.startswith("--modules-to-ignore") for arg in self._runSettings.extraSlicerArgs):
+            return []
+
+        return minimalModulesSlicerArgs(self.logic.slicer_path, testFilePaths, [self._testDir])
+
+    def _startTest(
+        self,
+        filePattern=None,
+        extraSlicerArgs: Optional[list[str]] = None,
+        nodeIds: Optional[list[str]] = None,
+        processName: Optional[str] = None,
+    ):
+        self._state = _State.TESTING
+        return self._startProcess(
+            self._testDir,
+            self.logic.prepareRun,
+            filePattern or self._filePattern,
+            self._fullLaunchFallback(filePattern, nodeIds, processName) if extraSlicerArgs else None,
+            processName=processName or filePattern or "tests",
+            extraSlicerArgs=extraSlicerArgs,
+            nodeIds=nodeIds,
+        )
+
+    def _fullLaunchFallback(
+        self, filePattern, nodeIds: Optional[list[str]] = None, processName: Optional[str] = None
+    ) -> Callable:
+        """
+        Returns a results callback relaunching the tests with all the Slicer modules if the tests failed because of
+        a module ignored by the minimal launch.
+        """
+
+        def onResultsAvailable(resultsPath: Path):
+            if isMissingModuleFailure(Results.fromReportFile(resultsPath)):
+                self._startTest(filePattern, nodeIds=nodeIds, processName=processName)
+            else:
+                self.onResultsAvailable(resultsPath)
+
+        return onResultsAvailable
 
     def _startProcess(
         self,
@@ -218,16 +668,45 @@ class ProcessRunnerLogic:
         prepareF,
         filePattern,
         resultsAvailableCallback: Optional[Callable] = None,
+        processName: str = "",
+        extraSlicerArgs: Optional[list[str]] = None,
+        nodeIds: Optional[list[str]] = None,
     ):
-        args, path = prepareF(testDir, self._getRunSettings(filePattern))
-        self._pool.addProcess(args, path, resultsAvailableCallback or self.onResultsAvailable)
+        runSettings = self._getRunSettings(filePattern, extraSlicerArgs, nodeIds)
+        args, path = prepareF(testDir, runSettings)
+        resultsAvailableCallback = resultsAvailableCallback or self.onResultsAvailable
+        if prepareF != self.logic.prepareCollect and self._coverageCombiner is not None:
+            resultsAvailableCallback = self._combiningCoverage(resultsAvailableCallback)
+
+        self._pool.addProcess(args, path, resultsAvailableCallback, processName)
         self._reportProgress()
 
-    def _getRunSettings(self, filePattern: str) -> RunSettings:
+    def _combiningCoverage(self, resultsAvailableCallback: Callable) -> Callable:
+        """
+        Combines the coverage data of each test process in the background as soon as it finishes, leaving only the
+        report writing for the end of the run.
+        """
+        combiner = self._coverageCombiner
+
+        def onResultsAvailable(resultsPath: Path):
+            combiner.add(coverage_data_suffix(resultsPath))
+            resultsAvailableCallback(resultsPath)
+
+        return onResultsAvailable
+
+    def _getRunSettings(
+        self,
+        filePattern: str,
+        extraSlicerArgs: Optional[list[str]] = None,
+        nodeIds: Optional[list[str]] = None,
+    ) -> RunSettings:
         runSettings = ModuleSettings().lastRunSettings
+        runSettings.extraSlicerArgs += extraSlicerArgs or []
+        runSettings.testNodeIds = nodeIds or []
         runSettings.extraPytestArgs += [
             *RunSettings.pytestPatternFilterArgs(self._functionPattern),
             *RunSettings.pytestFileFilterArgs(filePattern),
+            *(RunSettings.pytestDeselectArgs(self._deselectedNodeIds) if not nodeIds else []),
         ]
         return runSettings
 
@@ -238,27 +717,82 @@ class ProcessRunnerLogic:
             self.logic.prepareCollect,
             self._filePattern,
             resultsAvailableCallback,
+            processName="collect",
         )
 
     def waitForFinished(self):
         while self._state != _State.IDLE:
             self.sleepThread_s(0.1)
 
-    def onResultsAvailable(self, results: Path):
+    def onResultsAvailable(self, resultsPath: Path):
+        # The report is parsed once for the history, the run timeline and the resultsAvailable listeners
+        results = Results.fromReportFile(resultsPath)
+        self._pool.setWorkerTimings(resultsPath, results.workerTimings)
+        if results.rootDir is not None:
+            self._rootDirs[Path(self._testDir).resolve()] = results.rootDir
+        if self._state == _State.COLLECT_ONLY:
+            self._forgetMissingTests(results)
+        if self._historyRunId is not None:
+            self.history.addResults(self._historyRunId, results)
+
         self._iResult += 1
-        self.resultsAvailable(results)
+        self.resultsAvailable(resultsPath, results)
         self._reportProgress()
 
     def _reportProgress(self):
         self.progressUpdate(self._iResult, self._nResults, self._progressStage)
 
     def writeCoverage(self):
+        if self._coverageCombiner is not None:
+            self._coverageCombiner.wait()
         self.logic.writeCoverageReport(self._testDir, self._runSettings)
 
+    def writeTimeline(self) -> Optional[Path]:
+        """
+        Writes the last run timeline as Chrome trace-event JSON next to the run reports.
+        """
+        if not self._pool.timeline.records:
+            return None
+
+        self.lastTimelinePath = Path(self.logic.tmp_path).joinpath(f"run_timeline_{self._iRun}.json")
+        self._pool.timeline.writeChromeTrace(self.lastTimelinePath)
+        self._iRun += 1
+        return self.lastTimelinePath
+
+    def writeRunProfile(self, results: Results) -> Optional[Path]:
+        """
+        Merges the test profiles of the input results in a single profile of the run next to the run reports.
+        """
+        runProfilePath = Path(self.logic.tmp_path).joinpath("run_profile.prof")
+        self.lastRunProfilePath = mergeProfiles(results.getProfilePaths(), runProfilePath)
+        return self.lastRunProfilePath
+
+    def cleanupRunDirectories(self, runSettings: RunSettings, keepReports: Optional[list[Path]] = None):
+        """
+        Removes the run directories exceeding the retention settings, except the directories of the input reports.
+        """
+        if self._state != _State.IDLE:
+            return
+        self.logic.cleanupRunDirectories(runSettings, keepReports or [])
+
+    @property
+    def lastTimelineSummary(self) -> dict:
+        return self._pool.timeline.summary()
+
     def onPoolFinished(self):
         if self._state not in [_State.IDLE, _State.COLLECT_TESTS]:
-            self._state = _State.IDLE
-            self.processFinished()
+            self._onRunFinished()
+
+    def _onRunFinished(self):
+        self._state = _State.IDLE
+        if self._dispatchTimer is not None:
+            self._dispatchTimer.stop()
+        self._queue = None
+        self.writeTimeline()
+        if self._historyRunId is not None:
+            self.history.finishRun(self._historyRunId, self.lastTimelineSummary["wall_s"])
+            self._historyRunId = None
+        self.processFinished()
 
     @property
     def _progressStage(self):
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from .Results import Results
+
+
+class ReportFiles:
+    """
+    JSON report files of the results displayed in the tree view, in reception order.
+
+    When tests are rerun in place, the new report supersedes the cases of these tests in the previous reports, so that
+    each test is exported once with its latest outcome. Previous reports whose executed tests were all rerun are
+    dropped.
+    """
+
+    def __init__(self):
+        self._nodeIds: dict[Path, set[str]] = {}
+        self._supersededNodeIds: dict[Path, set[str]] = {}
+
+    @property
+    def paths(self) -> list[Path]:
+        return list(self._nodeIds)
+
+    @property
+    def supersededNodeIds(self) -> dict[Path, set[str]]:
+        """
+        Node ids of the cases superseded by a later report, by report path.
+        """
+        return {path: set(nodeIds) for path, nodeIds in self._supersededNodeIds.items()}
+
+    def hasSupersededCases(self) -> bool:
+        return bool(self._supersededNodeIds)
+
+    def clear(self) -> None:
+        self._nodeIds.clear()
+        self._supersededNodeIds.clear()
+
+    def add(self, reportPath: Path, results: Results) -> None:
+        """
+        Adds the input report, superseding the cases of its executed tests in the previous reports.
+        """
+        nodeIds = {case.nodeid for case in results.getAllCases() if case.outcome.isExecuted()}
+        for previousPath, previousNodeIds in list(self._nodeIds.items()):
+            rerunNodeIds = previousNodeIds & nodeIds
+            if not rerunNodeIds:
+                continue
+
+            previousNodeIds -= rerunNodeIds
+            if previousNodeIds:
+                self._supersededNodeIds.setdefault(previousPath, set()).update(rerunNodeIds)
+            else:
+                del self._nodeIds[previousPath]
+                self._supersededNodeIds.pop(previousPath, None)
+
+        self._nodeIds[Path(reportPath)] = nodeIds
@@ -0,0 +1,46 @@
+from typing import List
+
+from .Case import Case
+
+
+class ResultTextPages:
+    """
+    Splits the text of the results pane in pages so that it can be filled incrementally.
+    The first page starts with the header text. The debug strings of the cases are computed only when their page is
+    requested.
+    """
+
+    def __init__(self, header: str, cases: List[Case], pageSize: int = 50000):
+        """
+        :param header: Text displayed before the cases.
+        :param cases: Cases whose debug strings are displayed after the header.
+        :param pageSize: Number of characters after which a page is complete. Pages contain at least one case.
+        """
+        self._header = header
+        self._cases = cases
+        self.pageSize = pageSize
+        self._iCase = 0
+        self._isHeaderRead = False
+
+    def hasMore(self) -> bool:
+        return not self._isHeaderRead or self._iCase < len(self._cases)
+
+    def nextPage(self) -> str:
+        """
+        Returns the text following the previously returned pages.
+        """
+        if not self.hasMore():
+            return ""
+
+        page = "\n"
+        if not self._isHeaderRead:
+            self._isHeaderRead = True
+            page = self._header + ("\n\n" if self._cases else "")
+
+        caseTexts = []
+        size = len(page)
+        while self._iCase < len(self._cases) and (size < self.pageSize or not caseTexts):
+            caseTexts.append(self._cases[self._iCase].getDebugString())
+            self._iCase += 1
+            size += len(caseTexts[-1]) + 1
+        return page + "\n".join(caseTexts)
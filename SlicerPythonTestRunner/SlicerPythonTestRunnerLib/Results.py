@@ -1,9 +1,17 @@
 import json
 from copy import deepcopy
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
+from .BenchmarkStats import benchmarkTrendString
 from .Case import Case, Outcome
+from .SceneLeaks import sceneLeaksString
+from .StartupProfile import StartupProfile, startupPhasesString
+from .TestProfile import hotFunctionsString
+from .WorkerReport import WORKER_REPORT_KEY, WorkerTimings
+
+if TYPE_CHECKING:
+    from .DurationRegression import DurationRegressionChecker
 
 
 class Results:
@@ -12,8 +20,21 @@ class Results:
     Provides debug string concatenating test case results information.
     """
 
-    def __init__(self, cases: List[Case]) -> None:
+    def __init__(
+        self,
+        cases: List[Case],
+        workerTimings: Optional[List[WorkerTimings]] = None,
+        startupProfiles: Optional[List[StartupProfile]] = None,
+    ) -> None:
         self._testCases = cases
+        self.workerTimings = workerTimings or []
+        self.startupProfiles = startupProfiles or []
+
+        # PyTest root directory of the run. Case node ids are relative to this directory.
+        self.rootDir: Optional[Path] = None
+
+        # Shared fixtures (session, package or module scoped) used by each collected test node id
+        self.fixtureUsage: Dict[str, List[str]] = {}
 
     def append(self, results: "Results") -> None:
         if results is None:
@@ -23,6 +44,13 @@ class Results:
             raise RuntimeError(f"Invalid results to append {results}. Expected a 'Results' class.")
 
         self._testCases += results._testCases
+        self.rootDir = self.rootDir or results.rootDir
+        self.workerTimings += results.workerTimings
+        self.startupProfiles += results.startupProfiles
+        self.fixtureUsage.update(results.fixtureUsage)
+
+    def removeCases(self, nodeIds: set[str]) -> None:
+        self._testCases = [case for case in self._testCases if case.nodeid not in nodeIds]
 
     def extend(self, resultsList: list["Results"]) -> None:
         for results in resultsList:
@@ -47,7 +75,57 @@ class Results:
         collectedCases = [
             Case.fromCollectedTestDict(case) for case in cls._extractCollectorResultsFromDict(results_dict)
         ]
-        return cls(executedCases + [case for case in collectedCases if case.nodeid not in executedIds])
+        results = cls(
+            executedCases + [case for case in collectedCases if case.nodeid not in executedIds],
+            cls._extractWorkerTimingsFromDict(results_dict),
+            cls._extractStartupProfilesFromDict(results_dict),
+        )
+        results.rootDir = Path(results_dict["root"]) if results_dict.get("root") else None
+        results.fixtureUsage = results_dict.get(WORKER_REPORT_KEY, {}).get("fixtureUsage", {})
+        return results
+
+    @staticmethod
+    def _extractWorkerTimingsFromDict(results_dict) -> List[WorkerTimings]:
+        timings = results_dict.get(WORKER_REPORT_KEY, {}).get("timings")
+        return [WorkerTimings.fromDict(timings)] if timings else []
+
+    @staticmethod
+    def _extractStartupProfilesFromDict(results_dict) -> List[StartupProfile]:
+        profile = results_dict.get(WORKER_REPORT_KEY, {}).get("startupProfile")
+        return [StartupProfile.fromDict(profile)] if profile else []
+
+    def filterCollectedNodeIds(self, nodeIds: List[str]) -> List[str]:
+        """
+        Returns the input node ids which are collected in the results, or whose test file failed to be collected.
+        PyTest stops the whole run when given a node id which doesn't exist anymore.
+        """
+        collectedIds = {case.nodeid for case in self._testCases}
+        failedFiles = {case.getRootId() for case in self._testCases if case.outcome.isFailed()}
+        return [nodeId for nodeId in nodeIds if nodeId in collectedIds or Case.nodeIdParts(nodeId)[0] in failedFiles]
+
+    def getRecommendedModulesToIgnore(self) -> List[str]:
+        """
+        Returns the modules which none of the profiled workers' test files reference.
+        """
+        if not self.startupProfiles:
+            return []
+
+        return sorted(set.intersection(*[set(p.recommendedModulesToIgnore) for p in self.startupProfiles]))
+
+    def getStartupProfileString(self) -> str:
+        """
+        Returns the mean start up phase durations of the profiled workers and the modules none of them reference.
+        """
+        if not self.startupProfiles:
+            return ""
+
+        phases = [profile.phaseDurations for profile in self.startupProfiles]
+        meanPhases = {phase: sum(p[phase] for p in phases) / len(phases) for phase in phases[0]}
+        lines = [f"Start up phases (mean of {len(phases)} workers):", startupPhasesString(meanPhases)]
+        modulesToIgnore = self.getRecommendedModulesToIgnore()
+        if modulesToIgnore:
+            lines += ["Modules the tests don't use (--modules-to-ignore):", "  " + ",".join(modulesToIgnore)]
+        return "\n".join(lines)
 
     @staticmethod
     def _extractCollectorResultsFromDict(results_dict):
@@ -74,6 +152,68 @@ class Results:
     def getFailingCasesString(self):
         return "\n".join([case.getDebugString() for case in self.getFailingCases()])
 
+    def getLeakingCases(self) -> List[Case]:
+        return [case for case in self._testCases if case.sceneLeaks]
+
+    def getSceneLeaksString(self) -> str:
+        return "\n\n".join(f"{case.nodeid}\n{sceneLeaksString(case.sceneLeaks)}" for case in self.getLeakingCases())
+
+    def getProfiledMemoryCases(self) -> List[Case]:
+        """
+        Returns the cases with a memory profile, largest memory growth first.
+        """
+        cases = [case for case in self._testCases if case.memory is not None]
+        return sorted(cases, key=lambda case: case.memory.rssGrowth, reverse=True)
+
+    def getMemoryString(self, limit: int = 10) -> str:
+        return "\n\n".join(
+            f"{case.nodeid}\n{case.memory.getString()}" for case in self.getProfiledMemoryCases()[:limit]
+        )
+
+    def getProfilePaths(self) -> List[Path]:
+        return [Path(case.profilePath) for case in self._testCases if case.profilePath]
+
+    def getHotFunctionsString(self, limit: int = 15) -> str:
+        """
+        Returns the functions with the largest own time over the profiles of the cases.
+        """
+        return hotFunctionsString(self.getProfilePaths(), limit)
+
+    def flagDurationRegressions(self, checker: "DurationRegressionChecker") -> None:
+        for case in self._testCases:
+            case.regression = checker.check(case)
+
+    def getRegressionCases(self) -> List[Case]:
+        return [case for case in self._testCases if case.regression]
+
+    def getRegressionsString(self) -> str:
+        return "\n".join(f"{case.nodeid} SLOWER: {case.regression}" for case in self.getRegressionCases())
+
+    def getBenchmarkCases(self) -> List[Case]:
+        return [case for case in self._testCases if case.benchmark is not None]
+
+    def getBenchmarksString(self, trendF: Optional[Callable[[str], List[Dict]]] = None) -> str:
+        """
+        Returns the benchmark statistics of the cases and, if a trend function is given, their mean over recent runs.
+        """
+        lines = []
+        for case in self.getBenchmarkCases():
+            lines += [case.nodeid, case.benchmark.getString()]
+            trend = benchmarkTrendString(trendF(case.nodeid)) if trendF is not None else ""
+            lines += [trend] if trend else []
+        return "\n".join(lines)
+
+    def getSpilledOutputs(self) -> List[Tuple[str, str]]:
+        """
+        Returns the (title, path) of the full captured outputs of the failing cases truncated in the report.
+        """
+        return [
+            (f"{case.nodeid} [{when.upper()} {stream.upper()}]", path)
+            for case in self.getFailingCases()
+            for when, stagePaths in case.outputPaths.items()
+            for stream, path in stagePaths.items()
+        ]
+
     def getSummaryString(self):
         if not self.executedNumber:
             return "No tests to display." if not self.collectedNumber else f"collected:{self.collectedNumber} tests."
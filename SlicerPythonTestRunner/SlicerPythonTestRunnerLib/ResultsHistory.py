@@ -0,0 +1,401 @@
+import json
+import sqlite3
+import time
+import zlib
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .CachePath import cacheDir
+from .Case import Case, Outcome
+from .DurationRegression import DurationBaseline
+from .Results import Results
+
+_schemaVersion = 1
+
+_schema = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    testDir TEXT NOT NULL,
+    created REAL NOT NULL,
+    duration REAL NOT NULL DEFAULT 0,
+    nExecuted INTEGER NOT NULL DEFAULT 0,
+    nFailed INTEGER NOT NULL DEFAULT 0,
+    rootDir TEXT
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    runId INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    caseId INTEGER PRIMARY KEY REFERENCES cases(id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fixtureSetups (
+    runId INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    fixture TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS memoryProfiles (
+    runId INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    rss REAL NOT NULL,
+    rssGrowth REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    runId INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    nodeid TEXT NOT NULL,
+    min REAL NOT NULL,
+    mean REAL NOT NULL,
+    stddev REAL NOT NULL,
+    rounds INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lastOutcomes (
+    testDir TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    runId INTEGER NOT NULL,
+    PRIMARY KEY (testDir, nodeid)
+);
+CREATE INDEX IF NOT EXISTS runsByTestDir ON runs(testDir, id);
+CREATE INDEX IF NOT EXISTS casesByNodeId ON cases(nodeid, runId);
+CREATE INDEX IF NOT EXISTS casesByRun ON cases(runId);
+CREATE INDEX IF NOT EXISTS fixtureSetupsByRun ON fixtureSetups(runId);
+CREATE INDEX IF NOT EXISTS memoryProfilesByNodeId ON memoryProfiles(nodeid, runId);
+CREATE INDEX IF NOT EXISTS benchmarksByNodeId ON benchmarks(nodeid, runId);
+"""
+
+_failedOutcomes = tuple(o.name for o in Outcome.failedOutcomes())
+_passedOutcomes = tuple(o.name for o in Outcome.passedOutcomes())
+
+
+class ResultsHistory:
+    """
+    SQLite store of the test results of the previous runs.
+
+    Each run stores its executed cases outcome and duration. The captured output of the cases is stored compressed in a
+    separate table to keep the case queries small. The last outcome of each test is kept up to date to allow querying
+    the currently failing tests without scanning the history.
+
+    Only the last maxRuns runs of each test directory are kept, the older runs are removed with their cases, outputs
+    and profiles when results are added.
+    """
+
+    def __init__(self, dbPath: Optional[Union[str, Path]] = None, maxRuns: int = 200):
+        """
+        :param dbPath: Path to the SQLite database. Defaults to the runner cache directory.
+        :param maxRuns: Number of most recent runs kept per test directory. 0 keeps every run.
+        """
+        self.dbPath = Path(dbPath) if dbPath else cacheDir().joinpath("results_history.sqlite")
+        self.maxRuns = maxRuns
+        with self._connect() as con:
+            if con.execute("PRAGMA user_version").fetchone()[0] != _schemaVersion:
+                con.executescript(_schema)
+                con.execute(f"PRAGMA user_version = {_schemaVersion}")
+
+    @contextmanager
+    def _connect(self):
+        with closing(sqlite3.connect(self.dbPath.as_posix(), timeout=10)) as con:
+            con.execute("PRAGMA journal_mode = WAL")
+            con.execute("PRAGMA foreign_keys = ON")
+            with con:
+                yield con
+
+    @staticmethod
+    def _dirKey(testDir: Union[str, Path]) -> str:
+        return Path(testDir).resolve().as_posix()
+
+    def startRun(self, testDir: Union[str, Path], created: Optional[float] = None) -> int:
+        with self._connect() as con:
+            cursor = con.execute(
+                "INSERT INTO runs (testDir, created) VALUES (?, ?)", (self._dirKey(testDir), created or time.time())
+            )
+            return cursor.lastrowid
+
+    def addResults(self, runId: int, results: Results) -> None:
+        """
+        Adds the executed cases of the input results to the run.
+        """
+        cases = [c for c in results.getAllCases() if c.outcome.isExecuted()]
+        if not cases:
+            return
+
+        with self._connect() as con:
+            (testDir,) = con.execute("SELECT testDir FROM runs WHERE id = ?", (runId,)).fetchone()
+            if results.rootDir is not None:
+                con.execute("UPDATE runs SET rootDir = ? WHERE id = ?", (Path(results.rootDir).as_posix(), runId))
+            for case in cases:
+                caseId = con.execute(
+                    "INSERT INTO cases (runId, nodeid, outcome, duration) VALUES (?, ?, ?, ?)",
+                    (runId, case.nodeid, case.outcome.name, case.duration),
+                ).lastrowid
+
+                output = self._compressOutput(case)
+                if output is not None:
+                    con.execute("INSERT INTO outputs (caseId, data) VALUES (?, ?)", (caseId, output))
+
+            con.executemany(
+                "INSERT INTO fixtureSetups (runId, fixture, scope, duration) VALUES (?, ?, ?, ?)",
+                [(runId, *fixture) for timings in results.workerTimings for fixture in timings.fixtures],
+            )
+            con.executemany(
+                "INSERT INTO memoryProfiles (runId, nodeid, rss, rssGrowth) VALUES (?, ?, ?, ?)",
+                [(runId, c.nodeid, c.memory.rss, c.memory.rssGrowth) for c in cases if c.memory is not None],
+            )
+            con.executemany(
+                "INSERT INTO benchmarks (runId, nodeid, min, mean, stddev, rounds) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (runId, c.nodeid, c.benchmark.min, c.benchmark.mean, c.benchmark.stddev, c.benchmark.rounds)
+                    for c in cases
+                    if c.benchmark is not None
+                ],
+            )
+            con.executemany(
+                "INSERT OR REPLACE INTO lastOutcomes (testDir, nodeid, outcome, runId) VALUES (?, ?, ?, ?)",
+                [(testDir, case.nodeid, case.outcome.name, runId) for case in cases],
+            )
+            con.execute(
+                "UPDATE runs SET nExecuted = nExecuted + ?, nFailed = nFailed + ? WHERE id = ?",
+                (len(cases), len([c for c in cases if c.outcome.isFailed()]), runId),
+            )
+            self._removeOldRuns(con, testDir)
+
+    def _removeOldRuns(self, con, testDir: str) -> None:
+        """
+        Removes the runs of the input test directory older than its last maxRuns runs.
+        The cases, outputs, fixture setups and profiles of the removed runs are removed by cascade.
+        """
+        if not self.maxRuns:
+            return
+
+        con.execute(
+            "DELETE FROM runs WHERE testDir = ? AND id < "
+            "(SELECT MIN(id) FROM (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?))",
+            (testDir, testDir, self.maxRuns),
+        )
+
+    def finishRun(self, runId: int, duration: float) -> None:
+        with self._connect() as con:
+            con.execute("UPDATE runs SET duration = ? WHERE id = ?", (duration, runId))
+
+    def addRun(self, testDir: Union[str, Path], results: Results, duration: float = 0) -> int:
+        runId = self.startRun(testDir)
+        self.addResults(runId, results)
+        self.finishRun(runId, duration)
+        return runId
+
+    @staticmethod
+    def _compressOutput(case: Case) -> Optional[bytes]:
+        output = {"message": case.message, "stdout": case.stdout, "stderr": case.stderr, "logs": case.logs}
+        if not any(output.values()):
+            return None
+        return zlib.compress(json.dumps(output).encode())
+
+    @staticmethod
+    def _decompressOutput(data: Optional[bytes]) -> Dict:
+        if not data:
+            return {"message": "", "stdout": "", "stderr": "", "logs": []}
+        return json.loads(zlib.decompress(data).decode())
+
+    def runs(self, testDir: Union[str, Path], limit: int = 20) -> List[Dict]:
+        """
+        Returns the last runs of the input directory, most recent first.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT id, created, duration, nExecuted, nFailed FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?",
+                (self._dirKey(testDir), limit),
+            ).fetchall()
+        keys = ["id", "created", "duration", "nExecuted", "nFailed"]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def lastRootDir(self, testDir: Union[str, Path]) -> Optional[Path]:
+        """
+        Returns the PyTest root directory of the last run of the input directory, which the recorded node ids are
+        relative to.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT rootDir FROM runs WHERE testDir = ? AND rootDir IS NOT NULL ORDER BY id DESC LIMIT 1",
+                (self._dirKey(testDir),),
+            ).fetchone()
+        return Path(row[0]) if row else None
+
+    def slowestTests(self, testDir: Union[str, Path], limit: int = 20, nRuns: int = 10) -> List[Dict]:
+        """
+        Returns the tests with the largest mean duration over the last runs of the input directory.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT nodeid, AVG(duration), MAX(duration), COUNT(*) FROM cases "
+                "WHERE runId IN (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?) "
+                "GROUP BY nodeid ORDER BY AVG(duration) DESC LIMIT ?",
+                (self._dirKey(testDir), nRuns, limit),
+            ).fetchall()
+        return [{"nodeid": r[0], "meanDuration": r[1], "maxDuration": r[2], "nRuns": r[3]} for r in rows]
+
+    def meanDurations(self, testDir: Union[str, Path], nRuns: int = 10) -> Dict[str, float]:
+        """
+        Returns the mean duration of each test executed over the last runs of the input directory.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT nodeid, AVG(duration) FROM cases "
+                "WHERE runId IN (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?) GROUP BY nodeid",
+                (self._dirKey(testDir), nRuns),
+            ).fetchall()
+        return dict(rows)
+
+    def durationBaselines(self, testDir: Union[str, Path], nRuns: int = 10) -> Dict[str, DurationBaseline]:
+        """
+        Returns the duration baseline of each test passing over the last runs of the input directory.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT nodeid, duration FROM cases "
+                "WHERE runId IN (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?) "
+                f"AND outcome IN ({','.join('?' * len(_passedOutcomes))})",
+                (self._dirKey(testDir), nRuns, *_passedOutcomes),
+            ).fetchall()
+
+        durations: Dict[str, List[float]] = {}
+        for nodeid, duration in rows:
+            durations.setdefault(nodeid, []).append(duration)
+        return {nodeid: DurationBaseline.fromDurations(d) for nodeid, d in durations.items()}
+
+    def meanFixtureSetupDurations(self, testDir: Union[str, Path], nRuns: int = 10) -> Dict[str, float]:
+        """
+        Returns the mean set up duration of each shared fixture over the last runs of the input directory.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT fixture, AVG(duration) FROM fixtureSetups "
+                "WHERE runId IN (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?) GROUP BY fixture",
+                (self._dirKey(testDir), nRuns),
+            ).fetchall()
+        return dict(rows)
+
+    def growingMemoryTests(
+        self, testDir: Union[str, Path], nRuns: int = 3, minGrowth_mb: float = 1.0, limit: int = 20
+    ) -> List[Dict]:
+        """
+        Returns the tests whose memory grew by at least minGrowth_mb in each of their last nRuns profiled executions.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                """
+                WITH executions AS (
+                    SELECT nodeid, rssGrowth, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY runId DESC) AS iRun
+                    FROM memoryProfiles
+                    WHERE runId IN (SELECT id FROM runs WHERE testDir = ?)
+                )
+                SELECT nodeid, AVG(rssGrowth), MIN(rssGrowth) FROM executions WHERE iRun <= ?
+                GROUP BY nodeid HAVING COUNT(*) = ? AND MIN(rssGrowth) >= ?
+                ORDER BY AVG(rssGrowth) DESC LIMIT ?
+                """,
+                (self._dirKey(testDir), nRuns, nRuns, minGrowth_mb, limit),
+            ).fetchall()
+        return [{"nodeid": r[0], "meanGrowth": r[1], "minGrowth": r[2]} for r in rows]
+
+    def durationTrend(self, testDir: Union[str, Path], nodeid: str, nRuns: int = 20) -> List[Dict]:
+        """
+        Returns the durations of the input test over its last executions, oldest first.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT r.id, r.created, c.duration, c.outcome FROM cases c JOIN runs r ON r.id = c.runId "
+                "WHERE c.nodeid = ? AND r.testDir = ? ORDER BY c.runId DESC LIMIT ?",
+                (nodeid, self._dirKey(testDir), nRuns),
+            ).fetchall()
+        return [{"runId": r[0], "created": r[1], "duration": r[2], "outcome": r[3]} for r in reversed(rows)]
+
+    def benchmarkTrend(self, testDir: Union[str, Path], nodeid: str, nRuns: int = 10) -> List[Dict]:
+        """
+        Returns the benchmark statistics of the input test over its last executions, oldest first.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT r.id, r.created, b.min, b.mean, b.stddev, b.rounds FROM benchmarks b "
+                "JOIN runs r ON r.id = b.runId WHERE b.nodeid = ? AND r.testDir = ? ORDER BY b.runId DESC LIMIT ?",
+                (nodeid, self._dirKey(testDir), nRuns),
+            ).fetchall()
+        keys = ["runId", "created", "min", "mean", "stddev", "rounds"]
+        return [dict(zip(keys, row)) for row in reversed(rows)]
+
+    def flakeRates(self, testDir: Union[str, Path], nRuns: int = 20, limit: int = 20) -> List[Dict]:
+        """
+        Returns the tests which changed between passing and failing over the last runs of the input directory.
+        The flake rate is the ratio of outcome changes over the consecutive executions of the test.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                f"""
+                WITH executions AS (
+                    SELECT nodeid, runId, outcome IN ({",".join("?" * len(_failedOutcomes))}) AS failed
+                    FROM cases
+                    WHERE runId IN (SELECT id FROM runs WHERE testDir = ? ORDER BY id DESC LIMIT ?)
+                      AND outcome != ?
+                ),
+                changes AS (
+                    SELECT nodeid, failed != LAG(failed) OVER (PARTITION BY nodeid ORDER BY runId) AS changed
+                    FROM executions
+                )
+                SELECT nodeid, COUNT(*), SUM(changed) FROM changes
+                GROUP BY nodeid HAVING SUM(changed) > 0
+                ORDER BY SUM(changed) * 1.0 / (COUNT(*) - 1) DESC LIMIT ?
+                """,
+                (*_failedOutcomes, self._dirKey(testDir), nRuns, Outcome.skipped.name, limit),
+            ).fetchall()
+        return [{"nodeid": r[0], "nRuns": r[1], "nChanges": r[2], "flakeRate": r[2] / (r[1] - 1)} for r in rows]
+
+    def lastFailure(self, testDir: Union[str, Path], nodeid: str) -> Optional[Dict]:
+        """
+        Returns the run and captured output of the last failure of the input test if any.
+        """
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT r.id, r.created, c.outcome, o.data FROM cases c JOIN runs r ON r.id = c.runId "
+                "LEFT JOIN outputs o ON o.caseId = c.id "
+                f"WHERE c.nodeid = ? AND r.testDir = ? AND c.outcome IN ({','.join('?' * len(_failedOutcomes))}) "
+                "ORDER BY c.runId DESC LIMIT 1",
+                (nodeid, self._dirKey(testDir), *_failedOutcomes),
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {"runId": row[0], "created": row[1], "outcome": row[2], **self._decompressOutput(row[3])}
+
+    def forgetMissingTests(self, testDir: Union[str, Path], collected: Results) -> None:
+        """
+        Removes the last outcomes of the tests of the input directory missing from the input complete collection, so
+        that deleted or renamed tests are not reported as failing anymore. Collections with errors are ignored as
+        their tests are unknown.
+        """
+        cases = collected.getAllCases()
+        if not cases or any(case.outcome.isFailed() for case in cases):
+            return
+
+        collectedIds = {case.nodeid for case in cases}
+        with self._connect() as con:
+            dirKey = self._dirKey(testDir)
+            nodeIds = [r[0] for r in con.execute("SELECT nodeid FROM lastOutcomes WHERE testDir = ?", (dirKey,))]
+            con.executemany(
+                "DELETE FROM lastOutcomes WHERE testDir = ? AND nodeid = ?",
+                [(dirKey, nodeId) for nodeId in nodeIds if nodeId not in collectedIds],
+            )
+
+    def failingNodeIds(self, testDir: Union[str, Path]) -> List[str]:
+        """
+        Returns the tests of the input directory whose last execution failed.
+        """
+        with self._connect() as con:
+            rows = con.execute(
+                f"SELECT nodeid FROM lastOutcomes WHERE testDir = ? AND outcome IN ({','.join('?' * len(_failedOutcomes))}) "
+                "ORDER BY nodeid",
+                (self._dirKey(testDir), *_failedOutcomes),
+            ).fetchall()
+        return [r[0] for r in rows]
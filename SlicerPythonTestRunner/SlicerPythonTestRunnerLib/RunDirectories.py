@@ -0,0 +1,159 @@
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+from .CachePath import cacheDir
+
+_mb = 1024 * 1024
+
+
+class RunDirectories:
+    """
+    Manages the directories where the runner writes the generated scripts, run settings and reports of its runs.
+
+    Each runner gets a session directory in the runs root directory, named after its process id, with a sub directory
+    per run. The retention removes the least recently modified runs beyond a maximal number of runs or a maximal total
+    size. It only considers the runs of the current session and of the sessions whose process is not running anymore,
+    so that the runs of the other 3D Slicer instances are left untouched. Older runs can optionally be compressed in zip
+    archives.
+
+    The session directory is created with the first run directory, so that creating a runner doesn't write on disk.
+    """
+
+    # Number of most recent runs never compressed
+    nUncompressedRuns = 3
+
+    def __init__(self, rootDir: Optional[Union[str, Path]] = None):
+        self.rootDir = Path(rootDir) if rootDir else cacheDir().joinpath("runs")
+        self._sessionDir: Optional[Path] = None
+        self._iRun = 0
+        self._runDir: Optional[Path] = None
+
+    @property
+    def sessionDir(self) -> Path:
+        """
+        Returns the directory of the runs of this runner, creating it if needed.
+        """
+        if self._sessionDir is None:
+            self.rootDir.mkdir(parents=True, exist_ok=True)
+            self._sessionDir = Path(tempfile.mkdtemp(prefix=f"session_{os.getpid()}_", dir=self.rootDir))
+        return self._sessionDir
+
+    def currentRunDir(self) -> Path:
+        """
+        Returns the directory of the current run, creating the first run directory if needed.
+        """
+        if self._runDir is None:
+            return self.newRunDir()
+        self._runDir.mkdir(parents=True, exist_ok=True)
+        return self._runDir
+
+    def newRunDir(self) -> Path:
+        self._runDir = self.sessionDir.joinpath(f"run_{self._iRun:04}")
+        self._runDir.mkdir(parents=True, exist_ok=True)
+        self._iRun += 1
+        return self._runDir
+
+    def applyRetention(
+        self, maxRuns: int, maxSize_mb: float, doCompress: bool = False, keepPaths: Iterable[Union[str, Path]] = ()
+    ) -> List[Path]:
+        """
+        Removes the least recently modified runs beyond maxRuns runs or maxSize_mb MB. 0 disables the limit.
+        The current run and the runs containing the input paths are never removed nor compressed.
+
+        :returns: Paths of the removed runs.
+        """
+        keptRuns = {self._runDir, *(self._runPathOf(Path(p)) for p in keepPaths)}
+        runs = sorted(self._evictableRuns(), key=lambda p: p.stat().st_mtime, reverse=True)
+
+        removed = []
+        totalSize = 0
+        for iRun, runPath in enumerate(runs):
+            isKept = runPath in keptRuns
+            if not isKept and maxRuns and iRun >= maxRuns:
+                _removePath(runPath)
+                removed.append(runPath)
+                continue
+
+            if doCompress and not isKept and iRun >= self.nUncompressedRuns and runPath.is_dir():
+                runPath = self._compress(runPath)
+
+            size = _pathSize(runPath)
+            if not isKept and maxSize_mb and totalSize + size > maxSize_mb * _mb:
+                _removePath(runPath)
+                removed.append(runPath)
+                continue
+            totalSize += size
+
+        self._removeFinishedEmptySessions()
+        return removed
+
+    def _evictableRuns(self) -> List[Path]:
+        return [
+            runPath
+            for sessionDir in self._sessionDirs()
+            if sessionDir == self._sessionDir or not self._isSessionRunning(sessionDir)
+            for runPath in sessionDir.iterdir()
+            if runPath.name.startswith("run_")
+        ]
+
+    def _sessionDirs(self) -> List[Path]:
+        if not self.rootDir.is_dir():
+            return []
+        return [p for p in self.rootDir.iterdir() if p.is_dir() and p.name.startswith("session_")]
+
+    @staticmethod
+    def _isSessionRunning(sessionDir: Path) -> bool:
+        match = re.match(r"session_(\d+)_", sessionDir.name)
+        if match is None:
+            return False
+
+        try:
+            import psutil
+        except ImportError:
+            return True
+        return psutil.pid_exists(int(match.group(1)))
+
+    def _removeFinishedEmptySessions(self) -> None:
+        for sessionDir in self._sessionDirs():
+            if sessionDir == self._sessionDir or self._isSessionRunning(sessionDir):
+                continue
+            if not any(p.name.startswith("run_") for p in sessionDir.iterdir()):
+                _removePath(sessionDir)
+
+    def _runPathOf(self, path: Path) -> Optional[Path]:
+        """
+        Returns the run directory containing the input path if any.
+        """
+        try:
+            parts = path.resolve().relative_to(self.rootDir.resolve()).parts
+        except ValueError:
+            return None
+        return self.rootDir.joinpath(*parts[:2]) if len(parts) >= 2 else None
+
+    @staticmethod
+    def _compress(runDir: Path) -> Path:
+        """
+        Replaces the input run directory by a zip archive, keeping its modification time.
+        """
+        mtime = runDir.stat().st_mtime
+        archivePath = Path(shutil.make_archive(runDir.as_posix(), "zip", runDir.as_posix()))
+        os.utime(archivePath, (mtime, mtime))
+        _removePath(runDir)
+        return archivePath
+
+
+def _pathSize(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def _removePath(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    elif path.exists():
+        path.unlink()
@@ -1,30 +1,63 @@
 import os
 import subprocess
 import sys
-import tempfile
+import time
 import traceback
 from copy import deepcopy
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Union
 
 from .Decorator import isRunningInSlicerGui
 from .EnsureRequirements import ensureRequirements
 from .Results import Results
+from .RunDirectories import RunDirectories
 from .Settings import RunSettings
-from .TestCoverage import _coverage, clean_tmp_coverage, write_cov_report
+from .SharedDataCache import SharedDataCache
+from .StartupProfile import StartupProfile
+from .TestCoverage import (
+    _coverage,
+    clean_tmp_coverage,
+    coverage_data_suffix,
+    write_cov_report,
+)
+from .WorkerReport import WorkerTimings
+from .WorkQueue import WorkQueue
+
+if TYPE_CHECKING:
+    from .RunnerPlugin import RunnerPlugin
 
 
 class RunnerLogic:
     """
     Class responsible for launching a 3D Slicer process with pytest and running the different tests.
     The tests run will share the same 3D Slicer instance and should clear the scene if needed.
+    The generated files and reports are written in the directory of the current run, managed by the RunDirectories.
     """
 
-    def __init__(self, slicer_path=None):
+    def __init__(self, slicer_path=None, runDirectories: Optional[RunDirectories] = None):
         self.slicer_path = slicer_path or self.default_path()
-        self.tmp_path = tempfile.mkdtemp()
+        self.runDirectories = runDirectories or RunDirectories()
         self.i_test_file = 0
 
+    @property
+    def tmp_path(self) -> str:
+        return self.runDirectories.currentRunDir().as_posix()
+
+    def startNewRun(self, runSettings: RunSettings, keepPaths: Iterable[Union[str, Path]] = ()) -> Path:
+        """
+        Creates the directory of the next run and removes the previous runs exceeding the retention settings.
+        The runs containing the input paths are kept.
+        """
+        runDir = self.runDirectories.newRunDir()
+        self.cleanupRunDirectories(runSettings, keepPaths)
+        return runDir
+
+    def cleanupRunDirectories(self, runSettings: RunSettings, keepPaths: Iterable[Union[str, Path]] = ()) -> None:
+        self.runDirectories.applyRetention(
+            runSettings.maxKeptRuns, runSettings.maxRunsSize_mb, runSettings.doCompressOldRuns, keepPaths
+        )
+        SharedDataCache().applyRetention(runSettings.maxSharedDataSize_mb)
+
     @staticmethod
     def default_path() -> Path:
         if isRunningInSlicerGui():
@@ -85,7 +118,7 @@ class RunnerLogic:
 
         # Configure the test python file and run locally with the input directory / json report file
         _, json_report_path = self._createTestPythonFile(directory, runSettings)
-        self.runPytestAndExit(directory, json_report_path, runSettings)
+        self.runPytestAndExit(directory, json_report_path, runSettings, WorkerTimings(scriptStart=time.time()))
 
         # Return the results
         return Results.fromReportFile(json_report_path)
@@ -107,6 +140,50 @@ class RunnerLogic:
             ),
         )
 
+    # Slicer args disabling each of the profiled start up phases
+    startupPhaseArgs = {
+        "slicerrc": ["--ignore-slicerrc"],
+        "settings": ["--disable-settings"],
+        "scriptedModules": ["--disable-scripted-loadable-modules"],
+        "loadableModules": ["--disable-loadable-modules"],
+        "cliModules": ["--disable-cli-modules"],
+    }
+
+    def profileStartupPhases(self, runSettings: RunSettings) -> Dict[str, float]:
+        """
+        Measures the duration of 3D Slicer start up phases (module loading, Python scripted module initialization,
+        slicerrc and settings loading).
+
+        Slicer is launched once with a full start up and once with each phase disabled. The duration of each phase is
+        the difference between the full start up duration and the start up duration without the phase.
+        The returned dictionary contains the full start up duration under the "full" key.
+        """
+        fullDuration = self._measureStartupDuration(runSettings.extraSlicerArgs)
+        phases = {"full": fullDuration}
+        for phase, phaseArgs in self.startupPhaseArgs.items():
+            phaseDuration = self._measureStartupDuration([*runSettings.extraSlicerArgs, *phaseArgs])
+            phases[phase] = max(0.0, fullDuration - phaseDuration)
+        return phases
+
+    def _measureStartupDuration(self, extraSlicerArgs: list[str]) -> float:
+        file_path, _, _ = self.updateTemFilePaths()
+        timestamp_path = file_path.with_name(f"{file_path.stem}_startup_timestamp.txt")
+        with open(file_path, "w") as f:
+            f.write(
+                "import time\n"
+                f'open(r"{timestamp_path.as_posix()}", "w").write(str(time.time()))\n'
+                "import slicer\n"
+                "slicer.util.exit(0)\n"
+            )
+
+        args = [self.slicer_path.as_posix(), "--python-script", file_path.as_posix(), "--no-main-window"]
+        start = time.time()
+        self.runInSubProcessAndWaitFinished([*args, *extraSlicerArgs])
+
+        if not timestamp_path.exists():
+            return 0.0
+        return float(timestamp_path.read_text()) - start
+
     def prepareRun(self, directory: Union[str, Path], runSettings: RunSettings) -> tuple[list[str], Path]:
         """
         Prepares process args and path to JSON report path corresponding to test run with the input parameters.
@@ -126,40 +203,90 @@ class RunnerLogic:
 
         return args, json_report_path
 
+    def prepareWorker(
+        self, directory: Union[str, Path], runSettings: RunSettings, queueDir: Union[str, Path], workerName: str
+    ) -> tuple[list[str], Path]:
+        """
+        Prepares the process args of a persistent worker running the items of the input work queue until it is empty.
+        Returns the args and the worker report path, used as coverage data suffix.
+        """
+        file_path, _ = self._createTestPythonFile(directory, runSettings, queueDir, workerName)
+        args = [self.slicer_path.as_posix(), "--python-script", file_path.as_posix(), *runSettings.extraSlicerArgs]
+
+        noMainWindowArg = "--no-main-window"
+        if not runSettings.doUseMainWindow and noMainWindowArg not in args:
+            args += [noMainWindowArg]
+
+        return args, WorkQueue(queueDir).workerReportPath(workerName)
+
     @classmethod
     def runPyTest(
         cls,
         exec_path: Union[str, Path],
         json_report_path: Union[str, Path],
         pytest_args: list[str],
+        runnerPlugin: Optional["RunnerPlugin"] = None,
+        nodeIds: Optional[list[str]] = None,
     ) -> int:
+        """
+        Runs PyTest on the input directory or on the input test node ids if any.
+        """
         import pytest
         from pytest_jsonreport.plugin import JSONReport
 
+        from .RunnerPlugin import RunnerPlugin
+
         exec_path = Path(exec_path).resolve().as_posix()
         json_report_path = Path(json_report_path).resolve().as_posix()
         plugin = JSONReport()
+        runnerPlugin = runnerPlugin or RunnerPlugin(WorkerTimings())
         ret = pytest.main(
             [
-                exec_path,
+                *(nodeIds or [exec_path]),
+                *cls.rootDirArgs(exec_path, pytest_args, nodeIds),
                 f"--json-report-file={json_report_path}",
                 f"--junitxml={json_report_path.replace('.json', '.xml')}",
                 f"--html={json_report_path.replace('.json', '.html')}",
                 "--capture=tee-sys",
-                "--cache-clear",
+                *cls.cacheArgs(pytest_args),
                 *cls.formatPytestArgs(pytest_args),
             ],
-            plugins=[plugin],
+            plugins=[plugin, runnerPlugin],
         )
         return int(ret)
 
+    @staticmethod
+    def rootDirArgs(exec_path: str, pytestArgs: list[str], nodeIds: Optional[list[str]]) -> list[str]:
+        """
+        Keeps the executed node ids relative to the test directory when running a subset of its test files.
+        Otherwise, PyTest would use the common ancestor of the node ids as root directory.
+        """
+        if not nodeIds or any(arg.startswith("--rootdir") for arg in pytestArgs):
+            return []
+        return [f"--rootdir={exec_path}"]
+
+    @staticmethod
+    def cacheArgs(pytestArgs: list[str]) -> list[str]:
+        """
+        Clears the PyTest cache unless the input args use it (last failed, failed first or step wise runs).
+        """
+        cacheOptions = {"--lf", "--last-failed", "--ff", "--failed-first", "--nf", "--new-first", "--sw", "--stepwise"}
+        if cacheOptions.intersection(pytestArgs):
+            return []
+        return ["--cache-clear"]
+
     @staticmethod
     def formatPytestArgs(pytestArgs: list[str]) -> list[str]:
         from datetime import datetime
 
-        from coverage.sqldata import filename_suffix
+        # Only import coverage when the suffix is actually used to keep the worker start up light
+        if any("{filename_suffix}" in arg for arg in pytestArgs):
+            from coverage.sqldata import filename_suffix
+
+            suffix = filename_suffix(True)
+        else:
+            suffix = ""
 
-        suffix = filename_suffix(True)
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S.%f")
 
         return [arg.format(filename_suffix=suffix, timestamp=timestamp) for arg in pytestArgs]
@@ -170,7 +297,15 @@ class RunnerLogic:
         path: Union[str, Path],
         json_report_path: Union[str, Path],
         runSettings: RunSettings,
+        workerTimings: Optional[WorkerTimings] = None,
     ) -> int:
+        workerTimings = workerTimings or WorkerTimings(scriptStart=time.time())
+        workerTimings.runnerImported = workerTimings.runnerImported or time.time()
+
+        startupProfile = None
+        if runSettings.doProfileStartup:
+            startupProfile = StartupProfile.fromCurrentProcess(workerTimings.scriptStart, workerTimings.runnerImported)
+
         try:
             import slicer  # noqa
 
@@ -181,10 +316,15 @@ class RunnerLogic:
         except (ImportError, AttributeError):
             exit_f = sys.exit
 
-        @_coverage(runSettings)
+        @_coverage(runSettings, workerTimings, coverage_data_suffix(json_report_path))
         def runPyTestWithCoverage():
             try:
-                return cls.runPyTest(path, json_report_path, runSettings.extraPytestArgs)
+                from .RunnerPlugin import RunnerPlugin
+
+                runnerPlugin = RunnerPlugin(workerTimings, runSettings, startupProfile)
+                return cls.runPyTest(
+                    path, json_report_path, runSettings.extraPytestArgs, runnerPlugin, runSettings.testNodeIds
+                )
             except Exception as e:  # noqa
                 traceback.print_exc()
                 return 1
@@ -194,16 +334,78 @@ class RunnerLogic:
             exit_f(ret)
         return ret
 
+    @classmethod
+    def runWorkerAndExit(
+        cls,
+        path: Union[str, Path],
+        queueDir: Union[str, Path],
+        workerName: str,
+        runSettings: RunSettings,
+        workerTimings: Optional[WorkerTimings] = None,
+    ) -> int:
+        """
+        Runs the items of the input work queue in the current process until the queue is closed and empty.
+        Each item is run in its own PyTest session and writes its own JSON report. The coverage is measured over all
+        the items of the worker.
+        """
+        from .RunnerPlugin import RunnerPlugin
+
+        queue = WorkQueue(queueDir)
+        workerTimings = workerTimings or WorkerTimings(scriptStart=time.time())
+        workerTimings.runnerImported = workerTimings.runnerImported or time.time()
+
+        startupProfile = None
+        if runSettings.doProfileStartup:
+            startupProfile = StartupProfile.fromCurrentProcess(workerTimings.scriptStart, workerTimings.runnerImported)
+
+        try:
+            import slicer  # noqa
+
+            exit_f = slicer.util.exit
+        except (ImportError, AttributeError):
+            exit_f = sys.exit
+
+        @_coverage(runSettings, workerTimings, coverage_data_suffix(queue.workerReportPath(workerName)))
+        def runItemsWithCoverage():
+            itemTimings, itemStartupProfile = workerTimings, startupProfile
+            while (item := queue.nextItem()) is not None:
+                itemId, nodeIds = item
+                try:
+                    runnerPlugin = RunnerPlugin(itemTimings, runSettings, itemStartupProfile)
+                    cls.runPyTest(path, queue.reportPath(itemId), runSettings.extraPytestArgs, runnerPlugin, nodeIds)
+                except Exception:  # noqa
+                    traceback.print_exc()
+                finally:
+                    queue.markDone(itemId)
+
+                # The following items don't pay for the Slicer start up
+                now = time.time()
+                itemTimings, itemStartupProfile = WorkerTimings(scriptStart=now, runnerImported=now), None
+            return 0
+
+        ret = runItemsWithCoverage()
+        if runSettings.doCloseSlicerAfterRun:
+            exit_f(ret)
+        return ret
+
     @staticmethod
     def _libPaths() -> list[str]:
         file_dir = Path(__file__).parent
         lib_dir = file_dir.parent
         return [file_dir.resolve().as_posix(), lib_dir.resolve().as_posix()]
 
-    def _createTestPythonFile(self, path: Union[str, Path], runSettings: RunSettings) -> tuple[Path, Path]:
+    def _createTestPythonFile(
+        self,
+        path: Union[str, Path],
+        runSettings: RunSettings,
+        queueDir: Optional[Union[str, Path]] = None,
+        workerName: str = "",
+    ) -> tuple[Path, Path]:
         """
         Creates a python file which will run the current file's `runPytestAndExit` in a new Slicer launcher instance
-        with the passed args.
+        with the passed args. If a work queue directory is given, the file runs `runWorkerAndExit` instead.
+
+        The generated file only imports the runner core modules and records the worker start up timings.
 
         :returns: Paths to generate file and report file which will be created after execution.
         """
@@ -211,16 +413,31 @@ class RunnerLogic:
         file_path, json_report_path, run_settings_path = self.updateTemFilePaths()
         runSettings.toFile(run_settings_path)
 
+        if queueDir is not None:
+            run_call = (
+                "RunnerLogic.runWorkerAndExit(\n"
+                f'    r"{path}", r"{Path(queueDir).as_posix()}", "{workerName}", runSettings, workerTimings\n'
+                ")\n"
+            )
+        else:
+            run_call = (
+                "RunnerLogic.runPytestAndExit(\n"
+                f'    r"{path}", r"{json_report_path.as_posix()}", runSettings, workerTimings\n'
+                ")\n"
+            )
+
         file_content = (
+            "import time\n"
+            "scriptStart = time.time()\n"
             "import sys\n"
             "import os\n"
             f'os.chdir(r"{path}")\n'
             f"sys.path.extend({self._libPaths()})\n"
-            "from SlicerPythonTestRunnerLib import RunnerLogic, RunSettings\n"
-            f'runSettings = RunSettings.fromFile(r"{run_settings_path.as_posix()}")\n'
-            "RunnerLogic.runPytestAndExit(\n"
-            f'    r"{path}", r"{json_report_path.as_posix()}", runSettings\n'
-            ")\n"
+            "from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic\n"
+            "from SlicerPythonTestRunnerLib.Settings import RunSettings\n"
+            "from SlicerPythonTestRunnerLib.WorkerReport import WorkerTimings\n"
+            "workerTimings = WorkerTimings(scriptStart=scriptStart, runnerImported=time.time())\n"
+            f'runSettings = RunSettings.fromFile(r"{run_settings_path.as_posix()}")\n' + run_call
         )
 
         with open(file_path, "w") as f:
@@ -0,0 +1,241 @@
+import cProfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from .BenchmarkStats import BenchmarkStats
+from .CapturedOutput import outputsDir, spillStageOutput
+from .MemoryProfile import MemoryRecorder
+from .SceneLeaks import SceneSnapshot, resetScene, sceneLeaks
+from .Settings import RunSettings
+from .SharedDataCache import SharedDataCache
+from .StartupProfile import StartupProfile
+from .TestProfile import profileFileName, profilesDir
+from .WorkerReport import (
+    WORKER_REPORT_KEY,
+    WorkerTimings,
+    fixtureKey,
+    sharedFixtureScopes,
+)
+
+
+class RunnerPlugin:
+    """
+    PyTest plugin installed by the RunnerLogic in the test worker processes.
+    Records runner specific information during the test session and stores it in the pytest-json-report JSON report
+    under the WORKER_REPORT_KEY key.
+
+    The shared fixtures used by each collected test and the set up duration of these fixtures are recorded to allow
+    grouping the tests sharing costly fixtures.
+
+    Provides the shared_data_cache fixture to the tests.
+
+    If the scene reset is enabled, the MRML scene is cleared after each test and the nodes and VTK objects the test
+    leaked are stored in the test JSON report metadata.
+
+    If the memory profiling is enabled, the memory profile of each test is stored in the test JSON report metadata and
+    as JUnit XML properties.
+
+    If the test profiling is enabled, each test call is profiled using cProfile and saved in a .prof file next to the
+    JSON report. The profile path is stored in the test JSON report metadata.
+
+    The statistics of the tests using the pytest-benchmark fixture are stored in the test JSON report metadata and as
+    JUnit XML properties.
+
+    The captured outputs longer than the maximal captured output size are truncated in the JSON report and written in
+    full in log files next to the report. The paths of the spilled outputs of each test stage are stored in the test JSON
+    report metadata.
+    """
+
+    def __init__(
+        self,
+        timings: WorkerTimings,
+        runSettings: Optional[RunSettings] = None,
+        startupProfile: Optional[StartupProfile] = None,
+    ):
+        self.timings = timings
+        self.runSettings = runSettings or RunSettings()
+        self.startupProfile = startupProfile
+        self.fixtureUsage: Dict[str, List[str]] = {}
+        self.memoryRecorder = (
+            MemoryRecorder(self.runSettings.doTraceAllocations) if self.runSettings.doProfileMemory else None
+        )
+
+    @pytest.fixture(scope="session")
+    def shared_data_cache(self) -> SharedDataCache:
+        """
+        Read-only test data cache shared by the parallel test workers.
+        """
+        return SharedDataCache()
+
+    def pytest_configure(self, config):
+        config.addinivalue_line(
+            "markers", "duration_budget(seconds): flags the test as a duration regression if it is slower than seconds."
+        )
+
+    def pytest_sessionstart(self, session):
+        self.timings.pytestStart = time.time()
+        jsonReportPath = Path(session.config.getoption("json_report_file", default=".report.json"))
+        self._profilesDir = profilesDir(jsonReportPath)
+        self._outputsDir = outputsDir(jsonReportPath)
+
+    def pytest_collection_finish(self, session):
+        if self.startupProfile is not None:
+            self.startupProfile.recordTestFiles({str(item.fspath) for item in session.items})
+
+        self.fixtureUsage = {item.nodeid: keys for item in session.items if (keys := self.sharedFixtureKeys(item))}
+
+    @staticmethod
+    def sharedFixtureKeys(item) -> List[str]:
+        fixtureInfo = getattr(item, "_fixtureinfo", None)
+        if fixtureInfo is None:
+            return []
+
+        keys = []
+        for name in getattr(item, "fixturenames", []):
+            fixtureDefs = fixtureInfo.name2fixturedefs.get(name)
+            if fixtureDefs and fixtureDefs[-1].scope in sharedFixtureScopes:
+                keys.append(fixtureKey(name, fixtureDefs[-1].scope, item.nodeid))
+        return keys
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = time.time()
+        yield
+        if fixturedef.scope in sharedFixtureScopes:
+            key = fixtureKey(fixturedef.argname, fixturedef.scope, request.node.nodeid)
+            self.timings.fixtures.append([key, fixturedef.scope, time.time() - start])
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        if self.runSettings.doResetSceneBetweenTests:
+            item._sceneSnapshot = SceneSnapshot.take()
+        if self.memoryRecorder is not None:
+            self.memoryRecorder.start()
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        if not self.runSettings.doProfileTests:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active
+            yield
+            return
+
+        yield
+        profiler.disable()
+        self._profilesDir.mkdir(parents=True, exist_ok=True)
+        profilePath = self._profilesDir / profileFileName(item.nodeid)
+        profiler.dump_stats(profilePath.as_posix())
+        item._profilePath = profilePath.resolve().as_posix()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        self._recordBenchmark(item)
+        yield
+        before = getattr(item, "_sceneSnapshot", None)
+        if before is not None:
+            afterTest = SceneSnapshot.take()
+            resetScene()
+            item._sceneLeaks = sceneLeaks(before, afterTest, SceneSnapshot.take())
+
+        if self.memoryRecorder is not None:
+            item._memoryProfile = self.memoryRecorder.stop()
+            item.user_properties += [
+                ("rss_mb", round(item._memoryProfile.rss, 1)),
+                ("rss_growth_mb", round(item._memoryProfile.rssGrowth, 1)),
+            ]
+            if self.runSettings.doTraceAllocations:
+                item.user_properties.append(("tracemalloc_peak_mb", round(item._memoryProfile.tracemallocPeak, 1)))
+
+    @staticmethod
+    def _recordBenchmark(item) -> None:
+        benchmark = (getattr(item, "funcargs", None) or {}).get("benchmark")
+        item._benchmarkStats = BenchmarkStats.fromBenchmarkFixture(benchmark) if benchmark is not None else None
+        if item._benchmarkStats is None:
+            return
+
+        item.user_properties += [
+            ("benchmark_mean_s", item._benchmarkStats.mean),
+            ("benchmark_stddev_s", item._benchmarkStats.stddev),
+            ("benchmark_min_s", item._benchmarkStats.min),
+            ("benchmark_rounds", item._benchmarkStats.rounds),
+        ]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_json_runtest_metadata(self, item, call):
+        if call.when != "teardown":
+            return {}
+
+        metadata = {}
+        if getattr(item, "_sceneLeaks", None):
+            metadata["sceneLeaks"] = item._sceneLeaks
+        if getattr(item, "_memoryProfile", None) is not None:
+            metadata["memory"] = item._memoryProfile.asDict()
+        if getattr(item, "_profilePath", None):
+            metadata["profile"] = item._profilePath
+        if getattr(item, "_benchmarkStats", None) is not None:
+            metadata["benchmark"] = item._benchmarkStats.asDict()
+        budgetMarker = item.get_closest_marker("duration_budget")
+        if budgetMarker is not None and budgetMarker.args:
+            metadata["durationBudget"] = float(budgetMarker.args[0])
+        return metadata
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        """
+        Truncates the captured outputs of the test stage before pytest-json-report adds them to the JSON report.
+        The spilled paths are added to the test metadata, which pytest-json-report reads from the stage report as the
+        teardown report is logged after the metadata hook.
+        """
+        maxSize = self.runSettings.maxCapturedOutput_kb * 1024
+        stageDetails = getattr(report, "_json_report_extra", {}).get(report.when)
+        if not maxSize or not stageDetails:
+            return
+
+        spilled = spillStageOutput(stageDetails, report.nodeid, report.when, self._outputsDir, maxSize)
+        if spilled:
+            metadata = report._json_report_extra.setdefault("metadata", {})
+            metadata.setdefault("outputs", {})[report.when] = spilled
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        now = time.time()
+        if not self.timings.firstTestStart:
+            self.timings.firstTestStart = now
+        self.timings.tests.append([nodeid, now, now])
+        self._switchCoverageContext(nodeid)
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self._switchCoverageContext("")
+        if self.timings.tests and self.timings.tests[-1][0] == nodeid:
+            self.timings.tests[-1][2] = time.time()
+
+    def _switchCoverageContext(self, context: str) -> None:
+        """
+        Records the coverage of each test, including its setup and teardown, under the test node id context.
+        """
+        if not (self.runSettings.doRunCoverage and self.runSettings.doRecordCoverageContexts):
+            return
+
+        from coverage import Coverage
+
+        cov = Coverage.current()
+        if cov is not None:
+            cov.switch_context(context)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_json_modifyreport(self, json_report):
+        self.timings.sessionFinish = time.time()
+        json_report[WORKER_REPORT_KEY] = {"timings": self.timings.asDict()}
+        if self.startupProfile is not None:
+            json_report[WORKER_REPORT_KEY]["startupProfile"] = self.startupProfile.asDict()
+        if self.fixtureUsage:
+            json_report[WORKER_REPORT_KEY]["fixtureUsage"] = self.fixtureUsage
@@ -1,15 +1,21 @@
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional
 
 import slicer
 
+from .CapturedOutput import SpilledOutputReader
 from .EnsureRequirements import ensureRequirements
 from .ExportDialog import ExportDialog, ExportLogic
+from .FileWatcher import FileWatcher
 from .IconPath import icon
+from .ImportGraph import ImportGraph
 from .LoadingWidget import LoadingIcon
 from .ProcessRunnerLogic import ProcessRunnerLogic
 from .QWidget import QWidget
+from .ReportFiles import ReportFiles
 from .Results import Results
+from .ResultTextPages import ResultTextPages
 from .Settings import ModuleSettings
 from .SettingsDialog import SettingsDialog
 from .TreeView import TreeView
@@ -62,6 +68,8 @@ class RunnerWidget(QWidget):
         )
 
         self.treeView = TreeView(self)
+        self.treeView.runNodeIdsRequested.connect(self.onRunNodeIds)
+        self.treeView.benchmarkTrendF = self.benchmarkTrend
         self.logic = ProcessRunnerLogic()
         self.logic.processStarted.connect(self.onProcessStarted)
         self.logic.processFinished.connect(self.onProcessFinished)
@@ -80,6 +88,30 @@ class RunnerWidget(QWidget):
         self.parallelRunButton.clicked.connect(self.onParallelRunTests)
         self.parallelRunButton.setToolTip("Runs all the tests in parallel in directory matching given patterns.")
 
+        self.rerunFailedButton = qt.QPushButton()
+        self.rerunFailedButton.setIcon(icon("test_failed_icon.png"))
+        self.rerunFailedButton.clicked.connect(self.onRerunFailedTests)
+        self.rerunFailedButton.setToolTip("Reruns only the tests which failed in their last run.")
+
+        self.failedFirstButton = qt.QPushButton("First")
+        self.failedFirstButton.setIcon(icon("test_failed_icon.png"))
+        self.failedFirstButton.clicked.connect(self.onRunFailedFirst)
+        self.failedFirstButton.setToolTip(
+            "Runs all the tests in directory matching given patterns, starting with the tests which failed in their "
+            "last run."
+        )
+
+        self.watchButton = qt.QPushButton("Watch")
+        self.watchButton.setIcon(icon("test_start_icon.png"))
+        self.watchButton.setCheckable(True)
+        self.watchButton.toggled.connect(self.onToggleWatch)
+        self.watchButton.setToolTip(
+            "Watches the test directory and the source roots and reruns the test files affected by each saved change."
+        )
+        self.dirPathLineEdit.currentPathChanged.connect(lambda *_: self.watchButton.setChecked(False))
+        self._fileWatcher = None
+        self._importGraph = None
+
         self.collectButton = qt.QPushButton()
         self.collectButton.setIcon(icon("test_collect_icon.png"))
         self.collectButton.clicked.connect(self.onCollectTests)
@@ -122,6 +154,9 @@ class RunnerWidget(QWidget):
         buttonLayout = qt.QHBoxLayout()
         buttonLayout.addWidget(self.runButton)
         buttonLayout.addWidget(self.parallelRunButton)
+        buttonLayout.addWidget(self.rerunFailedButton)
+        buttonLayout.addWidget(self.failedFirstButton)
+        buttonLayout.addWidget(self.watchButton)
         buttonLayout.addWidget(self.collectButton)
         buttonLayout.addWidget(self.stopButton)
         buttonLayout.addWidget(showPassedButton)
@@ -135,11 +170,22 @@ class RunnerWidget(QWidget):
         filePatternLayout.addWidget(self.filePatternLineEdit)
         filePatternLayout.addWidget(self.functionPatternLineEdit)
 
-        self.testResultTextEdit = qt.QTextEdit()
-        self.testResultTextEdit.setAcceptRichText(True)
+        # Plain text edit filled page by page when scrolling, to stay responsive with huge failure outputs
+        self.testResultTextEdit = qt.QPlainTextEdit()
         self.testResultTextEdit.setReadOnly(True)
-        self.testResultTextEdit.setLineWrapMode(qt.QTextEdit.NoWrap)
-        self.treeView.currentCaseTextChanged.connect(self.testResultTextEdit.setText)
+        self.testResultTextEdit.setLineWrapMode(qt.QPlainTextEdit.NoWrap)
+        self.testResultTextEdit.verticalScrollBar().valueChanged.connect(self.onResultTextScrolled)
+        self.treeView.currentCaseTextChanged.connect(self.testResultTextEdit.setPlainText)
+
+        self._resultTextPages: Optional[ResultTextPages] = None
+        self.treeView.currentCasePagesChanged.connect(self.onCurrentCasePagesChanged)
+
+        self._spilledOutputReader: Optional[SpilledOutputReader] = None
+        self._isFullOutputShown = False
+        self.loadFullOutputButton = qt.QPushButton("Load full output")
+        self.loadFullOutputButton.setToolTip("Loads the next chunk of the captured outputs truncated in the report.")
+        self.loadFullOutputButton.clicked.connect(self.onLoadFullOutput)
+        self.treeView.currentCaseOutputsChanged.connect(self.onCurrentCaseOutputsChanged)
 
         self.progressWidget = ProgressWidget()
 
@@ -150,13 +196,19 @@ class RunnerWidget(QWidget):
         layout.addWidget(self.progressWidget, 0, qt.Qt.AlignHCenter)
         layout.addWidget(self.treeView, 2)
         layout.addWidget(self.testResultTextEdit, 1)
+        layout.addWidget(self.loadFullOutputButton, 0, qt.Qt.AlignRight)
 
         # Update UI with previous settings
         self.restorePreviousSettings(showCollectedButton, showIgnoredButton, showPassedButton)
 
-        self.resultFiles = []
+        self.resultFiles = ReportFiles()
+        self._updatedNodeIds = []
 
         self.setProgressVisible(False)
+        self.onCurrentCaseOutputsChanged([])
+
+        # Remove the reports left by the previous sessions
+        self.logic.cleanupRunDirectories(ModuleSettings().lastRunSettings)
 
     def setProgressVisible(self, isVisible):
         self.progressWidget.setVisible(isVisible)
@@ -188,18 +240,68 @@ class RunnerWidget(QWidget):
     def onParallelRunTests(self):
         self._startTests(doCollectOnly=False, doRunTestFilesIndependently=True)
 
+    def onRerunFailedTests(self):
+        self._startTests(doCollectOnly=False, doRunFailedOnly=True)
+
+    def onRunFailedFirst(self):
+        self._startTests(doCollectOnly=False, doRunFailedFirst=True)
+
+    def onRunNodeIds(self, nodeIds):
+        if not self.runButton.isEnabled():
+            return
+        self._startTests(doCollectOnly=False, nodeIds=nodeIds)
+
     def onCollectTests(self):
         self._startTests(doCollectOnly=True)
 
-    def _startTests(self, doCollectOnly, doRunTestFilesIndependently=False):
+    def _startTests(
+        self,
+        doCollectOnly,
+        doRunTestFilesIndependently=False,
+        doRunFailedOnly=False,
+        doRunFailedFirst=False,
+        nodeIds=None,
+    ):
+        """
+        Starts the tests matching the pattern line edits.
+        If node ids are given, only these tests are run and their results are updated in place in the tree view.
+        """
         testDir = Path(self.dirPathLineEdit.currentPath)
         if not testDir.exists():
             slicer.util.warningDisplay(f"Selected test folder doesn't exist: \n{testDir.as_posix()}")
             return
 
+        if not self._ensureRequirements():
+            return
+
+        self._updatedNodeIds = nodeIds or []
+        self.saveSettings()
+        self.clearResultText()
+        if not self._updatedNodeIds:
+            self.resultFiles.clear()
+            self.treeView.clear()
+        slicer.app.processEvents()
+
+        runSettings = ModuleSettings().lastRunSettings
+        runSettings.doRunTestFilesIndependently = doRunTestFilesIndependently
+        self.logic.startTest(
+            testDir=testDir,
+            functionPattern="" if nodeIds else self.functionPatternLineEdit.text,
+            filePattern="" if nodeIds else self.filePatternLineEdit.text,
+            runSettings=runSettings,
+            doCollectOnly=doCollectOnly,
+            doRunFailedOnly=doRunFailedOnly,
+            doRunFailedFirst=doRunFailedFirst,
+            nodeIds=nodeIds,
+            keepReports=self.resultFiles.paths,
+        )
+
+    @staticmethod
+    def _ensureRequirements() -> bool:
         # Install pytest requirements if needed
         try:
             ensureRequirements()
+            return True
         except Exception:  # noqa
             import traceback
 
@@ -207,27 +309,111 @@ class RunnerWidget(QWidget):
                 "Failed to install module dependencies",
                 detailedText=traceback.format_exc(),
             )
+            return False
+
+    def onToggleWatch(self, isChecked):
+        if self._fileWatcher is not None:
+            self._fileWatcher.stop()
+        self._fileWatcher = None
+        self._importGraph = None
+
+        if not isChecked:
             return
 
-        self.resultFiles.clear()
-        self.saveSettings()
-        self.testResultTextEdit.clear()
-        self.treeView.clear()
-        slicer.app.processEvents()
+        testDir = Path(self.dirPathLineEdit.currentPath)
+        if not testDir.exists() or not self._ensureRequirements():
+            self.watchButton.setChecked(False)
+            return
+
+        watchedDirs = ModuleSettings().lastRunSettings.watchedDirs(testDir)
+        self._importGraph = ImportGraph.cached(watchedDirs)
+        self._fileWatcher = FileWatcher(watchedDirs)
+        self._fileWatcher.filesChanged.connect(self.onWatchedFilesChanged)
+        self._fileWatcher.start()
+
+    def onWatchedFilesChanged(self, changedFiles):
+        """
+        Reruns the test files affected by the changed files and updates their results in place.
+        """
+        self._importGraph.updateFiles(changedFiles)
+        testDir = Path(self.dirPathLineEdit.currentPath).resolve()
+        testFiles = self._importGraph.dependentTestFiles(changedFiles, testDir)
+        if not testFiles:
+            return
+
+        if self.runButton.isEnabled():
+            self._updatedNodeIds = []
+            self.clearResultText()
+        self._updatedNodeIds += [f.relative_to(testDir).as_posix() for f in testFiles]
 
         runSettings = ModuleSettings().lastRunSettings
-        runSettings.doRunTestFilesIndependently = doRunTestFilesIndependently
-        self.logic.startTest(
-            testDir=testDir,
-            functionPattern=self.functionPatternLineEdit.text,
-            filePattern=self.filePatternLineEdit.text,
-            runSettings=runSettings,
-            doCollectOnly=doCollectOnly,
-        )
+        runSettings.doRunTestFilesIndependently = True
+        self.logic.rerunTestFiles(testDir, testFiles, runSettings, keepReports=self.resultFiles.paths)
+
+    def cleanup(self):
+        """
+        Removes the run directories exceeding the retention settings when the module is closed.
+        """
+        self.logic.cleanupRunDirectories(ModuleSettings().lastRunSettings)
+
+    def benchmarkTrend(self, nodeId: str) -> List[Dict]:
+        if not ModuleSettings().lastRunSettings.doRecordHistory:
+            return []
+        return self.logic.history.benchmarkTrend(self.dirPathLineEdit.currentPath, nodeId)
+
+    def clearResultText(self):
+        self.testResultTextEdit.clear()
+        self._resultTextPages = None
+        self.onCurrentCaseOutputsChanged([])
+
+    def appendResultText(self, text):
+        """
+        Appends the input text at the end of the results pane without moving its view.
+        """
+        import qt
+
+        cursor = qt.QTextCursor(self.testResultTextEdit.document())
+        cursor.movePosition(qt.QTextCursor.End)
+        cursor.insertText(text)
+
+    def onCurrentCasePagesChanged(self, pages: ResultTextPages):
+        self._resultTextPages = pages
+        self.onResultTextScrolled(self.testResultTextEdit.verticalScrollBar().value)
+
+    def onResultTextScrolled(self, value):
+        """
+        Appends the next page of the results text when the view gets close to the end of the displayed text.
+        """
+        scrollBar = self.testResultTextEdit.verticalScrollBar()
+        if self._resultTextPages is None or value < scrollBar.maximum - 2 * scrollBar.pageStep:
+            return
+
+        if self._resultTextPages.hasMore():
+            self.appendResultText(self._resultTextPages.nextPage())
+
+    def onCurrentCaseOutputsChanged(self, outputs):
+        self._spilledOutputReader = SpilledOutputReader(outputs) if outputs else None
+        self._isFullOutputShown = False
+        self.loadFullOutputButton.setVisible(self._spilledOutputReader is not None)
+        self.loadFullOutputButton.setText("Load full output")
+
+    def onLoadFullOutput(self):
+        if self._spilledOutputReader is None:
+            return
+
+        if not self._isFullOutputShown:
+            self.testResultTextEdit.setPlainText("")
+            self._resultTextPages = None
+            self._isFullOutputShown = True
+        self.appendResultText(self._spilledOutputReader.readChunk())
+        self.loadFullOutputButton.setText("Load more output")
+        self.loadFullOutputButton.setVisible(self._spilledOutputReader.hasMore())
 
     def onProcessStarted(self):
         self.runButton.setEnabled(False)
         self.parallelRunButton.setEnabled(False)
+        self.rerunFailedButton.setEnabled(False)
+        self.failedFirstButton.setEnabled(False)
         self.collectButton.setEnabled(False)
         self.stopButton.setEnabled(True)
         self.setProgressVisible(True)
@@ -236,13 +422,32 @@ class RunnerWidget(QWidget):
         self.logic.writeCoverage()
         self.runButton.setEnabled(True)
         self.parallelRunButton.setEnabled(True)
+        self.rerunFailedButton.setEnabled(True)
+        self.failedFirstButton.setEnabled(True)
         self.collectButton.setEnabled(True)
         self.stopButton.setEnabled(False)
         self.setProgressVisible(False)
 
-    def onResultsAvailable(self, resultsPath: Path):
-        self.resultFiles.append(resultsPath)
-        self.treeView.appendResults(Results.fromReportFile(resultsPath))
+        runSettings = ModuleSettings().lastRunSettings
+        if runSettings.doProfileMemory and runSettings.doRecordHistory:
+            growing = self.logic.history.growingMemoryTests(self.dirPathLineEdit.currentPath)
+            self.treeView.setGrowingMemoryNodeIds([test["nodeid"] for test in growing])
+
+        results = self.treeView.lastResults
+        reports = []
+        if runSettings.doProfileTests and self.logic.writeRunProfile(results) is not None:
+            reports.append(f"Run profile: {self.logic.lastRunProfilePath}\n\n{results.getHotFunctionsString()}")
+        if results.startupProfiles:
+            reports.append(results.getStartupProfileString())
+        if reports:
+            self.clearResultText()
+            self.testResultTextEdit.setPlainText("\n\n".join(reports))
+
+    def onResultsAvailable(self, resultsPath: Path, results: Results):
+        self.resultFiles.add(resultsPath, results)
+        if self.logic.durationChecker is not None:
+            results.flagDurationRegressions(self.logic.durationChecker)
+        self.treeView.updateResults(results, self._updatedNodeIds)
 
     def onToggleShowPassed(self, isChecked):
         self.treeView.setShowPassed(isChecked)
@@ -277,10 +482,17 @@ class RunnerWidget(QWidget):
             exportDialog.exec()
 
     def _combineXmlResultFiles(self, filePath):
-        ExportLogic.combineXmlReportFiles(ExportLogic.getXmlReportFilesFromJSonList(self.resultFiles), filePath)
+        excludedNodeIds = {f.with_suffix(".xml"): ids for f, ids in self.resultFiles.supersededNodeIds.items()}
+        ExportLogic.combineXmlReportFiles(
+            ExportLogic.getXmlReportFilesFromJSonList(self.resultFiles.paths), filePath, excludedNodeIds
+        )
 
     def _combineHtmlResultFiles(self, filePath):
-        ExportLogic.combineHtmlReportFiles(ExportLogic.getHtmlReportFilesFromJsonList(self.resultFiles), filePath)
+        # The pytest-html reports can't be filtered. When tests were rerun, the HTML report is converted from the
+        # combined XML report instead.
+        if self.resultFiles.hasSupersededCases():
+            return
+        ExportLogic.combineHtmlReportFiles(ExportLogic.getHtmlReportFilesFromJsonList(self.resultFiles.paths), filePath)
 
     def combineReportFiles(self, destDir):
         destDir = Path(destDir)
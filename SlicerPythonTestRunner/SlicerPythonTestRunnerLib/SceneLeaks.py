@@ -0,0 +1,76 @@
+import gc
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class SceneSnapshot:
+    """
+    State of the 3D Slicer MRML scene and of the VTK objects alive in the worker process.
+
+    - nodes: Number of scene nodes by node class
+    - vtkObjects: Number of VTK objects referenced from Python
+    """
+
+    nodes: Dict[str, int] = field(default_factory=dict)
+    vtkObjects: int = 0
+
+    @classmethod
+    def take(cls) -> "SceneSnapshot":
+        import slicer
+        import vtk
+
+        gc.collect()
+        scene = slicer.mrmlScene
+        nodes = Counter(scene.GetNthNode(i).GetClassName() for i in range(scene.GetNumberOfNodes()))
+        vtkObjects = sum(1 for obj in gc.get_objects() if isinstance(obj, vtk.vtkObjectBase))
+        return cls(dict(nodes), vtkObjects)
+
+    def addedNodes(self, before: "SceneSnapshot") -> Dict[str, int]:
+        """
+        Returns the number of nodes added since the input snapshot by node class.
+        """
+        return {
+            className: count - before.nodes.get(className, 0)
+            for className, count in sorted(self.nodes.items())
+            if count > before.nodes.get(className, 0)
+        }
+
+
+def sceneLeaks(before: SceneSnapshot, afterTest: SceneSnapshot, afterReset: SceneSnapshot) -> Dict:
+    """
+    Returns the leaks of a test as a JSON serializable dict, empty if the test didn't leak.
+
+    - nodes: Nodes left in the scene by the test, by node class
+    - remainingNodes: Nodes still in the scene after the reset (singletons for instance), by node class
+    - vtkObjects: Growth of the number of VTK objects after the reset
+    """
+    leaks = {
+        "nodes": afterTest.addedNodes(before),
+        "remainingNodes": afterReset.addedNodes(before),
+        "vtkObjects": max(afterReset.vtkObjects - before.vtkObjects, 0),
+    }
+    return {key: value for key, value in leaks.items() if value}
+
+
+def sceneLeaksString(leaks: Dict) -> str:
+    if not leaks:
+        return ""
+
+    lines = ["Scene leaks:"]
+    for key, label in [("nodes", "Nodes left in the scene"), ("remainingNodes", "Nodes remaining after reset")]:
+        if leaks.get(key):
+            lines.append(f"  {label}: " + ", ".join(f"{name} x{count}" for name, count in leaks[key].items()))
+    if leaks.get("vtkObjects"):
+        lines.append(f"  VTK objects growth: {leaks['vtkObjects']}")
+    return "\n".join(lines)
+
+
+def resetScene() -> None:
+    """
+    Removes the nodes of the scene, keeping the singleton nodes.
+    """
+    import slicer
+
+    slicer.mrmlScene.Clear(0)
@@ -24,6 +24,31 @@ class RunSettings:
         coverageReportFormats: OptStringList = None,
         coverageSources: OptStringList = None,
         coverageFilePath: Optional[str] = None,
+        doUseLowOverheadCoverage: bool = False,
+        doProfileStartup: bool = False,
+        doUseMinimalModules: bool = False,
+        doRecordCoverageContexts: bool = False,
+        doRunImpactedTestsOnly: bool = False,
+        impactBaseRef: str = "",
+        testNodeIds: OptStringList = None,
+        doRecordHistory: bool = True,
+        sourceRoots: OptStringList = None,
+        shardThreshold_s: float = 0,
+        doDispatchTests: bool = False,
+        dispatchScope: str = "class",
+        doResetSceneBetweenTests: bool = False,
+        doProfileMemory: bool = False,
+        doTraceAllocations: bool = False,
+        doProfileTests: bool = False,
+        doCheckDurationRegressions: bool = False,
+        regressionRatio: float = 2.0,
+        regressionMinDelta_s: float = 0.5,
+        durationBudgetsPath: str = "",
+        maxCapturedOutput_kb: int = 256,
+        maxKeptRuns: int = 20,
+        maxRunsSize_mb: int = 2048,
+        doCompressOldRuns: bool = False,
+        maxSharedDataSize_mb: int = 4096,
         **_,
     ):
         self.doCloseSlicerAfterRun = doCloseSlicerAfterRun
@@ -41,6 +66,81 @@ class RunSettings:
         self.coverageSources = self._toArgList(coverageSources) or None
         self.coverageFilePath = coverageFilePath or None
 
+        # If True, coverage uses the sys.monitoring based core when available (Python 3.12+) and doesn't measure branches
+        self.doUseLowOverheadCoverage = doUseLowOverheadCoverage
+
+        # If True, the workers record their 3D Slicer start up profile in the JSON reports
+        self.doProfileStartup = doProfileStartup
+
+        # If True, the workers are launched ignoring the Slicer modules the test files don't need
+        self.doUseMinimalModules = doUseMinimalModules
+
+        # If True, the coverage data records which test covered each line (one dynamic context per test node id)
+        self.doRecordCoverageContexts = doRecordCoverageContexts
+
+        # If True, only runs the tests whose recorded coverage contexts touch the lines changed since the last coverage
+        # run, or since the impactBaseRef git revision if set.
+        self.doRunImpactedTestsOnly = doRunImpactedTestsOnly
+        self.impactBaseRef = impactBaseRef
+
+        # If set, runs the given test node ids instead of the whole test directory
+        self.testNodeIds = self._toArgList(testNodeIds)
+
+        # If True, the results of each run are stored in the local results history database
+        self.doRecordHistory = doRecordHistory
+
+        # Source directories of the tested code, absolute or relative to the test directory.
+        # Watched in watch mode and indexed with the test directory in the import graph.
+        self.sourceRoots = self._toArgList(sourceRoots)
+
+        # When running test files independently, files whose historical duration exceeds this threshold are split in
+        # several processes running explicit test node ids. 0 disables the split, which is opt-in as the split files
+        # run their file and class fixtures in each of their processes.
+        self.shardThreshold_s = shardThreshold_s
+
+        # If True, the collected tests are put in a work queue and pulled on demand by persistent workers instead of
+        # being assigned to a process per file. The dispatch scope is the granularity of the queued items: "test" for
+        # individual tests, "class" to keep the test classes together or "module" to keep the test files together.
+        self.doDispatchTests = doDispatchTests
+        self.dispatchScope = dispatchScope
+
+        # If True, the MRML scene is cleared after each test and the nodes and VTK objects leaked by each test are
+        # reported in the results
+        self.doResetSceneBetweenTests = doResetSceneBetweenTests
+
+        # If True, the RSS of the workers is recorded around each test. Tracing the allocations additionally records
+        # the Python allocations peak and top allocations of each test using tracemalloc, which slows the tests down.
+        self.doProfileMemory = doProfileMemory
+        self.doTraceAllocations = doTraceAllocations
+
+        # If True, each test call is profiled using cProfile and its profile is saved next to the JSON report
+        self.doProfileTests = doProfileTests
+
+        # If True, the test durations are compared to their budget or to their median over the previous runs. Tests
+        # slower than their budget or than their median times the ratio (and by more than the minimal delta) are
+        # flagged as regressions. The budgets file maps node ids or node id patterns to their budget in seconds and is
+        # resolved relative to the test directory.
+        self.doCheckDurationRegressions = doCheckDurationRegressions
+        self.regressionRatio = regressionRatio
+        self.regressionMinDelta_s = regressionMinDelta_s
+        self.durationBudgetsPath = durationBudgetsPath
+
+        # Captured stdout, stderr and logs of a test stage longer than this size are truncated in the reports and
+        # written in full in log files next to the JSON report. 0 keeps the full outputs in the reports.
+        self.maxCapturedOutput_kb = maxCapturedOutput_kb
+
+        # Retention of the run directories containing the generated scripts and reports. When starting a run, at start
+        # up and when closing the module, the least recently used runs beyond the maximal number of runs or the maximal
+        # total size are removed. 0 disables the corresponding limit. If compressing, the runs older than the three
+        # last ones are zipped.
+        self.maxKeptRuns = maxKeptRuns
+        self.maxRunsSize_mb = maxRunsSize_mb
+        self.doCompressOldRuns = doCompressOldRuns
+
+        # Maximal size of the data cache shared by the test workers (`shared_data_cache` fixture). The least recently
+        # used datasets beyond this size are removed with the run directories. 0 disables the limit.
+        self.maxSharedDataSize_mb = maxSharedDataSize_mb
+
     @staticmethod
     def _toArgList(value: OptStringList) -> List[str]:
         if not value:
@@ -66,6 +166,12 @@ class RunSettings:
         with open(filePath, "r") as f:
             return cls.fromJson(f.read())
 
+    def watchedDirs(self, testDir: Path) -> List[Path]:
+        """
+        Returns the test directory and the source roots resolved relative to it.
+        """
+        return [Path(testDir), *(Path(testDir).joinpath(root) for root in self.sourceRoots)]
+
     @classmethod
     def pytestFileFilterArgs(cls, filePattern: str) -> List[str]:
         return cls._pytestFilterArgs("python_files", filePattern)
@@ -77,6 +183,24 @@ class RunSettings:
 
         return ["-k", functionPattern]
 
+    @classmethod
+    def pytestDeselectArgs(cls, nodeIds: List[str]) -> List[str]:
+        return [f"--deselect={nodeId}" for nodeId in nodeIds]
+
+    @classmethod
+    def absoluteNodeIdsByFile(cls, testDir: Path, nodeIds: List[str]) -> Dict[Path, List[str]]:
+        """
+        Groups the input node ids by test file and makes them absolute.
+        Node ids are expected relative to the test directory, as reported by PyTest when run from this directory.
+        Absolute node ids can be run by the workers independently of their PyTest root directory.
+        """
+        nodeIdsByFile = {}
+        for nodeId in nodeIds:
+            fileName, separator, testName = nodeId.partition("::")
+            filePath = Path(testDir).joinpath(fileName)
+            nodeIdsByFile.setdefault(filePath, []).append(f"{filePath.as_posix()}{separator}{testName}")
+        return nodeIdsByFile
+
     @classmethod
     def _pytestFilterArgs(cls, filterName: str, filterPattern: str) -> List[str]:
         """
@@ -2,6 +2,8 @@ from typing import List
 
 from .QWidget import QDialog
 from .Settings import RunSettings
+from .Sharding import dispatchScopes
+from .SharedDataCache import SharedDataCache
 
 
 def create_checkbox(tooltip, isChecked):
@@ -57,12 +59,132 @@ class SettingsDialog(QDialog):
             "Maximum number of parallel 3D Slicer instances " "launched when parallel run is active."
         )
 
+        self.shardThreshold = qt.QSpinBox()
+        self.shardThreshold.maximum = 24 * 3600
+        self.shardThreshold.value = int(settings.shardThreshold_s)
+        self.shardThreshold.suffix = " s"
+        self.shardThreshold.toolTip = (
+            "When running in parallel, splits the test files whose recorded duration exceeds this threshold in\n"
+            "several Slicer instances, each running a contiguous chunk of the file's tests. The module and class\n"
+            "fixtures of a split file run once per instance. Requires the results history.\n"
+            "0 (default) disables the split."
+        )
+
+        self.maxCapturedOutput = qt.QSpinBox()
+        self.maxCapturedOutput.maximum = 1024 * 1024
+        self.maxCapturedOutput.singleStep = 64
+        self.maxCapturedOutput.value = settings.maxCapturedOutput_kb
+        self.maxCapturedOutput.suffix = " kB"
+        self.maxCapturedOutput.toolTip = (
+            "Captured outputs longer than this size are truncated in the reports and saved in full in log files,\n"
+            "loaded on demand in the results pane. 0 keeps the full outputs in the reports."
+        )
+
+        self.maxKeptRuns = qt.QSpinBox()
+        self.maxKeptRuns.maximum = 10000
+        self.maxKeptRuns.value = settings.maxKeptRuns
+        self.maxKeptRuns.toolTip = "Maximal number of run report directories kept on disk. 0 disables the limit."
+
+        self.maxRunsSize = qt.QSpinBox()
+        self.maxRunsSize.maximum = 1024 * 1024
+        self.maxRunsSize.singleStep = 256
+        self.maxRunsSize.value = settings.maxRunsSize_mb
+        self.maxRunsSize.suffix = " MB"
+        self.maxRunsSize.toolTip = (
+            "Maximal total size of the run report directories kept on disk.\n"
+            "The least recently used runs are removed first. 0 disables the limit."
+        )
+
+        self.maxSharedDataSize = qt.QSpinBox()
+        self.maxSharedDataSize.maximum = 1024 * 1024
+        self.maxSharedDataSize.singleStep = 256
+        self.maxSharedDataSize.value = settings.maxSharedDataSize_mb
+        self.maxSharedDataSize.suffix = " MB"
+        self.maxSharedDataSize.toolTip = (
+            "Maximal size of the data cache shared by the test instances (shared_data_cache fixture).\n"
+            "The least recently used datasets are removed first. 0 disables the limit."
+        )
+
+        self.clearSharedDataButton = qt.QPushButton("Clear")
+        self.clearSharedDataButton.toolTip = "Removes all the datasets of the shared data cache."
+        self.clearSharedDataButton.clicked.connect(self.onClearSharedDataClicked)
+
+        sharedDataLayout = qt.QHBoxLayout()
+        sharedDataLayout.addWidget(self.maxSharedDataSize, 1)
+        sharedDataLayout.addWidget(self.clearSharedDataButton)
+
+        self.doCompressOldRunsCheckBox = create_checkbox(
+            tooltip="If checked, the run report directories older than the three last runs are compressed.",
+            isChecked=settings.doCompressOldRuns,
+        )
+
+        self.doDispatchTestsCheckBox = create_checkbox(
+            tooltip="If checked, parallel runs put the collected tests in a queue pulled on demand by persistent\n"
+            "Slicer instances instead of running each test file in its own instance.",
+            isChecked=settings.doDispatchTests,
+        )
+
+        self.dispatchScopeComboBox = qt.QComboBox()
+        self.dispatchScopeComboBox.addItems(dispatchScopes)
+        self.dispatchScopeComboBox.setCurrentText(settings.dispatchScope)
+        self.dispatchScopeComboBox.toolTip = (
+            "Tests dispatched together: each test individually, the tests of each class or the tests of each file."
+        )
+
+        self.doResetSceneBetweenTestsCheckBox = create_checkbox(
+            tooltip="If checked, clears the MRML scene after each test and reports the scene nodes and VTK objects\n"
+            "leaked by each test in its results.",
+            isChecked=settings.doResetSceneBetweenTests,
+        )
+
+        self.doProfileMemoryCheckBox = create_checkbox(
+            tooltip="If checked, records the memory use (RSS) of the Slicer instances before and after each test.\n"
+            "Tests whose memory grows in each of their last runs are highlighted. Requires the results history.",
+            isChecked=settings.doProfileMemory,
+        )
+
+        self.doTraceAllocationsCheckBox = create_checkbox(
+            tooltip="If checked with the memory profiling, also records the Python allocations peak and the source\n"
+            "lines allocating the most memory of each test. Tracing the allocations slows the tests down.",
+            isChecked=settings.doTraceAllocations,
+        )
+
+        self.doProfileTestsCheckBox = create_checkbox(
+            tooltip="If checked, profiles each test call using cProfile and saves a .prof file per test.\n"
+            "The hot functions of the selected tests are shown in the results and the profiles of the run are merged\n"
+            "in a single file at the end of the run.",
+            isChecked=settings.doProfileTests,
+        )
+
         self.doRunCoverageCheckBox = create_checkbox(
             tooltip="If checked, launches test coverage for given folder.\n"
             "Coverage will use the local .coveragerc file if any is present.",
             isChecked=settings.doRunCoverage,
         )
 
+        self.doProfileStartupCheckBox = create_checkbox(
+            tooltip="If checked, records the 3D Slicer start up profile of each test process in the results.\n"
+            "The profile contains the start up phase durations, the loaded modules and the modules which are not\n"
+            "referenced by the tests and could be passed to Slicer's --modules-to-ignore argument.\n"
+            "The mean phase durations and the modules to ignore are displayed at the end of the run.",
+            isChecked=settings.doProfileStartup,
+        )
+
+        self.doUseMinimalModulesCheckBox = create_checkbox(
+            tooltip="If checked, launches the test processes ignoring the Slicer modules the test files and their imports\n"
+            "don't need. Falls back to a full launch if a test fails on a missing module.\n"
+            "The module dependency graph is extracted from the running Slicer and cached.",
+            isChecked=settings.doUseMinimalModules,
+        )
+
+        self.doRecordHistoryCheckBox = create_checkbox(
+            tooltip="If checked, stores the results of each run in the local results history database.\n"
+            "The history is used to rerun the failing tests and to query the slowest and flaky tests.\n"
+            "The database is stored in the Slicer cache directory. It contains the compressed captured outputs of\n"
+            "the tests and keeps the last 200 runs of each test directory.",
+            isChecked=settings.doRecordHistory,
+        )
+
         self.extraSlicerArgsLineEdit = create_text_list_line_edit(
             tooltip="Comma separated list of extra Slicer args to pass to run.",
             placeholder="--no-splash,--disable-modules,--ignore-slicerrc",
@@ -93,19 +215,109 @@ class SettingsDialog(QDialog):
             textArgs=settings.coverageFilePath,
         )
 
+        self.doUseLowOverheadCoverageCheckBox = create_checkbox(
+            tooltip="If checked, coverage uses its sys.monitoring based core when available (Python 3.12 and above)\n"
+            "and doesn't measure branches. Measurement is limited to the coverage sources.\n"
+            "The coverage set up duration and measurement core are reported in the run timeline.",
+            isChecked=settings.doUseLowOverheadCoverage,
+        )
+
+        self.doRecordCoverageContextsCheckBox = create_checkbox(
+            tooltip="If checked, the coverage data records which test covered each line.\n"
+            "Required by the impacted tests run.",
+            isChecked=settings.doRecordCoverageContexts,
+        )
+
+        self.doRunImpactedTestsOnlyCheckBox = create_checkbox(
+            tooltip="If checked, only runs the tests covering the source lines changed since the last coverage run.\n"
+            "If no per test coverage was recorded, runs the test files importing the changed files since the last run.\n"
+            "Runs all the tests if a changed file is unknown to the coverage or if there is no previous run.",
+            isChecked=settings.doRunImpactedTestsOnly,
+        )
+
+        self.impactBaseRefLineEdit = create_text_list_line_edit(
+            tooltip="Git revision the changes are computed against for the impacted tests run.\n"
+            "If empty, the files modified after the last coverage run are considered changed.",
+            placeholder="HEAD",
+            textArgs=settings.impactBaseRef,
+        )
+
+        self.doCheckDurationRegressionsCheckBox = create_checkbox(
+            tooltip="If checked, flags the tests slower than their duration budget or than their median duration over\n"
+            "the previous runs times the regression ratio. Requires the results history.",
+            isChecked=settings.doCheckDurationRegressions,
+        )
+
+        self.regressionRatio = qt.QDoubleSpinBox()
+        self.regressionRatio.minimum = 1.0
+        self.regressionRatio.maximum = 100.0
+        self.regressionRatio.singleStep = 0.5
+        self.regressionRatio.value = settings.regressionRatio
+        self.regressionRatio.suffix = " x"
+        self.regressionRatio.toolTip = (
+            "Tests slower than their median duration times this ratio, by more than their usual variation, are\n"
+            "flagged as regressions."
+        )
+
+        self.regressionMinDelta = qt.QDoubleSpinBox()
+        self.regressionMinDelta.maximum = 3600.0
+        self.regressionMinDelta.singleStep = 0.1
+        self.regressionMinDelta.value = settings.regressionMinDelta_s
+        self.regressionMinDelta.suffix = " s"
+        self.regressionMinDelta.toolTip = "Tests are flagged only if slower than their median by at least this delay."
+
+        self.durationBudgetsPathLineEdit = create_text_list_line_edit(
+            tooltip="JSON file mapping test node ids or node id patterns to their duration budget in seconds.\n"
+            "The path is relative to the test directory. The duration_budget marker overrides the file budgets.",
+            placeholder="duration_budgets.json",
+            textArgs=settings.durationBudgetsPath,
+        )
+
+        self.sourceRootsLineEdit = create_text_list_line_edit(
+            tooltip="Comma separated list of the source directories of the tested code.\n"
+            "Paths can be absolute or relative to the test directory. They are watched in watch mode.",
+            placeholder="../src,../my_lib",
+            textArgs=settings.sourceRoots,
+        )
+
         formLayout = qt.QFormLayout()
         formLayout.addRow("Close Slicer after run:", self.doCloseSlicerAfterRunCheckBox)
         formLayout.addRow("Use main Window:", self.doUseMainWindowCheckBox)
         formLayout.addRow("Minimize main Window:", self.doMinimizeMainWindowCheckBox)
         formLayout.addRow("Max Slicer instances:", self.nParallelInstances)
+        formLayout.addRow("Split files longer than:", self.shardThreshold)
+        formLayout.addRow("Dispatch tests on demand:", self.doDispatchTestsCheckBox)
+        formLayout.addRow("Dispatch scope:", self.dispatchScopeComboBox)
+        formLayout.addRow("Reset scene between tests:", self.doResetSceneBetweenTestsCheckBox)
+        formLayout.addRow("Profile test memory:", self.doProfileMemoryCheckBox)
+        formLayout.addRow("Trace test allocations:", self.doTraceAllocationsCheckBox)
+        formLayout.addRow("Profile tests (cProfile):", self.doProfileTestsCheckBox)
+        formLayout.addRow("Max captured output:", self.maxCapturedOutput)
+        formLayout.addRow("Max kept runs:", self.maxKeptRuns)
+        formLayout.addRow("Max runs size:", self.maxRunsSize)
+        formLayout.addRow("Compress old runs:", self.doCompressOldRunsCheckBox)
+        formLayout.addRow("Max shared data size:", sharedDataLayout)
+        formLayout.addRow("Profile Slicer start up:", self.doProfileStartupCheckBox)
+        formLayout.addRow("Use minimal modules:", self.doUseMinimalModulesCheckBox)
+        formLayout.addRow("Record results history:", self.doRecordHistoryCheckBox)
         formLayout.addRow(qt.QLabel(""))
         formLayout.addRow("Extra Slicer args:", self.extraSlicerArgsLineEdit)
         formLayout.addRow("Extra PyTest args:", self.extraPytestArgsLineEdit)
+        formLayout.addRow("Source roots:", self.sourceRootsLineEdit)
         formLayout.addRow(qt.QLabel(""))
         formLayout.addRow("Run test coverage:", self.doRunCoverageCheckBox)
         formLayout.addRow("Coverage report formats:", self.coverageReportFormatsLineEdit)
         formLayout.addRow("Coverage sources:", self.coverageSourcesLineEdit)
         formLayout.addRow("Coverage path:", self.coverageFilePathLineEdit)
+        formLayout.addRow("Low overhead coverage:", self.doUseLowOverheadCoverageCheckBox)
+        formLayout.addRow("Record coverage per test:", self.doRecordCoverageContextsCheckBox)
+        formLayout.addRow("Run impacted tests only:", self.doRunImpactedTestsOnlyCheckBox)
+        formLayout.addRow("Impact base revision:", self.impactBaseRefLineEdit)
+        formLayout.addRow(qt.QLabel(""))
+        formLayout.addRow("Check duration regressions:", self.doCheckDurationRegressionsCheckBox)
+        formLayout.addRow("Regression ratio:", self.regressionRatio)
+        formLayout.addRow("Regression min delta:", self.regressionMinDelta)
+        formLayout.addRow("Duration budgets file:", self.durationBudgetsPathLineEdit)
 
         self.okButton = qt.QPushButton("Ok")
         self.okButton.clicked.connect(self.onOkClicked)
@@ -134,7 +346,31 @@ class SettingsDialog(QDialog):
             coverageReportFormats=self.toList(self.coverageReportFormatsLineEdit.text),
             coverageSources=self.toList(self.coverageSourcesLineEdit.text),
             coverageFilePath=self.coverageFilePathLineEdit.text or None,
+            doUseLowOverheadCoverage=self.doUseLowOverheadCoverageCheckBox.isChecked(),
             nParallelInstances=self.nParallelInstances.value,
+            shardThreshold_s=self.shardThreshold.value,
+            doDispatchTests=self.doDispatchTestsCheckBox.isChecked(),
+            dispatchScope=self.dispatchScopeComboBox.currentText,
+            doResetSceneBetweenTests=self.doResetSceneBetweenTestsCheckBox.isChecked(),
+            doProfileMemory=self.doProfileMemoryCheckBox.isChecked(),
+            doTraceAllocations=self.doTraceAllocationsCheckBox.isChecked(),
+            doProfileTests=self.doProfileTestsCheckBox.isChecked(),
+            doCheckDurationRegressions=self.doCheckDurationRegressionsCheckBox.isChecked(),
+            regressionRatio=self.regressionRatio.value,
+            regressionMinDelta_s=self.regressionMinDelta.value,
+            durationBudgetsPath=self.durationBudgetsPathLineEdit.text.strip(),
+            maxCapturedOutput_kb=self.maxCapturedOutput.value,
+            maxKeptRuns=self.maxKeptRuns.value,
+            maxRunsSize_mb=self.maxRunsSize.value,
+            doCompressOldRuns=self.doCompressOldRunsCheckBox.isChecked(),
+            maxSharedDataSize_mb=self.maxSharedDataSize.value,
+            doProfileStartup=self.doProfileStartupCheckBox.isChecked(),
+            doUseMinimalModules=self.doUseMinimalModulesCheckBox.isChecked(),
+            doRecordHistory=self.doRecordHistoryCheckBox.isChecked(),
+            doRecordCoverageContexts=self.doRecordCoverageContextsCheckBox.isChecked(),
+            doRunImpactedTestsOnly=self.doRunImpactedTestsOnlyCheckBox.isChecked(),
+            impactBaseRef=self.impactBaseRefLineEdit.text.strip(),
+            sourceRoots=self.toList(self.sourceRootsLineEdit.text),
         )
 
     @classmethod
@@ -146,3 +382,7 @@ class SettingsDialog(QDialog):
 
     def onCancelClicked(self):
         self.reject()
+
+    @staticmethod
+    def onClearSharedDataClicked():
+        SharedDataCache().clear()
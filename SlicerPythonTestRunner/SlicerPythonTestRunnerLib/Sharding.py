@@ -0,0 +1,119 @@
+import math
+from typing import Dict, List
+
+
+def shardNodeIds(
+    nodeIds: List[str], durations: Dict[str, float], threshold_s: float, maxShards: int
+) -> List[List[str]]:
+    """
+    Splits the input test node ids of a test file in contiguous chunks of similar historical duration.
+
+    The file is split only if its historical duration exceeds the threshold, in at most maxShards chunks of about the
+    threshold duration. Tests without history are given the mean duration of the known tests. Chunks are contiguous to
+    keep the tests sharing class scoped fixtures together.
+    Files with collection errors (node ids without test part) are not split.
+    """
+    if threshold_s <= 0 or maxShards < 2 or len(nodeIds) < 2 or any("::" not in nodeId for nodeId in nodeIds):
+        return [nodeIds]
+
+    known = [durations[nodeId] for nodeId in nodeIds if nodeId in durations]
+    if not known:
+        return [nodeIds]
+
+    meanDuration = sum(known) / len(known)
+    testDurations = [durations.get(nodeId, meanDuration) for nodeId in nodeIds]
+    totalDuration = sum(testDurations)
+    nShards = min(maxShards, len(nodeIds), math.ceil(totalDuration / threshold_s))
+    if nShards < 2:
+        return [nodeIds]
+
+    shardDuration = totalDuration / nShards
+    shards: List[List[str]] = [[]]
+    cumulatedDuration = 0.0
+    for nodeId, duration in zip(nodeIds, testDurations):
+        if cumulatedDuration >= shardDuration * len(shards) and len(shards) < nShards and shards[-1]:
+            shards.append([])
+        shards[-1].append(nodeId)
+        cumulatedDuration += duration
+    return shards
+
+
+# Node id prefix shared by the tests dispatched together for each dispatch scope
+dispatchScopes = ["test", "class", "module"]
+
+
+def dispatchGroupKey(nodeId: str, scope: str) -> str:
+    parts = nodeId.split("::")
+    if scope == "module" or len(parts) < 2:
+        return parts[0]
+    if scope == "class" and len(parts) > 2:
+        return "::".join(parts[:2])
+    return nodeId
+
+
+def dispatchGroups(nodeIds: List[str], scope: str, durations: Dict[str, float]) -> List[List[str]]:
+    """
+    Groups the input node ids by dispatch scope, keeping the tests sharing class or module scoped fixtures together.
+    Groups are ordered by decreasing historical duration for the longest groups not to be started last. Tests without
+    history are given the mean duration of the known tests.
+    """
+    groups: Dict[str, List[str]] = {}
+    for nodeId in nodeIds:
+        groups.setdefault(dispatchGroupKey(nodeId, scope), []).append(nodeId)
+
+    known = [durations[nodeId] for nodeId in nodeIds if nodeId in durations]
+    meanDuration = sum(known) / len(known) if known else 0
+
+    def groupDuration(group: List[str]) -> float:
+        return sum(durations.get(nodeId, meanDuration) for nodeId in group)
+
+    return sorted(groups.values(), key=groupDuration, reverse=True)
+
+
+# Minimal mean set up duration of a shared fixture for its tests to be dispatched together
+costlyFixtureThreshold_s = 1.0
+
+
+def fixtureAwareGroups(
+    groups: List[List[str]],
+    fixtureUsage: Dict[str, List[str]],
+    setupDurations: Dict[str, float],
+    durations: Dict[str, float],
+    nWorkers: int,
+) -> List[List[str]]:
+    """
+    Merges the dispatch groups sharing the same costly session, package or module scoped fixture for the fixture to be
+    set up once per merged group instead of once per group.
+
+    Each group is keyed by its most expensive fixture, if its measured set up duration exceeds the costly fixture
+    threshold. Groups with the same key are merged in chunks of at most the total duration divided by the number of
+    workers to keep the workers balanced. The result is ordered by decreasing historical duration.
+    """
+    known = [durations[nodeId] for group in groups for nodeId in group if nodeId in durations]
+    meanDuration = sum(known) / len(known) if known else 0
+
+    def groupDuration(group: List[str]) -> float:
+        return sum(durations.get(nodeId, meanDuration) for nodeId in group)
+
+    def costlyFixture(group: List[str]) -> str:
+        keys = {key for nodeId in group for key in fixtureUsage.get(nodeId, [])}
+        costs = [(setupDurations[key], key) for key in keys if setupDurations.get(key, 0) >= costlyFixtureThreshold_s]
+        return max(costs)[1] if costs else ""
+
+    maxChunkDuration = sum(groupDuration(group) for group in groups) / max(nWorkers, 1)
+    merged: List[List[str]] = []
+    chunks: Dict[str, List[str]] = {}
+    for group in groups:
+        key = costlyFixture(group)
+        if not key:
+            merged.append(group)
+            continue
+
+        chunk = chunks.get(key)
+        if chunk is not None and groupDuration(chunk) + groupDuration(group) <= maxChunkDuration:
+            chunk.extend(group)
+            continue
+
+        chunks[key] = list(group)
+        merged.append(chunks[key])
+    return sorted(merged, key=groupDuration, reverse=True)
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
+
+from .CachePath import cacheDir
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class SharedDataCache:
+    """
+    Read-only test data cache shared by the parallel test workers.
+
+    Each dataset is loaded once, by the first worker requesting it, and stored as a raw NumPy array (.npy) with its
+    JSON metadata. The workers then memory map the stored array instead of loading the data again. The mapped pages are
+    shared by the processes through the OS page cache, so that the memory use scales with the data size instead of the
+    data size times the number of workers.
+
+    Arrays are mapped copy-on-write: tests may modify their array without affecting the cache or the other workers.
+
+    The cache is available in the tests run by the runner through the session scoped `shared_data_cache` fixture.
+    The least recently used datasets are removed when the cache exceeds RunSettings.maxSharedDataSize_mb.
+    """
+
+    def __init__(self, dataDir: Optional[Union[str, Path]] = None, lockTimeout_s: float = 600):
+        self.dataDir = Path(dataDir) if dataDir else cacheDir().joinpath("shared_data")
+        self.dataDir.mkdir(parents=True, exist_ok=True)
+        self.lockTimeout_s = lockTimeout_s
+
+    def _arrayPath(self, name: str) -> Path:
+        return self.dataDir / f"{name}.npy"
+
+    def _metadataPath(self, name: str) -> Path:
+        return self.dataDir / f"{name}.json"
+
+    def contains(self, name: str) -> bool:
+        return self._metadataPath(name).is_file()
+
+    def array(self, name: str, loadF: Callable[[], Tuple["np.ndarray", Dict]]) -> Tuple["np.ndarray", Dict]:
+        """
+        Returns the memory mapped array of the input dataset and its metadata.
+        If the dataset is not cached yet, it is loaded once using loadF returning the array and its JSON serializable
+        metadata. Workers requesting the dataset while it is loaded wait for the loading worker to store it.
+        """
+        import numpy as np
+
+        if not self.contains(name):
+            with self._lock(name):
+                if not self.contains(name):
+                    self._store(name, *loadF())
+
+        metadata = json.loads(self._metadataPath(name).read_text())
+        self._markUsed(name)
+        return np.load(self._arrayPath(name), mmap_mode="c"), metadata
+
+    def _markUsed(self, name: str) -> None:
+        try:
+            os.utime(self._metadataPath(name))
+        except OSError:
+            pass
+
+    def _store(self, name: str, array: "np.ndarray", metadata: Dict) -> None:
+        """
+        Writes then moves the array and metadata for them to be visible to the other workers only once complete.
+        The metadata is moved last as it marks the dataset as cached.
+        """
+        import numpy as np
+
+        tmpArrayPath = self.dataDir / f"{name}.{os.getpid()}.tmp.npy"
+        np.save(tmpArrayPath, np.ascontiguousarray(array))
+        os.replace(tmpArrayPath, self._arrayPath(name))
+
+        tmpMetadataPath = self.dataDir / f"{name}.{os.getpid()}.tmp.json"
+        tmpMetadataPath.write_text(json.dumps(metadata))
+        os.replace(tmpMetadataPath, self._metadataPath(name))
+
+    @contextmanager
+    def _lock(self, name: str, poll_s: float = 0.05):
+        """
+        Inter process lock of the input dataset. Locks older than the lock timeout are considered left by a crashed
+        worker and are taken over. The lock is refreshed while held, for long loads not to lose it.
+        """
+        lockPath = self.dataDir / f"{name}.lock"
+        while True:
+            try:
+                os.close(os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lockPath.stat().st_mtime > self.lockTimeout_s:
+                        lockPath.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(poll_s)
+
+        isReleased = threading.Event()
+        refreshThread = threading.Thread(target=self._refreshLock, args=(lockPath, isReleased), daemon=True)
+        refreshThread.start()
+        try:
+            yield
+        finally:
+            isReleased.set()
+            refreshThread.join()
+            lockPath.unlink(missing_ok=True)
+
+    def _refreshLock(self, lockPath: Path, isReleased: threading.Event) -> None:
+        while not isReleased.wait(self.lockTimeout_s / 4):
+            try:
+                os.utime(lockPath)
+            except OSError:
+                pass
+
+    @staticmethod
+    def fileDatasetName(filePath: Union[str, Path]) -> str:
+        """
+        Returns the dataset name of the input data file. The name changes if the file is modified.
+        """
+        filePath = Path(filePath).resolve()
+        stat = filePath.stat()
+        key = hashlib.sha1(f"{filePath.as_posix()};{stat.st_mtime};{stat.st_size}".encode()).hexdigest()[:12]
+        return f"{filePath.name}_{key}"
+
+    def volumeArray(self, filePath: Union[str, Path]) -> Tuple["np.ndarray", Dict]:
+        """
+        Returns the memory mapped voxel array of the input volume file and its geometry.
+        The volume is loaded in 3D Slicer by the first worker requesting it.
+        """
+        return self.array(self.fileDatasetName(filePath), lambda: self._loadVolumeArray(filePath))
+
+    @staticmethod
+    def _loadVolumeArray(filePath: Union[str, Path]) -> Tuple["np.ndarray", Dict]:
+        import slicer
+        import vtk
+
+        volumeNode = slicer.util.loadVolume(str(filePath))
+        try:
+            directions = vtk.vtkMatrix4x4()
+            volumeNode.GetIJKToRASDirectionMatrix(directions)
+            metadata = {
+                "nodeClass": volumeNode.GetClassName(),
+                "spacing": list(volumeNode.GetSpacing()),
+                "origin": list(volumeNode.GetOrigin()),
+                "directions": [[directions.GetElement(i, j) for j in range(3)] for i in range(3)],
+            }
+            return slicer.util.arrayFromVolume(volumeNode), metadata
+        finally:
+            slicer.mrmlScene.RemoveNode(volumeNode)
+
+    def loadVolume(self, filePath: Union[str, Path], name: str = ""):
+        """
+        Creates a volume node of the input volume file backed by the memory mapped cache array.
+        The image data references the mapped array without copying it.
+        """
+        import slicer
+        import vtk
+        from vtk.util.numpy_support import numpy_to_vtk
+
+        array, metadata = self.volumeArray(filePath)
+        volumeNode = slicer.mrmlScene.AddNewNodeByClass(metadata["nodeClass"], name or Path(filePath).stem)
+        volumeNode.SetSpacing(metadata["spacing"])
+        volumeNode.SetOrigin(metadata["origin"])
+        volumeNode.SetIJKToRASDirections(metadata["directions"])
+
+        imageData = vtk.vtkImageData()
+        imageData.SetDimensions(array.shape[2::-1])
+        scalars = numpy_to_vtk(array.reshape(-1, *array.shape[3:]), deep=False)
+        imageData.GetPointData().SetScalars(scalars)
+        volumeNode.SetAndObserveImageData(imageData)
+        volumeNode.CreateDefaultDisplayNodes()
+        return volumeNode
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dataDir, ignore_errors=True)
+        self.dataDir.mkdir(parents=True, exist_ok=True)
+
+    def applyRetention(self, maxSize_mb: float) -> None:
+        """
+        Removes the least recently used datasets until the cache is smaller than the input size, and the temporary
+        files left by crashed workers. Datasets being loaded are kept. 0 disables the size limit.
+        """
+        for tmpPath in self.dataDir.glob("*.tmp.*"):
+            self._removeIfOlderThan(tmpPath, self.lockTimeout_s)
+
+        if maxSize_mb <= 0:
+            return
+
+        datasets = []
+        for metadataPath in self.dataDir.glob("*.json"):
+            name = metadataPath.stem
+            if name.endswith(".tmp") or self.dataDir.joinpath(f"{name}.lock").exists():
+                continue
+            try:
+                size = metadataPath.stat().st_size + self._arrayPath(name).stat().st_size
+                datasets.append((metadataPath.stat().st_mtime, name, size))
+            except FileNotFoundError:
+                continue
+
+        totalSize = sum(size for _, _, size in datasets)
+        for _, name, size in sorted(datasets):
+            if totalSize <= maxSize_mb * 1024 * 1024:
+                break
+            if self._remove(name):
+                totalSize -= size
+
+    def _remove(self, name: str) -> bool:
+        """
+        Removes the input dataset, metadata first for the other workers to see it as not cached.
+        Returns False if the dataset is in use and cannot be removed (Windows mapped files).
+        """
+        try:
+            self._metadataPath(name).unlink(missing_ok=True)
+            self._arrayPath(name).unlink(missing_ok=True)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _removeIfOlderThan(path: Path, age_s: float) -> None:
+        try:
+            if time.time() - path.stat().st_mtime > age_s:
+                path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,208 @@
+import re
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+
+@dataclass
+class StartupProfile:
+    """
+    3D Slicer start up information recorded in a test worker when RunSettings.doProfileStartup is enabled.
+    Timestamps are expressed in seconds since epoch.
+
+    - launcherCreated: Slicer launcher process creation
+    - applicationCreated: Slicer application process creation
+    - scriptStart: Generated test Python script started executing (application start up finished)
+    - runnerImported: Runner core finished importing
+    - pytestImportDuration: Duration of the PyTest and pytest-json-report imports
+    - loadedModules: Names of the modules loaded by the application, by module type (scripted, loadable, cli)
+    - moduleDependencies: Dependencies of each loaded module
+    - slicerrcPath: Path to the Slicer RC file executed at start up if any
+    - settingsPaths: Paths to the settings files loaded at start up
+    - testFiles: Test files run by the worker
+    - referencedModules: Loaded modules referenced in the test files
+    - recommendedModulesToIgnore: Loaded modules the test files don't reference nor depend on
+    """
+
+    launcherCreated: float = 0
+    applicationCreated: float = 0
+    scriptStart: float = 0
+    runnerImported: float = 0
+    pytestImportDuration: float = 0
+    loadedModules: Dict[str, List[str]] = field(default_factory=dict)
+    moduleDependencies: Dict[str, List[str]] = field(default_factory=dict)
+    slicerrcPath: str = ""
+    settingsPaths: List[str] = field(default_factory=list)
+    testFiles: List[str] = field(default_factory=list)
+    referencedModules: List[str] = field(default_factory=list)
+    recommendedModulesToIgnore: List[str] = field(default_factory=list)
+
+    @property
+    def phaseDurations(self) -> Dict[str, float]:
+        """
+        Durations of the worker start up phases in seconds.
+        The application phase contains the module loading, Python scripted module initialization, settings and
+        slicerrc loading. Use `RunnerLogic.profileStartupPhases` to split it further.
+        """
+
+        def duration(start, end):
+            return max(0.0, end - start) if start and end else 0.0
+
+        return {
+            "launcher": duration(self.launcherCreated, self.applicationCreated),
+            "application": duration(self.applicationCreated, self.scriptStart),
+            "runnerImport": duration(self.scriptStart, self.runnerImported),
+            "pytestImport": self.pytestImportDuration,
+        }
+
+    @property
+    def allLoadedModules(self) -> List[str]:
+        return sorted({name for names in self.loadedModules.values() for name in names})
+
+    def asDict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def fromDict(cls, profileDict: Dict) -> "StartupProfile":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in profileDict.items() if k in names})
+
+    @classmethod
+    def fromCurrentProcess(cls, scriptStart: float, runnerImported: float) -> "StartupProfile":
+        """
+        Records the start up information of the current Slicer process.
+        Imports PyTest to measure its import duration.
+        """
+        profile = cls(scriptStart=scriptStart, runnerImported=runnerImported)
+        profile._recordProcessCreation()
+        profile._recordSlicerModules()
+        profile._recordSlicerFiles()
+
+        start = time.time()
+        import pytest  # noqa
+        from pytest_jsonreport.plugin import JSONReport  # noqa
+
+        profile.pytestImportDuration = time.time() - start
+        return profile
+
+    def _recordProcessCreation(self) -> None:
+        try:
+            import psutil
+
+            process = psutil.Process()
+            self.applicationCreated = process.create_time()
+            parent = process.parent()
+            isLauncher = parent is not None and "slicer" in parent.name().lower()
+            self.launcherCreated = parent.create_time() if isLauncher else self.applicationCreated
+        except Exception:  # noqa
+            pass
+
+    def _recordSlicerModules(self) -> None:
+        try:
+            import slicer
+
+            manager = slicer.app.moduleManager()
+            loadedNames = manager.factoryManager().loadedModuleNames()
+        except (ImportError, AttributeError):
+            return
+
+        for name in loadedNames:
+            module = manager.module(name)
+            if module is None:
+                continue
+
+            self.loadedModules.setdefault(self._moduleType(module), []).append(name)
+            dependencies = getattr(module, "dependencies", [])
+            self.moduleDependencies[name] = list(dependencies() if callable(dependencies) else dependencies)
+
+    @staticmethod
+    def _moduleType(module) -> str:
+        try:
+            className = module.metaObject().className()
+        except AttributeError:
+            className = type(module).__name__
+
+        if "Scripted" in className:
+            return "scripted"
+        if "CLI" in className:
+            return "cli"
+        return "loadable"
+
+    def _recordSlicerFiles(self) -> None:
+        try:
+            import slicer
+            from slicer.slicerqt import getSlicerRCFileName
+
+            rcFile = Path(getSlicerRCFileName())
+            self.slicerrcPath = rcFile.as_posix() if rcFile.is_file() else ""
+        except (ImportError, AttributeError):
+            return
+
+        for attr in ["slicerUserSettingsFilePath", "slicerRevisionUserSettingsFilePath"]:
+            path = getattr(slicer.app, attr, "")
+            if path:
+                self.settingsPaths.append(path)
+
+    def recordTestFiles(self, testFiles: Iterable[str]) -> None:
+        """
+        Records the test files run by the worker and the modules which are not referenced by these files.
+        """
+        self.testFiles = sorted(set(testFiles))
+        sources = []
+        for testFile in self.testFiles:
+            try:
+                sources.append(Path(testFile).read_text(errors="ignore"))
+            except OSError:
+                continue
+
+        referenced = findReferencedModules(sources, self.allLoadedModules)
+        self.referencedModules = sorted(referenced)
+        self.recommendedModulesToIgnore = recommendModulesToIgnore(
+            self.allLoadedModules, referenced, self.moduleDependencies
+        )
+
+
+def startupPhasesString(phaseDurations: Dict[str, float]) -> str:
+    return "\n".join(f"  {phase}: {duration:.2f} s" for phase, duration in phaseDurations.items())
+
+
+def findReferencedModules(sources: Iterable[str], moduleNames: Iterable[str]) -> Set[str]:
+    """
+    Returns the module names referenced in the input sources either by name (`import MyModule`,
+    `getModule("MyModule")`), through `slicer.modules.mymodule` or as the prefix of an imported module name
+    (`import SegmentEditorEffects` references SegmentEditor).
+    """
+    moduleNames = list(moduleNames)
+    source = "\n".join(sources)
+    words = set(re.findall(r"\w+", source))
+    slicerModules = {name.lower() for name in re.findall(r"slicer\.modules\.(\w+)", source)}
+    imported = set(re.findall(r"^\s*(?:from|import)\s+(\w+)", source, re.MULTILINE))
+    return {
+        name
+        for name in moduleNames
+        if name in words or name.lower() in slicerModules or any(i.startswith(name) for i in imported)
+    }
+
+
+def moduleDependencyClosure(moduleNames: Iterable[str], moduleDependencies: Dict[str, List[str]]) -> Set[str]:
+    closure = set()
+    toVisit = list(moduleNames)
+    while toVisit:
+        name = toVisit.pop()
+        if name in closure:
+            continue
+        closure.add(name)
+        toVisit.extend(moduleDependencies.get(name, []))
+    return closure
+
+
+def recommendModulesToIgnore(
+    loadedModules: Iterable[str], usedModules: Iterable[str], moduleDependencies: Dict[str, List[str]]
+) -> List[str]:
+    """
+    Returns the loaded modules which are neither used nor a dependency of a used module.
+    The result can be passed to Slicer's `--modules-to-ignore` argument.
+    """
+    required = moduleDependencyClosure(usedModules, moduleDependencies)
+    return sorted(set(loadedModules) - required)
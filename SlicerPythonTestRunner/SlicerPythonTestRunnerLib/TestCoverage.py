@@ -1,8 +1,14 @@
 import os.path
+import subprocess
+import sys
+import time
 import traceback
+from contextlib import contextmanager
 from functools import partial, wraps
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Union
+
+from .WorkerReport import WorkerTimings
 
 
 def get_all_cov_formats():
@@ -33,18 +39,54 @@ def get_coverage_formats(cov, reportFormats: List[str]) -> List[str]:
     return list(report_formats.union(config_formats))
 
 
-def _coverage(runSettings):
+def get_coverage_core(runSettings) -> str:
+    """
+    Returns the coverage.py measurement core to use for the input settings.
+    The low overhead mode uses the sys.monitoring based core which is only available for Python 3.12 and above.
+    """
+    if runSettings.doUseLowOverheadCoverage and sys.version_info >= (3, 12):
+        return "sysmon"
+    return os.environ.get("COVERAGE_CORE", "")
+
+
+def get_coverage_options(runSettings, dataSuffix: Union[str, bool] = True) -> Dict:
+    options = {"source": runSettings.coverageSources, "data_suffix": dataSuffix}
+
+    # Branch measurement is not supported by the sysmon core before Python 3.14 and would fall back to the C tracer
+    if runSettings.doUseLowOverheadCoverage:
+        options["branch"] = False
+    return options
+
+
+def coverage_data_suffix(json_report_path: Union[str, Path]) -> str:
+    """
+    Returns the coverage data suffix of the worker writing the input JSON report.
+    The suffix is known by the main process which can combine the worker data as soon as the worker finishes.
+    """
+    json_report_path = Path(json_report_path)
+    return f"{json_report_path.parent.name}.{json_report_path.stem}"
+
+
+def _coverage(runSettings, workerTimings: Optional[WorkerTimings] = None, dataSuffix: Union[str, bool] = True):
     def wrapper(f):
         @wraps(f)
         def decorator(*args, **kwargs):
-            from coverage import Coverage
-
             if not runSettings.doRunCoverage:
                 return f(*args, **kwargs)
 
+            start = time.time()
+            core = get_coverage_core(runSettings)
+            if core:
+                os.environ["COVERAGE_CORE"] = core
+
+            from coverage import Coverage
+
             try:
-                cov = Coverage(source=runSettings.coverageSources, data_suffix=True)
+                cov = Coverage(**get_coverage_options(runSettings, dataSuffix))
                 cov.start()
+                if workerTimings is not None:
+                    workerTimings.coverageCore = core or "default"
+                    workerTimings.coverageStartDuration = time.time() - start
                 ret = f(*args, **kwargs)
                 cov.stop()
                 cov.save()
@@ -58,6 +100,109 @@ def _coverage(runSettings):
     return wrapper
 
 
+@contextmanager
+def in_directory(directory: Union[str, Path]):
+    cwd = os.getcwd()
+    try:
+        os.chdir(directory)
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def coverage_data_path(directory: Union[str, Path]) -> Path:
+    """
+    Returns the coverage data file of the input directory, as configured by its coverage configuration file if any.
+    """
+    from coverage import Coverage
+
+    with in_directory(directory):
+        return Path(Coverage().config.data_file).resolve()
+
+
+class CoverageCombiner:
+    """
+    Combines the coverage data fragments of the finished test processes into the directory coverage data, in a
+    background coverage process.
+    Fragments of the processes finishing during a combination are combined together by the next one, so that the
+    combined data is loaded and saved once per batch of fragments. The fragments left when the run finishes are
+    combined when writing the report.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self._dataPath: Optional[Path] = None
+        self._pending: List[str] = []
+        self._process: Optional[subprocess.Popen] = None
+
+    def add(self, dataSuffix: str) -> None:
+        if self._dataPath is None:
+            self._dataPath = coverage_data_path(self.directory)
+
+        fragment = Path(f"{self._dataPath}.{dataSuffix}")
+        if fragment.is_file():
+            self._pending.append(fragment.as_posix())
+        self._combinePending()
+
+    def isCombining(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _combinePending(self) -> None:
+        if not self._pending or self.isCombining():
+            return
+
+        command = [python_executable(), "-m", "coverage", "combine", "--append", "-q", f"--data-file={self._dataPath}"]
+        try:
+            self._process = subprocess.Popen(
+                [*command, *self._pending], cwd=self.directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            self._pending = []
+        except OSError:
+            self._process = None
+
+    def wait(self) -> None:
+        if self._process is not None:
+            self._process.wait()
+        self._process = None
+        self._pending = []
+
+
+def python_executable() -> str:
+    """
+    Returns the Python interpreter able to run coverage.
+    In 3D Slicer, sys.executable is the application and the interpreter is PythonSlicer next to it.
+    """
+    pythonSlicer = Path(sys.executable).parent.joinpath("PythonSlicer.exe" if os.name == "nt" else "PythonSlicer")
+    return pythonSlicer.as_posix() if pythonSlicer.is_file() else sys.executable
+
+
+def get_cov_report_command(cov_format: str, data_file: str, output_path: Optional[str]) -> List[str]:
+    command = [python_executable(), "-m", "coverage", cov_format, f"--data-file={data_file}"]
+    if output_path:
+        command += ["-d" if cov_format == "html" else "-o", output_path]
+    return command
+
+
+def write_cov_reports_in_parallel(data_file: str, formats: List[str], output_path: Optional[str]) -> None:
+    """
+    Writes the input report formats concurrently, each in its own coverage process.
+    """
+    processes = [
+        subprocess.Popen(
+            get_cov_report_command(cov_format, data_file, output_path),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for cov_format in formats
+    ]
+
+    for process in processes:
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            print(stderr, file=sys.stderr)
+
+
 def write_cov_report(runSettings):
     from coverage import Coverage
 
@@ -67,6 +212,13 @@ def write_cov_report(runSettings):
     cov.save()
 
     formats = get_coverage_formats(cov, runSettings.coverageReportFormats)
+    if len(formats) > 1:
+        write_cov_reports_in_parallel(
+            Path(cov.config.data_file).resolve().as_posix(), formats, runSettings.coverageFilePath
+        )
+        return
+
+    # HTML reports are incremental, only the files whose coverage changed since the last report are rewritten
     reportDict = {
         "json": partial(cov.json_report, outfile=runSettings.coverageFilePath),
         "xml": partial(cov.xml_report, outfile=runSettings.coverageFilePath),
@@ -0,0 +1,185 @@
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from .ImportGraph import ImportGraph
+from .TestCoverage import coverage_data_path
+
+# Changed lines by resolved file path. None means that the whole file is considered changed.
+ChangedLines = Dict[Path, Optional[Set[int]]]
+
+_hunkPattern = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+def parseDiffChangedLines(diffText: str, rootDir: Union[str, Path]) -> ChangedLines:
+    """
+    Returns the lines changed in a `git diff --unified=0` output.
+    Line numbers are expressed in the base revision as the recorded coverage data refers to the base revision lines.
+    Pure insertions mark the lines surrounding the insertion point as changed.
+    """
+    rootDir = Path(rootDir)
+    changed: ChangedLines = {}
+    current: Optional[Path] = None
+
+    for line in diffText.splitlines():
+        if line.startswith("--- "):
+            oldPath = line[4:].strip()
+            current = rootDir.joinpath(oldPath[2:]).resolve() if oldPath.startswith("a/") else None
+            continue
+
+        if line.startswith("+++ ") and current is None:
+            # Added files don't have any recorded coverage. Mark them as fully changed.
+            newPath = line[4:].strip()
+            if newPath.startswith("b/"):
+                changed[rootDir.joinpath(newPath[2:]).resolve()] = None
+            continue
+
+        match = _hunkPattern.match(line)
+        if not match or current is None:
+            continue
+
+        start = int(match.group(1))
+        count = int(match.group(2)) if match.group(2) is not None else 1
+        lines = set(range(start, start + count)) if count else {start, start + 1}
+        changed.setdefault(current, set()).update(lines)
+
+    return changed
+
+
+def changedLinesFromGit(rootDir: Union[str, Path], baseRef: str) -> Optional[ChangedLines]:
+    """
+    Returns the lines changed in the working tree compared to the input git revision.
+    Returns None if the diff cannot be computed.
+    """
+    try:
+        topLevel = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"], cwd=rootDir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "diff", "--unified=0", "--no-color", "--no-ext-diff", baseRef],
+            cwd=topLevel,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=topLevel,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    changed = parseDiffChangedLines(diff, topLevel)
+    changed.update({Path(topLevel).joinpath(f).resolve(): None for f in untracked.splitlines() if f})
+    return changed
+
+
+def changedLinesFromMtime(dataPath: Union[str, Path], filePaths: Iterable[Union[str, Path]]) -> ChangedLines:
+    """
+    Returns the files modified after the input coverage data file was written as fully changed.
+    """
+    dataMTime = Path(dataPath).stat().st_mtime
+    return {Path(p).resolve(): None for p in filePaths if Path(p).is_file() and Path(p).stat().st_mtime > dataMTime}
+
+
+def impactedTests(
+    dataPath: Union[str, Path], changedLines: ChangedLines, rootDir: Union[str, Path]
+) -> Optional[List[str]]:
+    """
+    Returns the node ids of the tests impacted by the input changed lines, using the coverage data recorded with per
+    test contexts.
+
+    Test files which changed select all their recorded tests. Returns None if the impacted tests cannot be safely
+    determined (missing data, no recorded test contexts or changed Python file unknown to the coverage data). In this
+    case, the full test suite should be run.
+    """
+    dataPath = Path(dataPath)
+    if not dataPath.is_file():
+        return None
+
+    from coverage import CoverageData
+
+    data = CoverageData(basename=dataPath.as_posix())
+    data.read()
+    contexts = {c for c in data.measured_contexts() if c}
+    if not contexts:
+        return None
+
+    rootDir = Path(rootDir).resolve()
+    measuredFiles = {Path(f).resolve(): f for f in data.measured_files()}
+    contextsByTestFile: Dict[Path, Set[str]] = {}
+    for context in contexts:
+        contextsByTestFile.setdefault(rootDir.joinpath(context.split("::")[0]).resolve(), set()).add(context)
+
+    impacted = set()
+    for filePath, lines in changedLines.items():
+        if filePath.suffix != ".py":
+            continue
+
+        if filePath in contextsByTestFile:
+            impacted.update(contextsByTestFile[filePath])
+            continue
+
+        if filePath not in measuredFiles:
+            return None
+
+        for lineno, lineContexts in data.contexts_by_lineno(measuredFiles[filePath]).items():
+            if lines is None or lineno in lines:
+                impacted.update(c for c in lineContexts if c)
+
+    return sorted(impacted)
+
+
+def findImpactedTests(
+    testDir: Union[str, Path], baseRef: str = "", rootDir: Optional[Union[str, Path]] = None
+) -> Optional[List[str]]:
+    """
+    Returns the tests of the input directory impacted by the source changes since the last coverage run.
+    If baseRef is set, the changes are computed with git against this revision. Otherwise, the files modified after
+    the coverage data are considered changed.
+    The recorded test contexts are node ids relative to the input PyTest root directory, the test directory by default.
+    """
+    dataPath = coverage_data_path(testDir)
+    if not dataPath.is_file():
+        return None
+
+    if baseRef:
+        changedLines = changedLinesFromGit(testDir, baseRef)
+    else:
+        from coverage import CoverageData
+
+        data = CoverageData(basename=dataPath.as_posix())
+        data.read()
+        candidates = [*data.measured_files(), *Path(testDir).rglob("*.py")]
+        changedLines = changedLinesFromMtime(dataPath, candidates)
+
+    if changedLines is None:
+        return None
+    return impactedTests(dataPath, changedLines, rootDir or testDir)
+
+
+def findImportImpactedTestFiles(
+    testDir: Union[str, Path], rootDirs: Iterable[Union[str, Path]], baseRef: str = "", since: float = 0
+) -> Optional[List[Path]]:
+    """
+    Returns the test files of the input directory affected by the changed files according to the cached import graph
+    of the input root directories. Used when no per test coverage data is available.
+    If baseRef is set, the changes are computed with git against this revision. Otherwise, the files modified after the
+    since timestamp are considered changed. Returns None if the changes cannot be determined.
+    """
+    graph = ImportGraph.cached(rootDirs)
+    if baseRef:
+        changedLines = changedLinesFromGit(testDir, baseRef)
+        if changedLines is None:
+            return None
+        changedFiles = list(changedLines.keys())
+    elif since:
+        changedFiles = [f for f in graph.files if f.stat().st_mtime > since]
+    else:
+        return None
+
+    return graph.dependentTestFiles(changedFiles, testDir)
@@ -0,0 +1,75 @@
+import hashlib
+import pstats
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+
+def profilesDir(jsonReportPath: Union[str, Path]) -> Path:
+    """
+    Returns the directory where the test profiles of a JSON report are saved, next to the report.
+    """
+    jsonReportPath = Path(jsonReportPath)
+    return jsonReportPath.with_name(f"{jsonReportPath.stem}_profiles")
+
+
+def profileFileName(nodeid: str) -> str:
+    """
+    Returns a file name unique to the input test node id.
+    """
+    name = re.sub(r"[^a-zA-Z0-9_.-]+", "_", nodeid.split("::")[-1])[:80]
+    return f"{name}_{hashlib.sha1(nodeid.encode()).hexdigest()[:8]}.prof"
+
+
+def loadStats(profilePaths: Iterable[Union[str, Path]]) -> Optional[pstats.Stats]:
+    """
+    Returns the merged statistics of the input cProfile files. Missing files are ignored.
+    """
+    paths = [Path(p).as_posix() for p in profilePaths if Path(p).is_file()]
+    if not paths:
+        return None
+    return pstats.Stats(*paths)
+
+
+def mergeProfiles(profilePaths: Iterable[Union[str, Path]], outPath: Union[str, Path]) -> Optional[Path]:
+    """
+    Merges the input cProfile files in a single file which can be opened with the usual profile viewers.
+    """
+    stats = loadStats(profilePaths)
+    if stats is None:
+        return None
+
+    stats.dump_stats(Path(outPath).as_posix())
+    return Path(outPath)
+
+
+def hotFunctions(profilePaths: Iterable[Union[str, Path]], limit: int = 15) -> List[Dict]:
+    """
+    Returns the functions with the largest own time over the input profiles.
+    """
+    stats = loadStats(profilePaths)
+    if stats is None:
+        return []
+
+    functions = [
+        {
+            "function": f"{Path(fileName).name}:{line}({funcName})" if line else funcName,
+            "nCalls": nCalls,
+            "ownTime": ownTime,
+            "cumulativeTime": cumulativeTime,
+        }
+        for (fileName, line, funcName), (_, nCalls, ownTime, cumulativeTime, _) in stats.stats.items()
+    ]
+    return sorted(functions, key=lambda f: f["ownTime"], reverse=True)[:limit]
+
+
+def hotFunctionsString(profilePaths: Iterable[Union[str, Path]], limit: int = 15) -> str:
+    functions = hotFunctions(profilePaths, limit)
+    if not functions:
+        return ""
+
+    lines = [f"{'own (s)':>10} {'cumul. (s)':>10} {'calls':>9}  function"]
+    lines += [
+        f"{f['ownTime']:>10.3f} {f['cumulativeTime']:>10.3f} {f['nCalls']:>9}  {f['function']}" for f in functions
+    ]
+    return "Hot functions:\n" + "\n".join(lines)
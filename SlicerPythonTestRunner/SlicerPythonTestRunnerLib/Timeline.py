@@ -0,0 +1,176 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .WorkerReport import WorkerTimings
+
+
+@dataclass
+class ProcessRecord:
+    """
+    Timestamps of one test process as seen by the process pool (in seconds since epoch).
+    Worker timings are set from the process results once the process is finished.
+    """
+
+    name: str = ""
+    slot: int = -1
+    queued: float = 0
+    started: float = 0
+    finished: float = 0
+    reportPath: Optional[Path] = None
+    workerTimings: Optional[WorkerTimings] = None
+
+    @property
+    def duration(self) -> float:
+        if not self.started or not self.finished:
+            return 0
+        return self.finished - self.started
+
+    @property
+    def queueDuration(self) -> float:
+        if not self.queued or not self.started:
+            return 0
+        return self.started - self.queued
+
+    @property
+    def startupDuration(self) -> float:
+        """
+        Duration between the process start and its first test (or PyTest start if no test was run).
+        Corresponds to the whole process duration if the worker didn't report its timings.
+        """
+        if self.workerTimings is None:
+            return self.duration
+
+        firstTest = self.workerTimings.firstTestStart or self.workerTimings.pytestStart
+        if not firstTest or not self.started:
+            return self.duration
+        return max(0.0, firstTest - self.started)
+
+
+class RunTimeline:
+    """
+    Collects the test process records of a run and exports them as Chrome trace-event JSON.
+    The exported file can be opened using chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, poolSize: int = 1):
+        self.poolSize = max(1, poolSize)
+        self.records: List[ProcessRecord] = []
+
+    def addProcess(self, record: ProcessRecord) -> None:
+        self.records.append(record)
+
+    def _startedRecords(self) -> List[ProcessRecord]:
+        return [r for r in self.records if r.started and r.finished]
+
+    def summary(self) -> Dict:
+        """
+        Returns the run summary statistics:
+            - wall_s: Duration between the first process start and the last process end
+            - utilization: Ratio of the time the pool slots were busy over the available pool time
+            - startupOverhead_s: Sum of the durations between each process start and its first test
+            - queueTime_s: Sum of the durations processes waited before being started
+            - testTime_s: Sum of the tests durations reported by the workers
+            - coverageStartup_s: Sum of the coverage set up durations reported by the workers
+            - coverageCores: coverage.py measurement cores used by the workers
+            - criticalPath: Processes run on the pool slot which finished last
+            - longestProcess: Name and duration of the longest process
+        """
+        records = self._startedRecords()
+        if not records:
+            return {
+                "wall_s": 0,
+                "utilization": 0,
+                "startupOverhead_s": 0,
+                "queueTime_s": 0,
+                "testTime_s": 0,
+                "coverageStartup_s": 0,
+                "coverageCores": [],
+                "criticalPath": [],
+                "longestProcess": None,
+            }
+
+        timings = [r.workerTimings for r in records if r.workerTimings is not None]
+
+        runStart = min(r.started for r in records)
+        runEnd = max(r.finished for r in records)
+        wall_s = runEnd - runStart
+        busy_s = sum(r.duration for r in records)
+        nSlots = min(self.poolSize, len(records))
+
+        lastRecord = max(records, key=lambda r: r.finished)
+        criticalPath = sorted([r for r in records if r.slot == lastRecord.slot], key=lambda r: r.started)
+        longest = max(records, key=lambda r: r.duration)
+
+        return {
+            "wall_s": wall_s,
+            "utilization": busy_s / (wall_s * nSlots) if wall_s else 0,
+            "startupOverhead_s": sum(r.startupDuration for r in records),
+            "queueTime_s": sum(r.queueDuration for r in records),
+            "testTime_s": sum(t.testsDuration for t in timings),
+            "coverageStartup_s": sum(t.coverageStartDuration for t in timings),
+            "coverageCores": sorted({t.coverageCore for t in timings if t.coverageCore}),
+            "criticalPath": [{"name": r.name, "duration_s": r.duration} for r in criticalPath],
+            "longestProcess": {"name": longest.name, "duration_s": longest.duration},
+        }
+
+    def toChromeTrace(self) -> Dict:
+        summary = self.summary()
+        records = self._startedRecords()
+        traceEvents = [self._metadataEvent(0, "queue")] + [
+            self._metadataEvent(slot + 1, f"worker {slot}") for slot in sorted({r.slot for r in records})
+        ]
+
+        for record in records:
+            traceEvents += self._recordEvents(record)
+
+        return {"traceEvents": traceEvents, "displayTimeUnit": "ms", "otherData": summary}
+
+    def writeChromeTrace(self, filePath: Path) -> None:
+        with open(filePath, "w") as f:
+            f.write(json.dumps(self.toChromeTrace()))
+
+    @staticmethod
+    def _metadataEvent(tid: int, name: str) -> Dict:
+        return {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+
+    @staticmethod
+    def _event(name: str, cat: str, tid: int, start: float, end: float, args: Optional[Dict] = None) -> Dict:
+        return {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "pid": 1,
+            "tid": tid,
+            "ts": start * 1e6,
+            "dur": max(0.0, end - start) * 1e6,
+            "args": args or {},
+        }
+
+    @classmethod
+    def _recordEvents(cls, record: ProcessRecord) -> List[Dict]:
+        tid = record.slot + 1
+        events = [cls._event(record.name, "process", tid, record.started, record.finished)]
+        if record.queueDuration:
+            events.append(cls._event(record.name, "queued", 0, record.queued, record.started))
+
+        timings = record.workerTimings
+        if timings is None or not timings.scriptStart:
+            return events
+
+        events.append(cls._event("slicer startup", "startup", tid, record.started, timings.scriptStart))
+        if timings.coverageStartDuration and timings.pytestStart:
+            coverageStart = timings.pytestStart - timings.coverageStartDuration
+            args = {"core": timings.coverageCore}
+            events.append(cls._event("coverage startup", "coverage", tid, coverageStart, timings.pytestStart, args))
+        firstTest = timings.firstTestStart or timings.sessionFinish
+        if firstTest:
+            events.append(cls._event("runner bootstrap", "startup", tid, timings.scriptStart, firstTest))
+
+        for nodeid, start, stop in timings.tests:
+            events.append(cls._event(nodeid, "test", tid, start, stop))
+
+        if timings.sessionFinish:
+            events.append(cls._event("exit", "exit", tid, timings.sessionFinish, record.finished))
+        return events
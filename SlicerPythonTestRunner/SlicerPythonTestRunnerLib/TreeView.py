@@ -1,10 +1,11 @@
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 
 from .Case import Case, Outcome
 from .IconPath import icon
 from .LoadingWidget import LoadingWidget
 from .QWidget import QWidget
 from .Results import Results
+from .ResultTextPages import ResultTextPages
 from .Signal import Signal
 from .TreeProxyModel import TreeProxyModel
 
@@ -18,6 +19,9 @@ class TreeView(QWidget):
 
         super().__init__(parent)
         self.currentCaseTextChanged = Signal("str")
+        self.currentCasePagesChanged = Signal("ResultTextPages")
+        self.currentCaseOutputsChanged = Signal("list[tuple[str, str]]")
+        self.runNodeIdsRequested = Signal("list[str]")
 
         self.stack = qt.QStackedWidget()
 
@@ -26,6 +30,8 @@ class TreeView(QWidget):
         self.tree.setSelectionMode(qt.QAbstractItemView.SingleSelection)
         self.tree.clicked.connect(self.onItemClicked)
         self.tree.setEditTriggers(qt.QAbstractItemView.NoEditTriggers)
+        self.tree.setContextMenuPolicy(qt.Qt.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self.onContextMenuRequested)
         self.treeModel = qt.QStandardItemModel()
         self.treeProxyModel = TreeProxyModel()
         self.treeProxyModel.setSourceModel(self.treeModel)
@@ -35,6 +41,12 @@ class TreeView(QWidget):
         self.tree.header().setVisible(False)
         self.nodeIdItemDict: Dict[str, qt.QTreeWidgetItem] = {}
 
+        # Tests whose memory grew in each of their last profiled runs
+        self.growingMemoryNodeIds: Set[str] = set()
+
+        # Returns the benchmark statistics of a test node id over the recent runs
+        self.benchmarkTrendF: Optional[Callable[[str], List[Dict]]] = None
+
         self.resultLabel = qt.QLabel(self)
         self.lastResults = Results([])
         self.stack.addWidget(self.loading)
@@ -78,12 +90,65 @@ class TreeView(QWidget):
         self.lastResults.append(results)
 
         for case in results.getAllCases():
-            if not self.hasParentItem(case):
-                self.createParentItem(case)
+            self.setCaseItem(case)
+
+        self.refreshDisplay()
+
+    def updateResults(self, results: Results, nodeIds: List[str]) -> None:
+        """
+        Replaces the results of the input node ids and their children by the input results.
+        The results of the other nodes are kept.
+        Cases of the node ids which are not part of the new results are removed, unless the new results are empty
+        (for instance if the test process crashed).
+        """
+        updatedIds = {case.nodeid for case in results.getAllCases()}
+        staleIds = set()
+        if updatedIds:
+            staleIds = {
+                nodeId
+                for nodeId, item in self.nodeIdItemDict.items()
+                if self.getItemData(item) is not None
+                and nodeId not in updatedIds
+                and any(self.isInSubtree(nodeId, rootId) for rootId in nodeIds)
+            }
+
+        for nodeId in staleIds:
+            self.removeItem(nodeId)
+
+        self.lastResults.removeCases(updatedIds | staleIds)
+        self.appendResults(results)
+
+    @staticmethod
+    def isInSubtree(nodeId: str, rootId: str) -> bool:
+        return nodeId == rootId or nodeId.startswith(rootId + Case.nodeIdSep())
+
+    def setCaseItem(self, case: Case) -> None:
+        import qt
 
-            parent = self.getParentItem(case)
-            parent.appendRow(self.createCaseItem(case))
+        if case.nodeid in self.nodeIdItemDict:
+            self.nodeIdItemDict[case.nodeid].setData(case, qt.Qt.UserRole)
+            return
+
+        if not self.hasParentItem(case):
+            self.createParentItem(case)
+
+        parent = self.getParentItem(case)
+        parent.appendRow(self.createCaseItem(case))
 
+    def removeItem(self, nodeId: str) -> None:
+        """
+        Removes the item of the input node id and its parent file and class items left without children.
+        """
+        item = self.nodeIdItemDict.pop(nodeId)
+        parent = item.parent() or self.treeModel.invisibleRootItem()
+        parent.removeRow(item.row())
+
+        parentId = Case.parentID(nodeId)
+        parentItem = self.nodeIdItemDict.get(parentId)
+        if parentItem is not None and not parentItem.hasChildren() and self.getItemData(parentItem) is None:
+            self.removeItem(parentId)
+
+    def refreshDisplay(self):
         self.updateOutcome()
         self.updateResultsLabel()
         self.treeProxyModel.invalidate()
@@ -137,6 +202,7 @@ class TreeView(QWidget):
         item = qt.QStandardItem()
         item.setText(Case.caseNameFromId(caseNodeId))
         item.setData(case, qt.Qt.UserRole)
+        item.setData(caseNodeId, qt.Qt.UserRole + 2)
         self.nodeIdItemDict[caseNodeId] = item
         return item
 
@@ -149,10 +215,37 @@ class TreeView(QWidget):
     def updateOutcome(self):
         import qt
 
-        for item in self.nodeIdItemDict.values():
+        for nodeId, item in self.nodeIdItemDict.items():
             outcome = self.getItemOutcome(item)
             item.setIcon(self.getItemIcon(outcome))
             item.setData(outcome, qt.Qt.UserRole + 1)
+            self.updateItemAnnotations(nodeId, item)
+
+    def setGrowingMemoryNodeIds(self, nodeIds: List[str]) -> None:
+        self.growingMemoryNodeIds = set(nodeIds)
+        for nodeId, item in self.nodeIdItemDict.items():
+            self.updateItemAnnotations(nodeId, item)
+
+    def updateItemAnnotations(self, nodeId: str, item) -> None:
+        """
+        Shows the duration regression and memory profile of the test in the item tool tip.
+        Passing tests slower than their baseline get a warning icon and tests whose memory keeps growing are
+        highlighted.
+        """
+        import qt
+
+        case = self.getItemData(item)
+        toolTip = case.memory.getString() if case is not None and case.memory is not None else ""
+        isGrowing = nodeId in self.growingMemoryNodeIds
+        if isGrowing:
+            toolTip = "Memory grew in each of the last runs.\n" + toolTip
+        if case is not None and case.regression:
+            toolTip = f"{case.regression}\n{toolTip}"
+            if case.outcome.isPassed():
+                item.setIcon(self.style().standardIcon(qt.QStyle.SP_MessageBoxWarning))
+
+        item.setToolTip(toolTip.strip())
+        item.setForeground(qt.QBrush(qt.QColor("darkorange")) if isGrowing else qt.QBrush())
 
     @classmethod
     def getItemIcon(cls, outcome: Outcome) -> "qt.QIcon":
@@ -210,5 +303,54 @@ class TreeView(QWidget):
         return [parentCase] + leafCases if parentCase else leafCases
 
     def onItemClicked(self, index):
+        """
+        Emits the first page of the clicked subtree results text followed by the pages of its remaining text.
+        The sections summarizing the subtree are displayed before the failing cases, whose debug strings are only
+        computed when their page is displayed.
+        The hot functions and the benchmark trends, which load profile files and query the history, are only displayed
+        for a single test so that clicking large subtrees stays responsive. The hot functions of the whole run are
+        displayed at the end of the run.
+        """
         results = Results(self.getDisplayedCases(index))
-        self.currentCaseTextChanged.emit(results.getSummaryString() + "\n\n" + results.getFailingCasesString())
+        isSingleCase = len(results.getAllCases()) == 1
+        text = results.getSummaryString()
+        if results.getLeakingCases():
+            text += "\n\n" + results.getSceneLeaksString()
+        if results.getRegressionCases():
+            text += "\n\n" + results.getRegressionsString()
+        if results.getBenchmarkCases():
+            text += "\n\n" + results.getBenchmarksString(self.benchmarkTrendF if isSingleCase else None)
+        if results.getProfiledMemoryCases():
+            text += "\n\n" + results.getMemoryString()
+        if isSingleCase and results.getProfilePaths():
+            text += "\n\n" + results.getHotFunctionsString()
+
+        pages = ResultTextPages(text, results.getFailingCases())
+        self.currentCaseTextChanged.emit(pages.nextPage())
+        self.currentCasePagesChanged.emit(pages)
+        self.currentCaseOutputsChanged.emit(results.getSpilledOutputs())
+
+    def getIndexNodeId(self, index) -> str:
+        import qt
+
+        if index is None or not index.isValid():
+            return ""
+        return self.treeProxyModel.data(index, qt.Qt.UserRole + 2) or ""
+
+    def onContextMenuRequested(self, pos):
+        import qt
+
+        nodeId = self.getIndexNodeId(self.tree.indexAt(pos))
+        if not nodeId:
+            return
+
+        menu = qt.QMenu(self.tree)
+        runThisAction = menu.addAction(icon("test_start_icon.png"), "Run this")
+        runThisAction.triggered.connect(lambda: self.runNodeIdsRequested.emit([nodeId]))
+
+        parentId = Case.parentID(nodeId)
+        if parentId:
+            runParentAction = menu.addAction(icon("test_start_icon.png"), "Run this file/class")
+            runParentAction.triggered.connect(lambda: self.runNodeIdsRequested.emit([parentId]))
+
+        menu.exec(self.tree.viewport().mapToGlobal(pos))
@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+class WorkQueue:
+    """
+    Directory based queue of test node id groups shared by the runner and its persistent test workers.
+
+    The runner puts the items in the pending directory and closes the queue once all the items are added. Idle workers
+    claim the next pending item by moving it to the claimed directory. As the move is atomic, each item is claimed by
+    exactly one worker. Once an item is run, the worker writes its JSON report and marks the item as done.
+
+    Only files are exchanged, which works with the 3D Slicer launcher for which the standard streams are not forwarded.
+    """
+
+    def __init__(self, queueDir: Union[str, Path]):
+        self.queueDir = Path(queueDir)
+        self.pendingDir = self.queueDir / "pending"
+        self.claimedDir = self.queueDir / "claimed"
+        self.doneDir = self.queueDir / "done"
+        self._closedPath = self.queueDir / "closed"
+        self._nItems = 0
+        self._reportedItems = set()
+
+        for d in [self.pendingDir, self.claimedDir, self.doneDir]:
+            d.mkdir(parents=True, exist_ok=True)
+
+    def put(self, nodeIds: List[str]) -> str:
+        itemId = f"{self._nItems:06d}"
+        self._nItems += 1
+
+        # Write then move to make the item visible to the workers only once complete
+        tmpPath = self.queueDir / f"{itemId}.tmp"
+        tmpPath.write_text(json.dumps(nodeIds))
+        os.replace(tmpPath, self.pendingDir / itemId)
+        return itemId
+
+    def close(self) -> None:
+        """
+        Notifies the workers that no more items will be added. Workers exit once the queue is empty.
+        """
+        self._closedPath.touch()
+
+    @property
+    def isClosed(self) -> bool:
+        return self._closedPath.exists()
+
+    def clear(self) -> None:
+        """
+        Removes the pending items and closes the queue.
+        """
+        self.close()
+        for itemPath in self.pendingDir.iterdir():
+            itemPath.unlink(missing_ok=True)
+
+    @property
+    def nPending(self) -> int:
+        return len(list(self.pendingDir.iterdir()))
+
+    def claim(self) -> Optional[Tuple[str, List[str]]]:
+        """
+        Claims the next pending item. Returns the item id and node ids, or None if no item is pending.
+        """
+        for itemPath in sorted(self.pendingDir.iterdir()):
+            claimedPath = self.claimedDir / itemPath.name
+            try:
+                os.rename(itemPath, claimedPath)
+            except OSError:
+                # Claimed by another worker
+                continue
+            return itemPath.name, json.loads(claimedPath.read_text())
+        return None
+
+    def nextItem(self, poll_s: float = 0.05) -> Optional[Tuple[str, List[str]]]:
+        """
+        Waits for the next pending item. Returns None once the queue is closed and empty.
+        """
+        while True:
+            isClosed = self.isClosed
+            item = self.claim()
+            if item is not None or isClosed:
+                return item
+            time.sleep(poll_s)
+
+    def reportPath(self, itemId: str) -> Path:
+        return self.doneDir / f"{itemId}.json"
+
+    def workerReportPath(self, workerName: str) -> Path:
+        return self.queueDir / f"{workerName}.json"
+
+    def markDone(self, itemId: str) -> None:
+        (self.doneDir / itemId).touch()
+
+    def takeFinishedItems(self) -> List[Path]:
+        """
+        Returns the report paths of the items done since the previous call.
+        """
+        doneIds = sorted(p.name for p in self.doneDir.iterdir() if not p.suffix and p.name not in self._reportedItems)
+        self._reportedItems.update(doneIds)
+        return [self.reportPath(itemId) for itemId in doneIds]
+
+    def takeLostItems(self) -> List[Path]:
+        """
+        Returns the report paths of the claimed items which won't be done, for instance after a worker crash.
+        Only valid once all the workers are finished.
+        """
+        lostIds = sorted(p.name for p in self.claimedDir.iterdir() if p.name not in self._reportedItems)
+        lostIds = [itemId for itemId in lostIds if not (self.doneDir / itemId).exists()]
+        self._reportedItems.update(lostIds)
+        return [self.reportPath(itemId) for itemId in lostIds]
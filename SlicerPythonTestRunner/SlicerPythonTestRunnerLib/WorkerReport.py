@@ -0,0 +1,79 @@
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List
+
+# Key under which the runner specific information is stored in the pytest-json-report JSON report
+WORKER_REPORT_KEY = "slicer_python_test_runner"
+
+# Fixture scopes shared by several tests of a PyTest session. Their set up cost depends on how the tests are grouped.
+sharedFixtureScopes = ("session", "package", "module")
+
+
+def fixtureKey(argname: str, scope: str, nodeid: str) -> str:
+    """
+    Returns the identifier of a shared fixture. Module scoped fixtures are set up once per test file and are identified
+    by the file and fixture names.
+    """
+    if scope == "module":
+        return f"{nodeid.split('::')[0]}::{argname}"
+    return argname
+
+
+@dataclass
+class WorkerTimings:
+    """
+    Timestamps recorded in a test worker process (in seconds since epoch).
+    Timestamps which were not reached during the worker execution are set to 0.
+
+    - scriptStart: Generated test Python script started executing (3D Slicer is ready)
+    - runnerImported: Runner core finished importing
+    - pytestStart: PyTest session started
+    - firstTestStart: First test started running
+    - sessionFinish: PyTest session finished
+    - tests: [nodeid, start, stop] of each test run by the worker
+    - coverageCore: coverage.py measurement core requested by the worker ("" if coverage was not run)
+    - coverageStartDuration: Duration of the coverage set up before the PyTest session
+    - fixtures: [fixture, scope, duration] of each session, package or module scoped fixture set up by the worker
+    """
+
+    scriptStart: float = 0
+    runnerImported: float = 0
+    pytestStart: float = 0
+    firstTestStart: float = 0
+    sessionFinish: float = 0
+    tests: List[List] = field(default_factory=list)
+    coverageCore: str = ""
+    coverageStartDuration: float = 0
+    fixtures: List[List] = field(default_factory=list)
+
+    @property
+    def timeToFirstTest(self) -> float:
+        """
+        Duration between the worker script start and the first test start. 0 if no test was run.
+        """
+        if not self.scriptStart or not self.firstTestStart:
+            return 0
+        return self.firstTestStart - self.scriptStart
+
+    @property
+    def bootstrapDuration(self) -> float:
+        """
+        Duration between the worker script start and the PyTest session start.
+        """
+        if not self.scriptStart or not self.pytestStart:
+            return 0
+        return self.pytestStart - self.scriptStart
+
+    @property
+    def testsDuration(self) -> float:
+        """
+        Sum of the durations of the tests run by the worker.
+        """
+        return sum(stop - start for _, start, stop in self.tests)
+
+    def asDict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def fromDict(cls, timingsDict: Dict) -> "WorkerTimings":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in timingsDict.items() if k in names})
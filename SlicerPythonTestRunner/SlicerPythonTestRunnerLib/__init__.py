@@ -1,18 +1,94 @@
-from .Case import Case, Outcome
-from .Decorator import (
-    isRunningInSlicerGui,
-    isRunningInTestMode,
-    runTestInSlicerContext,
-    skipTestOutsideSlicer,
-)
-from .EnsureRequirements import ensureRequirements
-from .IconPath import icon, iconPath
-from .LoadingWidget import LoadingWidget
-from .QWidget import QWidget
-from .Results import Results
-from .RunnerLogic import RunnerLogic
-from .RunnerWidget import RunnerWidget
-from .Settings import ModuleSettings, RunSettings
-from .SettingsDialog import SettingsDialog
-from .Signal import Signal
-from .TreeView import TreeView
+"""
+The package's public classes and functions are loaded lazily on first access.
+
+Test worker processes only import the runner core (see RunnerLogic._createTestPythonFile). Loading the submodules on
+demand avoids importing the GUI widgets and their Qt / CTK dependencies in each of these processes.
+"""
+
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+# Exported name -> submodule defining it
+_lazyAttributes = {
+    "Case": "Case",
+    "Outcome": "Case",
+    "isRunningInSlicerGui": "Decorator",
+    "isRunningInTestMode": "Decorator",
+    "runTestInSlicerContext": "Decorator",
+    "skipTestOutsideSlicer": "Decorator",
+    "ensureRequirements": "EnsureRequirements",
+    "icon": "IconPath",
+    "iconPath": "IconPath",
+    "ImportGraph": "ImportGraph",
+    "LoadingWidget": "LoadingWidget",
+    "QWidget": "QWidget",
+    "Results": "Results",
+    "ResultsHistory": "ResultsHistory",
+    "RunnerLogic": "RunnerLogic",
+    "RunnerWidget": "RunnerWidget",
+    "ModuleSettings": "Settings",
+    "RunSettings": "Settings",
+    "SettingsDialog": "SettingsDialog",
+    "SharedDataCache": "SharedDataCache",
+    "Signal": "Signal",
+    "TreeView": "TreeView",
+    "WorkerTimings": "WorkerReport",
+}
+
+__all__ = list(_lazyAttributes.keys())
+
+if TYPE_CHECKING:
+    from .Case import Case, Outcome
+    from .Decorator import (
+        isRunningInSlicerGui,
+        isRunningInTestMode,
+        runTestInSlicerContext,
+        skipTestOutsideSlicer,
+    )
+    from .EnsureRequirements import ensureRequirements
+    from .IconPath import icon, iconPath
+    from .ImportGraph import ImportGraph
+    from .LoadingWidget import LoadingWidget
+    from .QWidget import QWidget
+    from .Results import Results
+    from .ResultsHistory import ResultsHistory
+    from .RunnerLogic import RunnerLogic
+    from .RunnerWidget import RunnerWidget
+    from .Settings import ModuleSettings, RunSettings
+    from .SettingsDialog import SettingsDialog
+    from .SharedDataCache import SharedDataCache
+    from .Signal import Signal
+    from .TreeView import TreeView
+    from .WorkerReport import WorkerTimings
+
+
+def __getattr__(name):
+    if name not in _lazyAttributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{_lazyAttributes[name]}", __name__), name)
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()).union(__all__))
+
+
+class _LazyPackage(ModuleType):
+    """
+    Most submodules share their name with the class they define (RunnerLogic.RunnerLogic, ...). Importing such a
+    submodule binds it as an attribute of the package which would shadow the exported class.
+    Bind the exported class instead to keep `from SlicerPythonTestRunnerLib import RunnerLogic` returning the class.
+    The submodules remain available in sys.modules for patching and reloading.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, ModuleType) and _lazyAttributes.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
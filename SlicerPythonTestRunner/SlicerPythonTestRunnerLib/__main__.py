@@ -0,0 +1,5 @@
+import sys
+
+from .Cli import main
+
+sys.exit(main())
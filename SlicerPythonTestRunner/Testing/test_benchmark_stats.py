@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from SlicerPythonTestRunnerLib.BenchmarkStats import (
+    BenchmarkStats,
+    benchmarkTrendString,
+)
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.Results import Results
+
+
+def a_benchmark_fixture(**stats):
+    return SimpleNamespace(stats=SimpleNamespace(stats=SimpleNamespace(**stats)))
+
+
+def test_benchmark_stats_are_read_from_the_benchmark_fixture():
+    stats = dict(min=0.001, max=0.004, mean=0.002, stddev=0.0005, median=0.002, rounds=42, ops=500.0, iqr=0.0001)
+    assert BenchmarkStats.fromBenchmarkFixture(a_benchmark_fixture(**stats)) == BenchmarkStats(
+        min=0.001, max=0.004, mean=0.002, stddev=0.0005, median=0.002, rounds=42, ops=500.0
+    )
+    assert BenchmarkStats.fromBenchmarkFixture(SimpleNamespace(stats=None)) is None
+
+
+def test_benchmark_stats_are_parsed_from_the_test_report_metadata():
+    stats = BenchmarkStats(min=0.001, max=0.004, mean=0.002, stddev=0.0005, median=0.002, rounds=42, ops=500.0)
+    benchmarked = Case.fromExecutedTestDict(
+        {"nodeid": "test_a.py::test_1", "outcome": "passed", "metadata": {"benchmark": stats.asDict()}}
+    )
+    assert benchmarked.benchmark == stats
+    assert Case.fromExecutedTestDict({"nodeid": "test_a.py::test_2", "outcome": "passed"}).benchmark is None
+
+    results = Results([benchmarked, Case("test_a.py::test_2", Outcome.passed)])
+    assert results.getBenchmarkCases() == [benchmarked]
+    assert results.getBenchmarksString() == (
+        "test_a.py::test_1\nBenchmark: mean 2 ms +/- 500 us, min 1 ms, max 4 ms, 42 rounds"
+    )
+    assert results.getBenchmarksString(lambda nodeid: [{"mean": 0.001}, {"mean": 0.002}]).endswith(
+        "\nMean over the last 2 runs: 1 ms -> 2 ms (+100%)"
+    )
+
+
+def test_benchmark_trend_string_is_empty_without_previous_runs():
+    assert benchmarkTrendString([]) == ""
+    assert benchmarkTrendString([{"mean": 2e-9}]) == "Mean over the last 1 runs: 2 ns"
@@ -0,0 +1,105 @@
+from pathlib import Path
+
+from SlicerPythonTestRunnerLib.CapturedOutput import (
+    SpilledOutputReader,
+    outputsDir,
+    spillStageOutput,
+    truncateLogRecords,
+    truncateText,
+)
+from SlicerPythonTestRunnerLib.Case import Case
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.WorkQueue import WorkQueue
+from Testing.utils import start_worker
+
+
+def test_long_texts_keep_their_beginning_and_end():
+    assert truncateText("short", 10, "out.log") == "short"
+
+    truncated = truncateText("a" * 50 + "b" * 50, 10, "out.log")
+    assert truncated.startswith("aaaaa\n") and truncated.endswith("\nbbbbb")
+    assert "90 characters truncated, full output in out.log" in truncated
+
+
+def test_long_logs_keep_their_first_and_last_records():
+    records = [{"levelname": "INFO", "msg": f"{i:03}"} for i in range(100)]
+    assert truncateLogRecords(records[:3], 10, "log.log") == records[:3]
+
+    truncated = truncateLogRecords(records, 12, "log.log")
+    assert truncated[:2] == records[:2] and truncated[-2:] == records[-2:]
+    assert truncated[2]["msg"] == "[... 96 log records truncated, full log in log.log ...]"
+
+
+def test_stage_outputs_are_spilled_next_to_the_report(tmp_path):
+    dirPath = outputsDir(tmp_path / "report.json")
+    stage = {"stdout": "x" * 100, "stderr": "short", "log": [{"levelname": "ERROR", "msg": "boom" * 30}]}
+    spilled = spillStageOutput(stage, "test_a.py::test_1", "call", dirPath, maxSize=50)
+
+    assert dirPath.name == "report_outputs"
+    assert sorted(spilled) == ["log", "stdout"]
+    assert open(spilled["stdout"]).read() == "x" * 100
+    assert open(spilled["log"]).read() == "[ERROR] " + "boom" * 30
+    assert stage["stderr"] == "short" and "truncated" in stage["stdout"] and len(stage["log"]) == 1
+
+
+def test_spilled_outputs_are_read_by_chunks(tmp_path):
+    outputPath = tmp_path / "out.log"
+    outputPath.write_text("é" * 5, encoding="utf-8")
+    reader = SpilledOutputReader([("test_1 [STDOUT]", outputPath), ("missing", tmp_path / "missing.log")], chunkSize=3)
+
+    chunks = []
+    while reader.hasMore():
+        chunks.append(reader.readChunk())
+
+    assert chunks[0].startswith("-" * 40 + "[test_1 [STDOUT]]")
+    assert "".join(chunks).endswith("\n" + "é" * 5)
+    assert len(chunks) == 5
+
+
+def test_spilled_output_paths_are_parsed_from_the_test_report_metadata():
+    case = Case.fromExecutedTestDict(
+        {
+            "nodeid": "test_a.py::test_1",
+            "outcome": "failed",
+            "metadata": {"outputs": {"call": {"stdout": "/tmp/out.log"}, "teardown": {"log": "/tmp/log.log"}}},
+        }
+    )
+    assert case.outputPaths == {"call": {"stdout": "/tmp/out.log"}, "teardown": {"log": "/tmp/log.log"}}
+    assert Results([case]).getSpilledOutputs() == [
+        ("test_a.py::test_1 [CALL STDOUT]", "/tmp/out.log"),
+        ("test_a.py::test_1 [TEARDOWN LOG]", "/tmp/log.log"),
+    ]
+
+
+def test_workers_spill_the_long_captured_outputs_of_each_stage_next_to_the_report(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text(
+        "import pytest\n\n"
+        "@pytest.fixture\ndef chatty_fixture():\n    print('s' * 5000)\n    yield\n    print('t' * 5000)\n\n"
+        "def test_chatty(chatty_fixture):\n    print('x' * 5000)\n    assert False\n\n"
+        "def test_quiet():\n    print('y')\n    assert False\n"
+    )
+
+    queue = WorkQueue(tmp_path / "queue")
+    queue.put([testDir.joinpath("test_a.py").as_posix()])
+    queue.close()
+
+    runSettings = RunSettings(doUseMainWindow=False, maxCapturedOutput_kb=1)
+    assert start_worker(testDir, queue.queueDir, runSettings).wait(timeout=120) == 0
+
+    results = Results.fromReportFile(queue.takeFinishedItems()[0])
+    chatty, quiet = results.getAllCases()
+    assert len(chatty.stdout) < 1500 and "characters truncated" in chatty.stdout
+    assert {when: Path(paths["stdout"]).read_text().strip() for when, paths in chatty.outputPaths.items()} == {
+        "setup": "s" * 5000,
+        "call": "x" * 5000,
+        "teardown": "t" * 5000,
+    }
+    assert quiet.stdout.strip() == "y" and not quiet.outputPaths
+    assert [title for title, _ in results.getSpilledOutputs()] == [
+        "test_a.py::test_chatty [SETUP STDOUT]",
+        "test_a.py::test_chatty [CALL STDOUT]",
+        "test_a.py::test_chatty [TEARDOWN STDOUT]",
+    ]
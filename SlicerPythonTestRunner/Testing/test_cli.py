@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import pytest
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.Cli import CliRunner, parseArgs
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.ResultsHistory import ResultsHistory
+from SlicerPythonTestRunnerLib.RunDirectories import RunDirectories
+from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+
+
+@pytest.fixture
+def a_logic(tmp_path):
+    return RunnerLogic(slicer_path=tmp_path / "Slicer", runDirectories=RunDirectories(tmp_path / "runs"))
+
+
+def test_cli_parses_failed_modes():
+    args = parseArgs(["tests", "--failed-first", "-n", "4", "-k", "test_a"])
+    assert args.failed_first
+    assert not args.rerun_failed
+    assert args.parallel == 4
+    assert args.function_pattern == "test_a"
+
+
+def test_cli_parses_fail_on_regression():
+    assert parseArgs(["tests", "--fail-on-regression"]).fail_on_regression
+    assert not parseArgs(["tests"]).fail_on_regression
+
+
+def test_cli_runner_starts_failed_tests_before_the_other_tests(tmp_path, a_logic):
+    runner = CliRunner(tmp_path, RunSettings(doRunTestFilesIndependently=False), logic=a_logic)
+    failed = ["test_a.py::test_1", "test_b.py::test_2"]
+    runner.addNodeIds(failed)
+    runner.addAllTests(failed)
+
+    assert len(runner.jobs) == 2
+    assert runner.jobs[0].testNodeIds == [Path(tmp_path, nodeId).as_posix() for nodeId in failed]
+    assert runner.jobs[1].testNodeIds == []
+    assert runner.jobs[1].extraPytestArgs == [f"--deselect={nodeId}" for nodeId in failed]
+
+
+def test_cli_runner_runs_failed_files_independently(tmp_path, a_logic):
+    runner = CliRunner(tmp_path, RunSettings(doRunTestFilesIndependently=True), logic=a_logic)
+    runner.addNodeIds(["test_a.py::test_1", "test_a.py::test_2", "test_b.py::test_2"])
+    assert [len(job.testNodeIds) for job in runner.jobs] == [2, 1]
+
+
+def test_cli_runner_resolves_node_ids_against_the_pytest_root_directory(tmp_path, a_logic):
+    testDir = tmp_path / "tests"
+    runner = CliRunner(testDir, RunSettings(doRunTestFilesIndependently=False), logic=a_logic)
+    runner.addNodeIds(["tests/test_a.py::test_1"], rootDir=tmp_path)
+    assert runner.jobs[0].testNodeIds == [Path(testDir, "test_a.py::test_1").as_posix()]
+
+
+def test_cli_runner_only_reruns_the_failed_tests_still_collected(tmp_path, a_logic):
+    history = ResultsHistory(tmp_path / "history.sqlite")
+    failed = ["test_a.py::test_1", "test_a.py::test_renamed", "test_b.py::test_1"]
+    history.addRun(tmp_path, Results([Case(nodeId, Outcome.failed) for nodeId in failed]))
+
+    collected = Results([Case("test_a.py::test_1", Outcome.collected), Case("test_b.py", Outcome.failed)])
+    a_logic.collectSubProcess = lambda *_: collected
+    runner = CliRunner(tmp_path, RunSettings(doRunTestFilesIndependently=False), logic=a_logic)
+
+    assert runner.addFailedTests(history) == ["test_a.py::test_1", "test_b.py::test_1"]
+    assert runner.jobs[0].testNodeIds == [
+        Path(tmp_path, "test_a.py::test_1").as_posix(),
+        Path(tmp_path, "test_b.py::test_1").as_posix(),
+    ]
+    assert history.failingNodeIds(tmp_path) == failed
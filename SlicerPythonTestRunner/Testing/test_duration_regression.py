@@ -0,0 +1,64 @@
+import json
+
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.DurationRegression import (
+    DurationBaseline,
+    DurationRegressionChecker,
+    loadDurationBudgets,
+)
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.WorkQueue import WorkQueue
+from Testing.utils import start_worker
+
+
+def test_tests_twice_slower_than_their_median_are_flagged():
+    checker = DurationRegressionChecker({"test_a.py::test_1": DurationBaseline.fromDurations([1.0, 1.1, 0.9, 1.0])})
+    assert checker.check(Case("test_a.py::test_1", Outcome.passed, duration=1.8)) == ""
+    assert "2.5x its median of 1.00 s" in checker.check(Case("test_a.py::test_1", Outcome.passed, duration=2.5))
+    assert checker.check(Case("test_a.py::test_1", Outcome.skipped, duration=2.5)) == ""
+    assert checker.check(Case("test_a.py::test_2", Outcome.passed, duration=100.0)) == ""
+
+
+def test_noisy_short_or_recent_tests_are_not_flagged():
+    checker = DurationRegressionChecker(
+        {
+            "test_a.py::test_noisy": DurationBaseline.fromDurations([1.0, 3.0, 0.5, 2.0, 1.0]),
+            "test_a.py::test_short": DurationBaseline.fromDurations([0.01, 0.01, 0.01]),
+            "test_a.py::test_recent": DurationBaseline.fromDurations([1.0, 1.0]),
+        },
+        minDelta_s=0.5,
+    )
+    assert checker.check(Case("test_a.py::test_noisy", Outcome.passed, duration=3.0)) == ""
+    assert checker.check(Case("test_a.py::test_short", Outcome.passed, duration=0.1)) == ""
+    assert checker.check(Case("test_a.py::test_recent", Outcome.passed, duration=5.0)) == ""
+
+
+def test_explicit_budgets_override_the_baseline(tmp_path):
+    tmp_path.joinpath("budgets.json").write_text(json.dumps({"test_a.py::*": 2.0}))
+    assert loadDurationBudgets(tmp_path / "budgets.json") == {"test_a.py::*": 2.0}
+
+    runSettings = RunSettings(durationBudgetsPath="budgets.json")
+    checker = DurationRegressionChecker.fromRunSettings(tmp_path, runSettings, {})
+    marked = Case("test_a.py::test_2", Outcome.passed, duration=2.5, durationBudget=3.0)
+    results = Results([Case("test_a.py::test_1", Outcome.passed, duration=2.5), marked])
+    results.flagDurationRegressions(checker)
+
+    assert results.getRegressionsString() == "test_a.py::test_1 SLOWER: Duration 2.50 s exceeds its budget of 2.00 s"
+
+
+def test_workers_record_the_duration_budget_markers(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text(
+        "import pytest\n\n" "def test_1():\n    pass\n\n" "@pytest.mark.duration_budget(60)\ndef test_2():\n    pass\n"
+    )
+
+    queue = WorkQueue(tmp_path / "queue")
+    queue.put([testDir.joinpath("test_a.py").as_posix()])
+    queue.close()
+
+    assert start_worker(testDir, queue.queueDir, RunSettings(doUseMainWindow=False)).wait(timeout=120) == 0
+
+    results = Results.fromReportFile(queue.takeFinishedItems()[0])
+    assert [case.durationBudget for case in results.getAllCases()] == [0, 60.0]
@@ -0,0 +1,123 @@
+import os
+import time
+from importlib import import_module
+
+import pytest
+from SlicerPythonTestRunnerLib.FileWatcher import changedFiles, pythonFileMTimes
+from SlicerPythonTestRunnerLib.ImportGraph import ImportGraph, importedModuleNames
+from SlicerPythonTestRunnerLib.TestImpact import findImportImpactedTestFiles
+
+importGraphModule = import_module("SlicerPythonTestRunnerLib.ImportGraph")
+
+
+@pytest.fixture
+def a_project(tmp_path):
+    files = {
+        "src/lib/__init__.py": "",
+        "src/lib/core.py": "import os\n",
+        "src/lib/io.py": "from . import core\n",
+        "src/lib/widgets/__init__.py": "",
+        "src/lib/widgets/view.py": "from ..io import read\n",
+        "tests/conftest.py": "",
+        "tests/test_core.py": "from lib.core import f\n",
+        "tests/test_view.py": "import lib.widgets.view\n",
+        "tests/other/test_standalone.py": "import json\n",
+    }
+    for name, content in files.items():
+        tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(name).write_text(content)
+    return tmp_path.resolve()
+
+
+def test_imported_module_names_resolve_relative_imports():
+    source = "import a.b\nfrom . import c\nfrom ..d import e\n"
+    assert importedModuleNames(source, "pkg.sub.mod", isPackage=False) == {
+        "a.b",
+        "pkg.sub",
+        "pkg.sub.c",
+        "pkg.d",
+        "pkg.d.e",
+    }
+
+
+def test_import_graph_returns_the_test_files_depending_on_changed_files(a_project):
+    testDir = a_project / "tests"
+    graph = ImportGraph([testDir, a_project / "src"]).build()
+
+    assert graph.dependentTestFiles([a_project / "src/lib/core.py"], testDir) == [
+        testDir / "test_core.py",
+        testDir / "test_view.py",
+    ]
+    assert graph.dependentTestFiles([a_project / "src/lib/widgets/view.py"], testDir) == [testDir / "test_view.py"]
+    assert graph.dependentTestFiles([testDir / "other/test_standalone.py"], testDir) == [
+        testDir / "other/test_standalone.py"
+    ]
+    assert len(graph.dependentTestFiles([testDir / "conftest.py"], testDir)) == 3
+
+
+def test_import_graph_can_be_updated_file_by_file(a_project):
+    testDir = a_project / "tests"
+    graph = ImportGraph([testDir, a_project / "src"]).build()
+
+    testDir.joinpath("test_core.py").write_text("import json\n")
+    graph.updateFiles([testDir / "test_core.py"])
+    assert graph.dependentTestFiles([a_project / "src/lib/core.py"], testDir) == [testDir / "test_view.py"]
+
+    testDir.joinpath("test_view.py").unlink()
+    graph.updateFiles([testDir / "test_view.py"])
+    assert graph.dependentTestFiles([a_project / "src/lib/core.py"], testDir) == []
+
+
+def test_changed_files_are_detected_from_modification_times(a_project):
+    before = pythonFileMTimes([a_project])
+    a_project.joinpath("tests/test_new.py").write_text("")
+    a_project.joinpath("src/lib/core.py").unlink()
+
+    assert changedFiles(before, pythonFileMTimes([a_project])) == [
+        (a_project / "src/lib/core.py").resolve(),
+        (a_project / "tests/test_new.py").resolve(),
+    ]
+
+
+def test_import_graph_answers_module_queries(a_project):
+    testDir = a_project / "tests"
+    graph = ImportGraph([testDir, a_project / "src"]).build()
+    assert graph.testsDependingOnModule("lib.widgets", testDir) == [testDir / "test_view.py"]
+    assert graph.testsDependingOnModule("lib.io", testDir) == [testDir / "test_view.py"]
+    assert graph.testsDependingOnModule("unknown", testDir) == []
+
+
+def test_cached_import_graph_only_parses_files_whose_content_changed(a_project, tmp_path, monkeypatch):
+    rootDirs = [a_project / "tests", a_project / "src"]
+    cachePath = tmp_path / "graph.json"
+    ImportGraph(rootDirs, cachePath).build()
+
+    parsed = []
+    parse = importGraphModule.importedModuleNames
+    monkeypatch.setattr(
+        importGraphModule,
+        "importedModuleNames",
+        lambda source, name, isPackage: parsed.append(name) or parse(source, name, isPackage),
+    )
+
+    coreFile = a_project / "src/lib/core.py"
+    os.utime(a_project / "src/lib/io.py")
+    coreFile.write_text("import os\nimport json\n")
+    graph = ImportGraph(rootDirs, cachePath).build()
+
+    assert parsed == ["lib.core"]
+    assert graph.dependentTestFiles([coreFile], a_project / "tests") == [
+        a_project / "tests/test_core.py",
+        a_project / "tests/test_view.py",
+    ]
+
+
+def test_import_impacted_test_files_are_selected_from_modification_times(a_project, monkeypatch, tmp_path):
+    monkeypatch.setattr(importGraphModule, "cacheDir", lambda: tmp_path)
+    testDir = a_project / "tests"
+    since = time.time() + 10
+    os.utime(a_project / "src/lib/io.py", (since + 1, since + 1))
+
+    rootDirs = [testDir, a_project / "src"]
+    assert findImportImpactedTestFiles(testDir, rootDirs, since=since) == [testDir / "test_view.py"]
+    assert findImportImpactedTestFiles(testDir, rootDirs) is None
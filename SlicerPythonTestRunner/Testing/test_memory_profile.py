@@ -0,0 +1,48 @@
+from SlicerPythonTestRunnerLib.Case import Case
+from SlicerPythonTestRunnerLib.MemoryProfile import MemoryProfile, MemoryRecorder
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.WorkQueue import WorkQueue
+from Testing.utils import start_worker
+
+
+def test_memory_recorder_records_rss_and_top_python_allocations():
+    recorder = MemoryRecorder(doTraceAllocations=True)
+    recorder.start()
+    allocated = [bytearray(1024) for _ in range(4096)]
+    profile = recorder.stop()
+
+    assert profile.rss > 0
+    assert profile.tracemallocPeak >= 4
+    assert profile.topAllocations and __file__ in profile.topAllocations[0]
+    assert len(allocated) == 4096
+
+
+def test_memory_profiles_are_parsed_from_the_test_report_metadata():
+    memory = {"rss": 512.0, "rssGrowth": 64.0, "tracemallocPeak": 0, "topAllocations": []}
+    profiled = Case.fromExecutedTestDict(
+        {"nodeid": "test_a.py::test_1", "outcome": "passed", "metadata": {"memory": memory}}
+    )
+    assert profiled.memory == MemoryProfile(rss=512.0, rssGrowth=64.0)
+    assert Case.fromExecutedTestDict({"nodeid": "test_a.py::test_2", "outcome": "passed"}).memory is None
+
+    results = Results([profiled])
+    assert results.getMemoryString() == "test_a.py::test_1\nMemory: RSS 512.0 MB, growth +64.0 MB"
+
+
+def test_workers_record_the_memory_of_each_test(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text("def test_1():\n    pass\n\ndef test_2():\n    pass\n")
+
+    queue = WorkQueue(tmp_path / "queue")
+    queue.put([testDir.joinpath("test_a.py").as_posix()])
+    queue.close()
+
+    runSettings = RunSettings(doUseMainWindow=False, doProfileMemory=True)
+    assert start_worker(testDir, queue.queueDir, runSettings).wait(timeout=120) == 0
+
+    reportPath = queue.takeFinishedItems()[0]
+    results = Results.fromReportFile(reportPath)
+    assert all(case.memory is not None and case.memory.rss > 0 for case in results.getAllCases())
+    assert 'name="rss_growth_mb"' in reportPath.with_suffix(".xml").read_text()
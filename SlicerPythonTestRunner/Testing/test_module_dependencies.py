@@ -0,0 +1,53 @@
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.ModuleDependencies import (
+    ModuleDependencyGraph,
+    essentialModules,
+    isMissingModuleFailure,
+    readLocalSources,
+)
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.StartupProfile import findReferencedModules
+
+
+def a_graph():
+    dependencies = {name: [] for name in essentialModules}
+    dependencies.update(
+        {
+            "SegmentEditor": ["Segmentations"],
+            "MyExtension": ["SegmentEditor"],
+            "DICOM": [],
+            "CropVolume": ["Volumes"],
+        }
+    )
+    return ModuleDependencyGraph(dependencies)
+
+
+def test_module_graph_ignores_modules_not_needed_by_used_modules():
+    assert a_graph().modulesToIgnore(["MyExtension"]) == ["CropVolume", "DICOM"]
+
+
+def test_module_graph_can_be_saved_and_loaded(tmp_path):
+    graph = a_graph()
+    graph.toFile(tmp_path / "graph.json")
+    assert ModuleDependencyGraph.fromFile(tmp_path / "graph.json").asDict() == graph.asDict()
+
+
+def test_referenced_modules_follow_local_imports(tmp_path):
+    tmp_path.joinpath("helpers.py").write_text(
+        "import slicer\n\ndef logic():\n    return slicer.util.getModuleLogic('CropVolume')\n"
+    )
+    tmp_path.joinpath("test_a.py").write_text(
+        "import slicer\nfrom helpers import logic\n\ndef test_a():\n    slicer.modules.dicom.widgetRepresentation()\n"
+    )
+
+    sources = readLocalSources([tmp_path / "test_a.py"], [tmp_path])
+    assert findReferencedModules(sources, a_graph().moduleNames) == {"CropVolume", "DICOM"}
+
+
+def test_missing_module_failures_are_detected():
+    passing = Case("test_a.py::test_a", Outcome.passed)
+    missingImport = Case("test_a.py::test_b", Outcome.failed, message="ModuleNotFoundError: No module named 'DICOMLib'")
+    otherFailure = Case("test_a.py::test_c", Outcome.failed, message="assert 1 == 2")
+
+    assert isMissingModuleFailure(Results([passing, missingImport]))
+    assert not isMissingModuleFailure(Results([passing, otherFailure]))
@@ -0,0 +1,95 @@
+import subprocess
+import sys
+
+from junitparser import JUnitXml
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.ExportDialog import ExportLogic
+from SlicerPythonTestRunnerLib.ReportFiles import ReportFiles
+from SlicerPythonTestRunnerLib.Results import Results
+from Testing.utils import write_file
+
+
+def a_results(*nodeIds):
+    return Results([Case(nodeId, Outcome.passed) for nodeId in nodeIds])
+
+
+def test_report_files_supersede_the_rerun_cases_of_the_previous_reports(tmp_path):
+    reports = ReportFiles()
+    reports.add(tmp_path / "all.json", a_results("test_a.py::test_1", "test_a.py::test_2", "test_b.py::test_1"))
+    reports.add(tmp_path / "test_b.json", a_results("test_b.py::test_1"))
+    reports.add(tmp_path / "test_1.json", a_results("test_a.py::test_1"))
+
+    assert reports.paths == [tmp_path / "all.json", tmp_path / "test_b.json", tmp_path / "test_1.json"]
+    assert reports.supersededNodeIds == {tmp_path / "all.json": {"test_a.py::test_1", "test_b.py::test_1"}}
+
+
+def test_report_files_replace_the_reports_whose_tests_were_all_rerun(tmp_path):
+    reports = ReportFiles()
+    reports.add(tmp_path / "test_a.json", a_results("test_a.py::test_1"))
+    reports.add(tmp_path / "test_b.json", a_results("test_b.py::test_1", "test_b.py::test_2"))
+    reports.add(tmp_path / "test_b_rerun.json", a_results("test_b.py::test_1", "test_b.py::test_2"))
+
+    assert reports.paths == [tmp_path / "test_a.json", tmp_path / "test_b_rerun.json"]
+    assert not reports.hasSupersededCases()
+
+
+def run_pytest(testDir, reportName, *nodeIds):
+    jsonReportPath = testDir / f"{reportName}.json"
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "no:cacheprovider",
+            "--json-report",
+            f"--json-report-file={jsonReportPath.as_posix()}",
+            f"--junitxml={jsonReportPath.with_suffix('.xml').as_posix()}",
+            *nodeIds,
+        ],
+        cwd=testDir,
+        capture_output=True,
+    )
+    return jsonReportPath
+
+
+def test_exported_report_contains_each_rerun_test_once_with_its_latest_outcome(tmp_path):
+    write_file(
+        tmp_path,
+        "test_a.py",
+        "import os\n"
+        "import pytest\n"
+        "class TestA:\n"
+        "    @pytest.mark.parametrize('i', [1, 2])\n"
+        "    def test_flaky(self, i):\n"
+        "        assert os.path.exists('fixed')\n"
+        "def test_passing():\n"
+        "    pass\n",
+    )
+    reports = ReportFiles()
+    firstReport = run_pytest(tmp_path, "first")
+    reports.add(firstReport, Results.fromReportFile(firstReport))
+
+    tmp_path.joinpath("fixed").touch()
+    rerunReport = run_pytest(tmp_path, "rerun", "test_a.py::TestA::test_flaky[1]")
+    reports.add(rerunReport, Results.fromReportFile(rerunReport))
+
+    exportPath = tmp_path / "export.xml"
+    ExportLogic.combineXmlReportFiles(
+        ExportLogic.getXmlReportFilesFromJSonList(reports.paths),
+        exportPath,
+        {f.with_suffix(".xml"): ids for f, ids in reports.supersededNodeIds.items()},
+    )
+
+    outcomes = {}
+    for suite in JUnitXml.fromfile(exportPath.as_posix()):
+        for case in suite:
+            key = (case.classname, case.name)
+            assert key not in outcomes
+            outcomes[key] = "failed" if case.result else "passed"
+
+    assert outcomes == {
+        ("test_a.TestA", "test_flaky[1]"): "passed",
+        ("test_a.TestA", "test_flaky[2]"): "failed",
+        ("test_a", "test_passing"): "passed",
+    }
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.ResultTextPages import ResultTextPages
+
+
+def a_failing_case(i):
+    return Case(f"test_a.py::test_{i}", Outcome.failed, message="x" * 10)
+
+
+def test_result_text_pages_start_with_the_header_and_contain_all_the_cases():
+    cases = [a_failing_case(i) for i in range(100)]
+    pages = ResultTextPages("Summary", cases, pageSize=200)
+
+    texts = []
+    while pages.hasMore():
+        texts.append(pages.nextPage())
+
+    assert len(texts) > 10
+    assert texts[0].startswith("Summary\n\n")
+    assert "".join(texts) == "Summary\n\n" + "\n".join(case.getDebugString() for case in cases)
+    assert pages.nextPage() == ""
+
+
+def test_result_text_pages_compute_the_case_strings_on_demand():
+    cases = [a_failing_case(i) for i in range(1000)]
+    pages = ResultTextPages("Summary", cases, pageSize=500)
+
+    with patch.object(Case, "getDebugString", autospec=True, side_effect=lambda case: case.nodeid) as getDebugString:
+        firstPage = pages.nextPage()
+
+    assert firstPage.startswith("Summary\n\ntest_a.py::test_0\n")
+    assert 0 < getDebugString.call_count < 50
+
+
+def test_result_text_pages_without_cases_only_contain_the_header():
+    pages = ResultTextPages("No tests to display.", [])
+    assert pages.nextPage() == "No tests to display."
+    assert not pages.hasMore()
@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+from SlicerPythonTestRunnerLib.BenchmarkStats import BenchmarkStats
+from SlicerPythonTestRunnerLib.Case import Case, Outcome
+from SlicerPythonTestRunnerLib.MemoryProfile import MemoryProfile
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.ResultsHistory import ResultsHistory
+from SlicerPythonTestRunnerLib.WorkerReport import WorkerTimings
+
+
+@pytest.fixture
+def a_history(tmp_path):
+    return ResultsHistory(tmp_path / "history.sqlite")
+
+
+def a_run(history, testDir, outcomes, durations=None):
+    durations = durations or {}
+    cases = [
+        Case(nodeid, outcome, duration=durations.get(nodeid, 0.1), message="boom" if outcome.isFailed() else "")
+        for nodeid, outcome in outcomes.items()
+    ]
+    return history.addRun(testDir, Results(cases), duration=1.0)
+
+
+def test_history_records_runs(a_history, tmp_path):
+    a_run(a_history, tmp_path, {"test_a.py::test_1": Outcome.passed, "test_a.py::test_2": Outcome.failed})
+    runs = a_history.runs(tmp_path)
+    assert len(runs) == 1
+    assert runs[0]["nExecuted"] == 2
+    assert runs[0]["nFailed"] == 1
+    assert a_history.runs(tmp_path / "other") == []
+
+
+def test_history_returns_slowest_tests_and_duration_trend(a_history, tmp_path):
+    for duration in [1.0, 2.0, 3.0]:
+        a_run(
+            a_history,
+            tmp_path,
+            {"test_a.py::test_1": Outcome.passed, "test_a.py::test_2": Outcome.passed},
+            {"test_a.py::test_1": duration},
+        )
+
+    slowest = a_history.slowestTests(tmp_path, limit=1)
+    assert slowest == [{"nodeid": "test_a.py::test_1", "meanDuration": 2.0, "maxDuration": 3.0, "nRuns": 3}]
+    assert [t["duration"] for t in a_history.durationTrend(tmp_path, "test_a.py::test_1")] == [1.0, 2.0, 3.0]
+
+
+def test_history_returns_flaky_tests_and_last_failure(a_history, tmp_path):
+    for outcome in [Outcome.passed, Outcome.failed, Outcome.passed, Outcome.passed]:
+        a_run(a_history, tmp_path, {"test_a.py::test_flaky": outcome, "test_a.py::test_stable": Outcome.passed})
+
+    flaky = a_history.flakeRates(tmp_path)
+    assert [f["nodeid"] for f in flaky] == ["test_a.py::test_flaky"]
+    assert flaky[0]["flakeRate"] == 2 / 3
+
+    lastFailure = a_history.lastFailure(tmp_path, "test_a.py::test_flaky")
+    assert lastFailure["message"] == "boom"
+    assert a_history.lastFailure(tmp_path, "test_a.py::test_stable") is None
+
+
+def test_history_returns_currently_failing_tests(a_history, tmp_path):
+    a_run(a_history, tmp_path, {"test_a.py::test_1": Outcome.failed, "test_a.py::test_2": Outcome.failed})
+    a_run(a_history, tmp_path, {"test_a.py::test_1": Outcome.passed})
+    assert a_history.failingNodeIds(tmp_path) == ["test_a.py::test_2"]
+
+
+def test_history_returns_mean_durations(a_history, tmp_path):
+    for duration in [1.0, 3.0]:
+        a_run(a_history, tmp_path, {"test_a.py::test_1": Outcome.passed}, {"test_a.py::test_1": duration})
+    assert a_history.meanDurations(tmp_path) == {"test_a.py::test_1": 2.0}
+
+
+def test_history_returns_mean_fixture_setup_durations(a_history, tmp_path):
+    for duration in [2.0, 4.0]:
+        timings = WorkerTimings(fixtures=[["scene", "session", duration], ["test_a.py::volume", "module", 0.5]])
+        results = Results([Case("test_a.py::test_1", Outcome.passed, duration=0.1)], [timings])
+        a_history.addRun(tmp_path, results, duration=1.0)
+
+    assert a_history.meanFixtureSetupDurations(tmp_path) == {"scene": 3.0, "test_a.py::volume": 0.5}
+
+
+def test_history_returns_tests_whose_memory_keeps_growing(a_history, tmp_path):
+    for growth in [5.0, 8.0, 3.0]:
+        cases = [
+            Case("test_a.py::test_leak", Outcome.passed, memory=MemoryProfile(rss=100, rssGrowth=growth)),
+            Case("test_a.py::test_once", Outcome.passed, memory=MemoryProfile(rss=100, rssGrowth=growth - 3.0)),
+        ]
+        a_history.addRun(tmp_path, Results(cases), duration=1.0)
+
+    growing = a_history.growingMemoryTests(tmp_path, nRuns=3, minGrowth_mb=1.0)
+    assert growing == [{"nodeid": "test_a.py::test_leak", "meanGrowth": 16.0 / 3, "minGrowth": 3.0}]
+
+
+def test_history_returns_duration_baselines_of_passing_tests(a_history, tmp_path):
+    for duration, outcome in [
+        (1.0, Outcome.passed),
+        (3.0, Outcome.passed),
+        (2.0, Outcome.passed),
+        (9.0, Outcome.failed),
+    ]:
+        a_run(a_history, tmp_path, {"test_a.py::test_1": outcome}, {"test_a.py::test_1": duration})
+
+    baseline = a_history.durationBaselines(tmp_path)["test_a.py::test_1"]
+    assert (baseline.median, baseline.mad, baseline.nRuns) == (2.0, 1.0, 3)
+
+
+def test_history_returns_the_benchmark_trend_oldest_first(a_history, tmp_path):
+    for mean in [0.003, 0.001, 0.002]:
+        case = Case("test_a.py::test_bench", Outcome.passed, benchmark=BenchmarkStats(mean=mean, rounds=10))
+        a_history.addRun(tmp_path, Results([case, Case("test_a.py::test_1", Outcome.passed)]), duration=1.0)
+
+    trend = a_history.benchmarkTrend(tmp_path, "test_a.py::test_bench", nRuns=2)
+    assert [(t["mean"], t["rounds"]) for t in trend] == [(0.001, 10), (0.002, 10)]
+    assert a_history.benchmarkTrend(tmp_path, "test_a.py::test_1") == []
+
+
+def test_history_returns_the_root_directory_of_the_last_run(a_history, tmp_path):
+    assert a_history.lastRootDir(tmp_path) is None
+
+    results = Results([Case("tests/test_a.py::test_1", Outcome.passed)])
+    results.rootDir = tmp_path.parent
+    a_history.addRun(tmp_path, results, duration=1.0)
+    a_run(a_history, tmp_path, {"tests/test_a.py::test_1": Outcome.passed})
+    assert a_history.lastRootDir(tmp_path) == Path(tmp_path.parent.as_posix())
+
+
+def test_history_keeps_the_last_runs_of_each_test_directory(tmp_path):
+    history = ResultsHistory(tmp_path / "history.sqlite", maxRuns=2)
+    otherDir = tmp_path / "other"
+    a_run(history, otherDir, {"test_a.py::test_1": Outcome.passed})
+    for outcome in [Outcome.failed, Outcome.passed, Outcome.passed]:
+        a_run(history, tmp_path, {"test_a.py::test_1": outcome})
+
+    assert len(history.runs(tmp_path)) == 2
+    assert len(history.runs(otherDir)) == 1
+    assert history.lastFailure(tmp_path, "test_a.py::test_1") is None
+    assert [t["duration"] for t in history.durationTrend(tmp_path, "test_a.py::test_1")] == [0.1, 0.1]
+
+
+def test_history_forgets_the_failing_tests_missing_from_a_complete_collection(a_history, tmp_path):
+    a_run(a_history, tmp_path, {"test_a.py::test_deleted": Outcome.failed, "test_a.py::test_1": Outcome.failed})
+
+    a_history.forgetMissingTests(tmp_path, Results([Case("test_a.py", Outcome.failed, message="ImportError")]))
+    assert a_history.failingNodeIds(tmp_path) == ["test_a.py::test_1", "test_a.py::test_deleted"]
+
+    a_history.forgetMissingTests(tmp_path, Results([Case("test_a.py::test_1", Outcome.collected)]))
+    assert a_history.failingNodeIds(tmp_path) == ["test_a.py::test_1"]
@@ -0,0 +1,88 @@
+import os
+import time
+
+from SlicerPythonTestRunnerLib.RunDirectories import RunDirectories
+from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+
+
+def a_run(runDirs, size=10, age_s=0):
+    runDir = runDirs.newRunDir()
+    runDir.joinpath("pytest_file_0.json").write_bytes(b"x" * size)
+    mtime = time.time() - age_s
+    os.utime(runDir, (mtime, mtime))
+    return runDir
+
+
+def a_finished_session(rootDir, nRuns):
+    # Session of a process id above the maximal process id
+    sessionDir = rootDir / "session_99999999_finished"
+    for iRun in range(nRuns):
+        runDir = sessionDir / f"run_{iRun:04}"
+        runDir.mkdir(parents=True)
+        mtime = time.time() - 1000 - iRun
+        os.utime(runDir, (mtime, mtime))
+    return sessionDir
+
+
+def test_run_directories_remove_the_least_recently_used_runs_beyond_the_maximal_number_of_runs(tmp_path):
+    runDirs = RunDirectories(tmp_path)
+    oldest, old, recent = [a_run(runDirs, age_s=age_s) for age_s in [300, 200, 100]]
+    current = a_run(runDirs)
+
+    removed = runDirs.applyRetention(maxRuns=2, maxSize_mb=0, keepPaths=[oldest / "pytest_file_0.json"])
+    assert removed == [old]
+    assert oldest.is_dir() and recent.is_dir() and current.is_dir()
+
+
+def test_run_directories_remove_the_runs_beyond_the_maximal_size(tmp_path):
+    runDirs = RunDirectories(tmp_path)
+    old = a_run(runDirs, size=400_000, age_s=200)
+    recent = a_run(runDirs, size=400_000, age_s=100)
+    current = a_run(runDirs, size=400_000)
+
+    assert runDirs.applyRetention(maxRuns=0, maxSize_mb=1) == [old]
+    assert recent.is_dir() and current.is_dir()
+
+
+def test_run_directories_compress_the_old_runs(tmp_path):
+    runDirs = RunDirectories(tmp_path)
+    runs = [a_run(runDirs, age_s=100 * (5 - i)) for i in range(5)]
+
+    assert runDirs.applyRetention(maxRuns=0, maxSize_mb=0, doCompress=True) == []
+    assert [run.is_dir() for run in runs] == [False, False, True, True, True]
+    assert all(run.with_suffix(".zip").is_file() for run in runs[:2])
+
+
+def test_run_directories_clean_the_finished_sessions_but_not_the_running_ones(tmp_path):
+    finishedSession = a_finished_session(tmp_path, nRuns=3)
+    runningSession = RunDirectories(tmp_path)
+    a_run(runningSession, age_s=5000)
+
+    runDirs = RunDirectories(tmp_path)
+    a_run(runDirs)
+    runDirs.applyRetention(maxRuns=1, maxSize_mb=0)
+
+    assert not finishedSession.exists()
+    assert len(list(runningSession.sessionDir.iterdir())) == 1
+
+
+def test_runner_logic_writes_its_files_in_the_current_run_directory(tmp_path):
+    logic = RunnerLogic(slicer_path=tmp_path / "Slicer", runDirectories=RunDirectories(tmp_path))
+    firstRun = logic.runDirectories.currentRunDir()
+    filePath, _, _ = logic.updateTemFilePaths()
+    assert filePath.parent == firstRun
+
+    secondRun = logic.startNewRun(RunSettings())
+    assert secondRun != firstRun and logic.tmp_path == secondRun.as_posix()
+    assert logic.updateTemFilePaths()[1].parent == secondRun
+
+
+def test_run_directories_create_the_session_directory_with_the_first_run(tmp_path):
+    runDirs = RunDirectories(tmp_path / "runs")
+    RunnerLogic(slicer_path=tmp_path / "Slicer", runDirectories=runDirs)
+    runDirs.applyRetention(maxRuns=2, maxSize_mb=0)
+    assert not (tmp_path / "runs").exists()
+
+    runDir = runDirs.currentRunDir()
+    assert runDir.parent == runDirs.sessionDir and runDir.parent.parent == tmp_path / "runs"
@@ -1,5 +1,7 @@
 import os.path
+import sys
 from pathlib import Path
+from unittest import mock
 
 import pytest
 import qt
@@ -10,6 +12,7 @@ from SlicerPythonTestRunnerLib import (
     RunSettings,
     runTestInSlicerContext,
 )
+from SlicerPythonTestRunnerLib.RunDirectories import RunDirectories
 from Testing.utils import (
     a_failing_test_content,
     a_reporting_failing_test_content,
@@ -22,8 +25,8 @@ from Testing.utils import (
 
 
 @pytest.fixture()
-def a_test_runner():
-    return RunnerLogic()
+def a_test_runner(tmp_path_factory):
+    return RunnerLogic(runDirectories=RunDirectories(tmp_path_factory.mktemp("runs")))
 
 
 @pytest.fixture()
@@ -387,3 +390,26 @@ def test_runner_formats_pytest_args(a_test_runner, tmpdir, a_dir_with_three_test
     assert xml_file.name != file_name
     assert xml_file.name != "my_xml_file_{}.xml"
     assert xml_file.name != "my_xml_file_.xml"
+
+
+def test_runner_reports_worker_timings(a_test_runner, a_succeeding_test_file, tmpdir):
+    res = a_test_runner.runAndWaitFinished(tmpdir, RunSettings(doUseMainWindow=False))
+    assert len(res.workerTimings) == 1
+
+    timings = res.workerTimings[0]
+    assert 0 < timings.scriptStart <= timings.runnerImported <= timings.pytestStart <= timings.firstTestStart
+    assert timings.timeToFirstTest > 0
+
+
+def test_runner_test_file_only_imports_runner_core(a_test_runner, tmpdir):
+    file_path, _ = a_test_runner._createTestPythonFile(tmpdir, RunSettings())
+    content = file_path.read_text()
+    assert "from SlicerPythonTestRunnerLib import" not in content
+    assert "from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic" in content
+
+
+def test_package_exports_the_classes_and_keeps_the_submodules_patchable():
+    module = sys.modules["SlicerPythonTestRunnerLib.RunnerLogic"]
+    assert RunnerLogic is module.RunnerLogic
+    with mock.patch.object(module, "ensureRequirements") as ensureRequirements:
+        assert module.ensureRequirements is ensureRequirements
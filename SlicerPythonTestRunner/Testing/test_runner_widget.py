@@ -11,6 +11,8 @@ from SlicerPythonTestRunnerLib import (
 )
 from SlicerPythonTestRunnerLib.ExportDialog import ExportDialog
 from SlicerPythonTestRunnerLib.ProcessRunnerLogic import ProcessRunnerLogic
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.RunDirectories import RunDirectories
 from Testing.utils import (
     a_succeeding_test_file_with_two_tests_content,
     a_test_file_with_passing_failing_tests_content,
@@ -29,7 +31,7 @@ def test_a_runner_widget_can_be_created_and_displayed():
 @runTestInSlicerContext(RunSettings(doUseMainWindow=False, extraSlicerArgs=["--disable-modules"]))
 def test_a_runner_widget_can_display_test_results_and_clicked_cases(a_json_test_result_file, tmpdir):
     widget = RunnerWidget()
-    widget.onResultsAvailable(a_json_test_result_file)
+    widget.onResultsAvailable(a_json_test_result_file, Results.fromReportFile(a_json_test_result_file))
     assert widget.treeView.getCaseCount()
     widget.treeView.onItemClicked(None)
     assert widget.testResultTextEdit.toPlainText()
@@ -141,11 +143,12 @@ def test_runner_parallel_results_can_be_combined(a_folder_with_two_test_files, t
         extraSlicerArgs=["--disable-modules"],
     )
 )
-def test_runner_doesnt_hang_on_empty_parallel_run(tmpdir):
+def test_runner_doesnt_hang_on_empty_parallel_run(tmpdir, tmp_path_factory):
     runSettings = ModuleSettings().lastRunSettings
     runSettings.doRunTestFilesIndependently = True
 
     logic = ProcessRunnerLogic()
+    logic.logic.runDirectories = RunDirectories(tmp_path_factory.mktemp("runs"))
     logic.startTest(
         testDir=Path(tmpdir), functionPattern="", filePattern="", runSettings=runSettings, doCollectOnly=False
     )
@@ -0,0 +1,32 @@
+from SlicerPythonTestRunnerLib.Case import Case
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.SceneLeaks import SceneSnapshot, sceneLeaks
+
+
+def test_scene_leaks_report_the_nodes_left_by_the_test_and_the_growth_after_reset():
+    before = SceneSnapshot({"vtkMRMLSelectionNodeSingleton": 1}, vtkObjects=10)
+    afterTest = SceneSnapshot(
+        {"vtkMRMLSelectionNodeSingleton": 1, "vtkMRMLScalarVolumeNode": 2, "vtkMRMLTableNode": 1}, vtkObjects=30
+    )
+    afterReset = SceneSnapshot({"vtkMRMLSelectionNodeSingleton": 1, "vtkMRMLTableNode": 1}, vtkObjects=12)
+
+    assert sceneLeaks(before, afterTest, afterReset) == {
+        "nodes": {"vtkMRMLScalarVolumeNode": 2, "vtkMRMLTableNode": 1},
+        "remainingNodes": {"vtkMRMLTableNode": 1},
+        "vtkObjects": 2,
+    }
+    assert sceneLeaks(before, before, before) == {}
+
+
+def test_scene_leaks_are_parsed_from_the_test_report_metadata():
+    leaks = {"nodes": {"vtkMRMLScalarVolumeNode": 2}}
+    leaking = Case.fromExecutedTestDict(
+        {"nodeid": "test_a.py::test_1", "outcome": "passed", "metadata": {"sceneLeaks": leaks}}
+    )
+    clean = Case.fromExecutedTestDict({"nodeid": "test_a.py::test_2", "outcome": "passed"})
+
+    results = Results([leaking, clean])
+    assert [case.nodeid for case in results.getLeakingCases()] == ["test_a.py::test_1"]
+    assert results.getSceneLeaksString() == (
+        "test_a.py::test_1\nScene leaks:\n  Nodes left in the scene: vtkMRMLScalarVolumeNode x2"
+    )
@@ -0,0 +1,54 @@
+from SlicerPythonTestRunnerLib.Sharding import fixtureAwareGroups, shardNodeIds
+
+
+def a_file_node_ids(n):
+    return [f"test_seg.py::test_case[{i}]" for i in range(n)]
+
+
+def test_short_files_are_not_split():
+    nodeIds = a_file_node_ids(10)
+    durations = {nodeId: 1.0 for nodeId in nodeIds}
+    assert shardNodeIds(nodeIds, durations, threshold_s=60, maxShards=4) == [nodeIds]
+    assert shardNodeIds(nodeIds, {}, threshold_s=1, maxShards=4) == [nodeIds]
+    assert shardNodeIds(nodeIds, durations, threshold_s=0, maxShards=4) == [nodeIds]
+
+
+def test_long_files_are_split_in_contiguous_shards_of_similar_duration():
+    nodeIds = a_file_node_ids(600)
+    durations = {nodeId: 2.5 for nodeId in nodeIds[:300]}
+
+    shards = shardNodeIds(nodeIds, durations, threshold_s=120, maxShards=4)
+    assert len(shards) == 4
+    assert [nodeId for shard in shards for nodeId in shard] == nodeIds
+    assert all(len(shard) == 150 for shard in shards)
+
+
+def test_shards_are_balanced_by_duration():
+    nodeIds = a_file_node_ids(4)
+    durations = dict(zip(nodeIds, [30.0, 10.0, 10.0, 10.0]))
+    assert shardNodeIds(nodeIds, durations, threshold_s=30, maxShards=2) == [nodeIds[:1], nodeIds[1:]]
+
+
+def test_files_with_collection_errors_are_not_split():
+    nodeIds = ["test_seg.py", *a_file_node_ids(10)]
+    durations = {nodeId: 100.0 for nodeId in nodeIds}
+    assert shardNodeIds(nodeIds, durations, threshold_s=1, maxShards=4) == [nodeIds]
+
+
+def test_groups_sharing_a_costly_fixture_are_merged_within_worker_balance():
+    groups = [["test_a.py::test_1"], ["test_b.py::test_2"], ["test_c.py::test_3"], ["test_d.py::test_4"]]
+    fixtureUsage = {
+        "test_a.py::test_1": ["scene"],
+        "test_b.py::test_2": ["scene", "volume"],
+        "test_c.py::test_3": ["scene"],
+        "test_d.py::test_4": ["volume"],
+    }
+    setupDurations = {"scene": 5.0, "volume": 0.1}
+    durations = {nodeId: 1.0 for group in groups for nodeId in group}
+
+    assert fixtureAwareGroups(groups, fixtureUsage, setupDurations, durations, nWorkers=2) == [
+        ["test_a.py::test_1", "test_b.py::test_2"],
+        ["test_c.py::test_3"],
+        ["test_d.py::test_4"],
+    ]
+    assert fixtureAwareGroups(groups, fixtureUsage, {"scene": 0.5}, durations, nWorkers=2) == groups
@@ -0,0 +1,69 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from SlicerPythonTestRunnerLib.SharedDataCache import SharedDataCache
+
+
+def test_shared_data_is_loaded_once_and_memory_mapped(tmp_path):
+    loads = []
+
+    def loadF():
+        loads.append(1)
+        return np.arange(24, dtype=np.int16).reshape(2, 3, 4), {"spacing": [1.0, 2.0, 3.0]}
+
+    with ThreadPoolExecutor(4) as executor:
+        arrays = list(executor.map(lambda _: SharedDataCache(tmp_path).array("volume", loadF), range(4)))
+
+    assert len(loads) == 1
+    for array, metadata in arrays:
+        assert isinstance(array, np.memmap)
+        assert array.shape == (2, 3, 4)
+        assert metadata == {"spacing": [1.0, 2.0, 3.0]}
+
+
+def test_shared_data_arrays_are_copy_on_write(tmp_path):
+    cache = SharedDataCache(tmp_path)
+    array, _ = cache.array("volume", lambda: (np.zeros(10), {}))
+    array[:] = 1
+
+    array, _ = cache.array("volume", lambda: (np.ones(10), {}))
+    assert array.sum() == 0
+
+
+def test_shared_file_dataset_name_changes_with_the_file(tmp_path):
+    filePath = tmp_path / "volume.nrrd"
+    filePath.write_bytes(b"0")
+    name = SharedDataCache.fileDatasetName(filePath)
+
+    filePath.write_bytes(b"01")
+    os.utime(filePath, (1, 1))
+    assert SharedDataCache.fileDatasetName(filePath) != name
+    assert SharedDataCache.fileDatasetName(filePath).startswith("volume.nrrd_")
+
+
+def test_shared_data_retention_removes_the_least_recently_used_datasets(tmp_path):
+    cache = SharedDataCache(tmp_path)
+    for i, name in enumerate(["old", "recent", "loading"]):
+        cache.array(name, lambda: (np.zeros(512 * 1024, dtype=np.uint8), {}))
+        os.utime(tmp_path / f"{name}.json", (i, i))
+    tmp_path.joinpath("loading.lock").touch()
+
+    cache.applyRetention(maxSize_mb=1)
+    assert not cache.contains("old")
+    assert cache.contains("recent")
+    assert cache.contains("loading")
+
+
+def test_shared_data_lock_is_refreshed_while_loading(tmp_path):
+    cache = SharedDataCache(tmp_path, lockTimeout_s=0.2)
+
+    def loadF():
+        time.sleep(0.3)
+        lockAge = time.time() - (tmp_path / "volume.lock").stat().st_mtime
+        return np.zeros(1), {"lockAge": lockAge}
+
+    _, metadata = cache.array("volume", loadF)
+    assert metadata["lockAge"] < 0.2
+    assert not (tmp_path / "volume.lock").exists()
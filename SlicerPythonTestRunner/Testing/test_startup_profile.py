@@ -0,0 +1,54 @@
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.StartupProfile import (
+    StartupProfile,
+    findReferencedModules,
+    recommendModulesToIgnore,
+)
+
+
+def test_referenced_modules_can_be_found_in_test_sources():
+    sources = [
+        "import slicer\n" "from Segmentations import SegmentationsLogic\n",
+        "def test_volumes():\n" "  slicer.modules.volumes.logic()\n",
+    ]
+    referenced = findReferencedModules(sources, ["Segmentations", "Volumes", "Markups"])
+    assert referenced == {"Segmentations", "Volumes"}
+
+
+def test_referenced_modules_include_the_prefixes_of_imported_names():
+    sources = ["import slicer\nimport SegmentEditorEffects\n", "myextension = slicer.modules.myextension\n"]
+    referenced = findReferencedModules(sources, ["SegmentEditor", "MyExtension", "Segmentations", "DICOM"])
+    assert referenced == {"SegmentEditor", "MyExtension"}
+
+
+def test_recommended_modules_to_ignore_keep_used_module_dependencies():
+    dependencies = {"Segmentations": ["Terminologies"], "Terminologies": ["SubjectHierarchy"]}
+    loaded = ["Segmentations", "Terminologies", "SubjectHierarchy", "Markups", "Models"]
+    assert recommendModulesToIgnore(loaded, ["Segmentations"], dependencies) == ["Markups", "Models"]
+
+
+def test_startup_profile_phase_durations():
+    profile = StartupProfile(
+        launcherCreated=100, applicationCreated=101, scriptStart=110, runnerImported=110.5, pytestImportDuration=0.7
+    )
+    assert profile.phaseDurations == {"launcher": 1, "application": 9, "runnerImport": 0.5, "pytestImport": 0.7}
+
+
+def test_startup_profile_can_be_converted_to_and_from_dict():
+    profile = StartupProfile(loadedModules={"scripted": ["A"], "loadable": ["B"]}, recommendedModulesToIgnore=["B"])
+    assert StartupProfile.fromDict({**profile.asDict(), "unknown": 0}) == profile
+    assert profile.allLoadedModules == ["A", "B"]
+
+
+def test_results_startup_profile_string_averages_phases_and_lists_common_modules_to_ignore():
+    results = Results(
+        [],
+        startupProfiles=[
+            StartupProfile(launcherCreated=100, applicationCreated=101, recommendedModulesToIgnore=["A", "B"]),
+            StartupProfile(launcherCreated=100, applicationCreated=103, recommendedModulesToIgnore=["B"]),
+        ],
+    )
+    string = results.getStartupProfileString()
+    assert "launcher: 2.00 s" in string
+    assert string.endswith("  B")
+    assert Results([]).getStartupProfileString() == ""
@@ -0,0 +1,58 @@
+from coverage import CoverageData
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.TestCoverage import (
+    CoverageCombiner,
+    coverage_data_path,
+    coverage_data_suffix,
+    in_directory,
+    write_cov_report,
+)
+
+
+def a_coverage_fragment(tmp_path, suffix, lines):
+    src = tmp_path.joinpath("src.py")
+    src.write_text("\n".join(f"x{i} = {i}" for i in range(10)))
+    data = CoverageData(basename=tmp_path.joinpath(".coverage").as_posix(), suffix=suffix)
+    data.add_lines({src.as_posix(): lines})
+    data.write()
+    return src
+
+
+def test_coverage_data_suffix_is_unique_per_report():
+    assert coverage_data_suffix("/tmp/abc/pytest_file_1.json") == "abc.pytest_file_1"
+    assert coverage_data_suffix("/tmp/abc/pytest_file_1.json") != coverage_data_suffix("/tmp/def/pytest_file_1.json")
+
+
+def test_coverage_fragments_are_combined_in_the_background_as_they_finish(tmp_path):
+    src = a_coverage_fragment(tmp_path, "worker_1", [1, 2])
+    a_coverage_fragment(tmp_path, "worker_2", [5])
+
+    combiner = CoverageCombiner(tmp_path)
+    combiner.add("worker_1")
+    combiner.add("worker_3")
+    combiner.wait()
+    assert not tmp_path.joinpath(".coverage.worker_1").exists()
+    assert tmp_path.joinpath(".coverage.worker_2").exists()
+
+    combiner.add("worker_2")
+    combiner.wait()
+    data = CoverageData(basename=tmp_path.joinpath(".coverage").as_posix())
+    data.read()
+    assert sorted(data.lines(src.as_posix())) == [1, 2, 5]
+
+
+def test_coverage_reports_can_be_written_in_parallel(tmp_path):
+    a_coverage_fragment(tmp_path, "worker_1", [1, 2])
+    tmp_path.joinpath(".coveragerc").write_text("[json]\noutput = report.json\n[xml]\noutput = report.xml\n")
+
+    with in_directory(tmp_path):
+        write_cov_report(RunSettings(doRunCoverage=True, coverageReportFormats=["json", "xml"]))
+
+    assert tmp_path.joinpath("report.json").is_file()
+    assert tmp_path.joinpath("report.xml").is_file()
+
+
+def test_coverage_data_path_follows_the_coverage_configuration(tmp_path):
+    assert coverage_data_path(tmp_path) == tmp_path.joinpath(".coverage").resolve()
+    tmp_path.joinpath(".coveragerc").write_text("[run]\ndata_file = reports/coverage.db\n")
+    assert coverage_data_path(tmp_path) == tmp_path.joinpath("reports", "coverage.db").resolve()
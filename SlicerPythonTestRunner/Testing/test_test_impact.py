@@ -0,0 +1,90 @@
+from coverage import CoverageData
+from SlicerPythonTestRunnerLib.TestImpact import (
+    changedLinesFromMtime,
+    findImpactedTests,
+    impactedTests,
+    parseDiffChangedLines,
+)
+
+
+def a_coverage_data_with_contexts(tmp_path):
+    src = tmp_path.joinpath("src.py")
+    src.write_text("\n".join(f"x{i} = {i}" for i in range(10)))
+    tmp_path.joinpath("test_a.py").write_text("def test_a(): pass\ndef test_b(): pass\n")
+
+    data = CoverageData(basename=tmp_path.joinpath(".coverage").as_posix())
+    data.set_context("")
+    data.add_lines({src.as_posix(): [1, 2, 3, 4, 5]})
+    data.set_context("test_a.py::test_a")
+    data.add_lines({src.as_posix(): [1, 2]})
+    data.set_context("test_a.py::test_b")
+    data.add_lines({src.as_posix(): [4, 5]})
+    data.write()
+    return tmp_path.joinpath(".coverage"), src
+
+
+def test_diff_changed_lines_are_expressed_in_base_revision(tmp_path):
+    diff = (
+        "diff --git a/src.py b/src.py\n"
+        "--- a/src.py\n"
+        "+++ b/src.py\n"
+        "@@ -2 +2 @@\n"
+        "-x1 = 1\n"
+        "+x1 = 2\n"
+        "@@ -7,0 +8,2 @@\n"
+        "+y = 1\n"
+        "+z = 1\n"
+        "diff --git a/new.py b/new.py\n"
+        "--- /dev/null\n"
+        "+++ b/new.py\n"
+        "@@ -0,0 +1 @@\n"
+        "+a = 1\n"
+    )
+    changed = parseDiffChangedLines(diff, tmp_path)
+    assert changed == {tmp_path.joinpath("src.py").resolve(): {2, 7, 8}, tmp_path.joinpath("new.py").resolve(): None}
+
+
+def test_impacted_tests_are_the_ones_covering_changed_lines(tmp_path):
+    dataPath, src = a_coverage_data_with_contexts(tmp_path)
+    assert impactedTests(dataPath, {src.resolve(): {4}}, tmp_path) == ["test_a.py::test_b"]
+    assert impactedTests(dataPath, {src.resolve(): {3}}, tmp_path) == []
+    assert impactedTests(dataPath, {src.resolve(): None}, tmp_path) == ["test_a.py::test_a", "test_a.py::test_b"]
+
+
+def test_changed_test_files_select_all_their_tests(tmp_path):
+    dataPath, _ = a_coverage_data_with_contexts(tmp_path)
+    changed = {tmp_path.joinpath("test_a.py").resolve(): {1}}
+    assert impactedTests(dataPath, changed, tmp_path) == ["test_a.py::test_a", "test_a.py::test_b"]
+
+
+def test_unknown_changed_python_files_require_a_full_run(tmp_path):
+    dataPath, _ = a_coverage_data_with_contexts(tmp_path)
+    assert impactedTests(dataPath, {tmp_path.joinpath("conftest.py").resolve(): None}, tmp_path) is None
+    assert impactedTests(dataPath, {tmp_path.joinpath("README.md").resolve(): None}, tmp_path) == []
+
+
+def test_files_modified_after_coverage_data_are_changed(tmp_path):
+    import os
+
+    dataPath, src = a_coverage_data_with_contexts(tmp_path)
+    dataMTime = dataPath.stat().st_mtime
+    os.utime(src, (dataMTime + 10, dataMTime + 10))
+    os.utime(tmp_path.joinpath("test_a.py"), (dataMTime - 10, dataMTime - 10))
+    assert changedLinesFromMtime(dataPath, [src, tmp_path.joinpath("test_a.py")]) == {src.resolve(): None}
+
+
+def test_impacted_tests_are_relative_to_the_pytest_root_directory(tmp_path):
+    import os
+
+    testDir = tmp_path.joinpath("Testing")
+    testDir.mkdir()
+    data = CoverageData(basename=testDir.joinpath(".coverage").as_posix())
+    data.set_context("Testing/test_a.py::test_a")
+    data.add_lines({tmp_path.joinpath("src.py").as_posix(): [1]})
+    data.write()
+    testDir.joinpath("test_a.py").write_text("def test_a(): pass\n")
+    dataMTime = testDir.joinpath(".coverage").stat().st_mtime
+    os.utime(testDir.joinpath("test_a.py"), (dataMTime + 10, dataMTime + 10))
+
+    assert findImpactedTests(testDir, rootDir=tmp_path) == ["Testing/test_a.py::test_a"]
+    assert findImpactedTests(testDir) is None
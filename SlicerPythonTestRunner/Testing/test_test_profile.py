@@ -0,0 +1,65 @@
+import cProfile
+
+from SlicerPythonTestRunnerLib.Case import Case
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.TestProfile import (
+    hotFunctions,
+    mergeProfiles,
+    profileFileName,
+)
+from SlicerPythonTestRunnerLib.WorkQueue import WorkQueue
+from Testing.utils import start_worker
+
+
+def a_slow_function():
+    return sum(i * i for i in range(200000))
+
+
+def a_fast_function():
+    return 1
+
+
+def a_profile(path, f):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    f()
+    profiler.disable()
+    profiler.dump_stats(path.as_posix())
+    return path
+
+
+def test_profile_file_names_are_unique_per_node_id():
+    names = {profileFileName(f"test_a.py::test_case[{value}]") for value in ["a/b", "a_b", "a b"]}
+    assert len(names) == 3
+    assert all(name.endswith(".prof") and "/" not in name for name in names)
+
+
+def test_profiles_are_merged_and_report_the_hot_functions(tmp_path):
+    paths = [a_profile(tmp_path / "slow.prof", a_slow_function), a_profile(tmp_path / "fast.prof", a_fast_function)]
+
+    functions = [f["function"] for f in hotFunctions(paths)]
+    assert "a_fast_function" in " ".join(functions)
+    assert functions.index(next(f for f in functions if "<genexpr>" in f)) == 0
+    assert mergeProfiles(paths, tmp_path / "run.prof").is_file()
+    assert mergeProfiles([tmp_path / "missing.prof"], tmp_path / "none.prof") is None
+
+    results = Results([Case("test_a.py::test_slow", profilePath=paths[0].as_posix()), Case("test_a.py::test_2")])
+    assert results.getHotFunctionsString().startswith("Hot functions:")
+
+
+def test_workers_write_a_profile_per_test_next_to_the_report(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text("def test_1():\n    pass\n\ndef test_2():\n    pass\n")
+
+    queue = WorkQueue(tmp_path / "queue")
+    queue.put([testDir.joinpath("test_a.py").as_posix()])
+    queue.close()
+
+    runSettings = RunSettings(doUseMainWindow=False, doProfileTests=True)
+    assert start_worker(testDir, queue.queueDir, runSettings).wait(timeout=120) == 0
+
+    profilePaths = Results.fromReportFile(queue.takeFinishedItems()[0]).getProfilePaths()
+    assert len(profilePaths) == 2
+    assert all(path.is_file() and path.parent.name == "000000_profiles" for path in profilePaths)
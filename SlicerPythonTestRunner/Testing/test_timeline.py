@@ -0,0 +1,64 @@
+import json
+
+from SlicerPythonTestRunnerLib import WorkerTimings
+from SlicerPythonTestRunnerLib.Timeline import ProcessRecord, RunTimeline
+
+
+def a_process_record(name, slot, started, finished):
+    # Timestamps are expressed relative to an arbitrary epoch time as 0 timestamps are considered unset
+    started, finished = started + 1000, finished + 1000
+    timings = WorkerTimings(
+        scriptStart=started + 1,
+        pytestStart=started + 1.5,
+        firstTestStart=started + 2,
+        sessionFinish=finished - 0.5,
+        tests=[[f"{name}::test_1", started + 2, finished - 0.5]],
+    )
+    return ProcessRecord(name=name, slot=slot, queued=1000, started=started, finished=finished, workerTimings=timings)
+
+
+def a_timeline():
+    timeline = RunTimeline(poolSize=2)
+    timeline.addProcess(a_process_record("test_a.py", 0, 0, 10))
+    timeline.addProcess(a_process_record("test_b.py", 1, 0, 4))
+    timeline.addProcess(a_process_record("test_c.py", 1, 4, 8))
+    return timeline
+
+
+def test_a_timeline_computes_run_summary():
+    summary = a_timeline().summary()
+    assert summary["wall_s"] == 10
+    assert summary["utilization"] == 18 / 20
+    assert summary["startupOverhead_s"] == 6
+    assert summary["queueTime_s"] == 4
+    assert summary["longestProcess"] == {"name": "test_a.py", "duration_s": 10}
+    assert [p["name"] for p in summary["criticalPath"]] == ["test_a.py"]
+    assert summary["testTime_s"] == 10.5
+
+
+def test_a_timeline_reports_coverage_overhead():
+    timeline = a_timeline()
+    timeline.records[0].workerTimings.coverageCore = "sysmon"
+    timeline.records[0].workerTimings.coverageStartDuration = 0.25
+
+    summary = timeline.summary()
+    assert summary["coverageCores"] == ["sysmon"]
+    assert summary["coverageStartup_s"] == 0.25
+    assert "coverage startup" in {event["name"] for event in timeline.toChromeTrace()["traceEvents"]}
+
+
+def test_an_empty_timeline_has_empty_summary():
+    summary = RunTimeline().summary()
+    assert summary["wall_s"] == 0
+    assert summary["criticalPath"] == []
+
+
+def test_a_timeline_can_be_exported_as_chrome_trace(tmpdir):
+    file_path = tmpdir.join("timeline.json")
+    a_timeline().writeChromeTrace(file_path)
+
+    trace = json.loads(file_path.read())
+    names = {event["name"] for event in trace["traceEvents"]}
+    assert {"test_a.py", "slicer startup", "runner bootstrap", "test_a.py::test_1", "exit"}.issubset(names)
+    assert all(event["dur"] >= 0 for event in trace["traceEvents"] if event["ph"] == "X")
+    assert trace["otherData"]["wall_s"] == 10
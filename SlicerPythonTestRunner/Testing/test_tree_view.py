@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 
 import pytest
 from SlicerPythonTestRunnerLib import (
+    Case,
     Outcome,
     Results,
     RunnerLogic,
@@ -11,6 +12,7 @@ from SlicerPythonTestRunnerLib import (
     TreeView,
     runTestInSlicerContext,
 )
+from SlicerPythonTestRunnerLib.RunDirectories import RunDirectories
 from Testing.utils import (
     a_file_with_one_passed_one_failed_one_skipped_content,
     write_file,
@@ -74,10 +76,13 @@ def test_a_tree_view_notifies_clicked_cases(a_json_test_result_file):
 
 
 @runTestInSlicerContext(RunSettings(doUseMainWindow=False, extraSlicerArgs=["--disable-modules"]))
-def test_a_tree_view_can_filter_passed_and_ignored_tests(a_file_with_one_passed_one_failed_one_skipped, tmpdir):
+def test_a_tree_view_can_filter_passed_and_ignored_tests(
+    a_file_with_one_passed_one_failed_one_skipped, tmpdir, tmp_path_factory
+):
     import slicer
 
-    results = RunnerLogic().runAndWaitFinished(tmpdir, RunSettings(doUseMainWindow=False))
+    logic = RunnerLogic(runDirectories=RunDirectories(tmp_path_factory.mktemp("runs")))
+    results = logic.runAndWaitFinished(tmpdir, RunSettings(doUseMainWindow=False))
     assert results.executedNumber == 3
 
     view = TreeView()
@@ -95,3 +100,60 @@ def test_a_tree_view_can_filter_passed_and_ignored_tests(a_file_with_one_passed_
     view.setShowIgnored(False)
     slicer.app.processEvents()
     assert view.getDisplayedRowCount() == fullCount - 2
+
+
+@runTestInSlicerContext(RunSettings(doUseMainWindow=False, extraSlicerArgs=["--disable-modules"]))
+def test_a_tree_view_updates_rerun_results_in_place():
+    view = TreeView()
+    view.appendResults(
+        Results(
+            [
+                Case("test_a.py::TestA::test_1", Outcome.failed),
+                Case("test_a.py::TestA::test_2", Outcome.passed),
+                Case("test_a.py::TestA::test_removed", Outcome.passed),
+                Case("test_b.py::test_1", Outcome.failed),
+            ]
+        )
+    )
+    firstItem = view.nodeIdItemDict["test_a.py::TestA::test_1"]
+
+    view.updateResults(
+        Results([Case("test_a.py::TestA::test_1", Outcome.passed), Case("test_a.py::TestA::test_2", Outcome.passed)]),
+        ["test_a.py::TestA"],
+    )
+
+    assert view.nodeIdItemDict["test_a.py::TestA::test_1"] is firstItem
+    assert view.getOutcomes() == {
+        "test_a.py": Outcome.passed,
+        "test_a.py::TestA": Outcome.passed,
+        "test_a.py::TestA::test_1": Outcome.passed,
+        "test_a.py::TestA::test_2": Outcome.passed,
+        "test_b.py": Outcome.failed,
+        "test_b.py::test_1": Outcome.failed,
+    }
+    assert view.getCaseCount() == 3
+    assert view.lastResults.executedNumber == 3
+
+
+@runTestInSlicerContext(RunSettings(doUseMainWindow=False, extraSlicerArgs=["--disable-modules"]))
+def test_a_tree_view_removes_the_parents_of_removed_tests_left_empty():
+    view = TreeView()
+    view.appendResults(
+        Results(
+            [
+                Case("test_a.py::TestA::test_1", Outcome.passed),
+                Case("test_a.py::TestRemoved::test_1", Outcome.failed),
+                Case("test_b.py::test_1", Outcome.failed),
+            ]
+        )
+    )
+
+    view.updateResults(Results([Case("test_a.py::TestA::test_1", Outcome.passed)]), ["test_a.py"])
+
+    assert view.getOutcomes() == {
+        "test_a.py": Outcome.passed,
+        "test_a.py::TestA": Outcome.passed,
+        "test_a.py::TestA::test_1": Outcome.passed,
+        "test_b.py": Outcome.failed,
+        "test_b.py::test_1": Outcome.failed,
+    }
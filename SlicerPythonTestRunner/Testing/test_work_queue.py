@@ -0,0 +1,101 @@
+from SlicerPythonTestRunnerLib.Results import Results
+from SlicerPythonTestRunnerLib.Settings import RunSettings
+from SlicerPythonTestRunnerLib.Sharding import dispatchGroups
+from SlicerPythonTestRunnerLib.WorkQueue import WorkQueue
+from Testing.utils import start_worker
+
+
+def test_work_queue_items_are_claimed_once(tmp_path):
+    queue = WorkQueue(tmp_path)
+    queue.put(["test_a.py::test_1"])
+    queue.put(["test_a.py::test_2", "test_a.py::test_3"])
+
+    other = WorkQueue(tmp_path)
+    first, second = queue.claim(), other.claim()
+    assert first == ("000000", ["test_a.py::test_1"])
+    assert second == ("000001", ["test_a.py::test_2", "test_a.py::test_3"])
+    assert queue.claim() is None
+
+    queue.close()
+    assert other.nextItem() is None
+
+
+def test_work_queue_reports_done_and_lost_items(tmp_path):
+    queue = WorkQueue(tmp_path)
+    for i in range(3):
+        queue.put([f"test_a.py::test_{i}"])
+    queue.close()
+
+    done, lost, _ = queue.claim(), queue.claim(), queue.claim()
+    queue.markDone(done[0])
+    assert queue.takeFinishedItems() == [queue.reportPath(done[0])]
+    assert queue.takeFinishedItems() == []
+    assert queue.takeLostItems() == [queue.reportPath(lost[0]), queue.reportPath("000002")]
+
+
+def test_dispatch_groups_keep_classes_together_and_start_with_the_longest():
+    nodeIds = ["test_a.py::TestA::test_1", "test_a.py::TestA::test_2", "test_a.py::test_3", "test_b.py::test_4"]
+    durations = dict(zip(nodeIds, [1.0, 1.0, 1.5, 10.0]))
+
+    assert dispatchGroups(nodeIds, "class", durations) == [
+        ["test_b.py::test_4"],
+        ["test_a.py::TestA::test_1", "test_a.py::TestA::test_2"],
+        ["test_a.py::test_3"],
+    ]
+    assert len(dispatchGroups(nodeIds, "test", durations)) == 4
+    assert len(dispatchGroups(nodeIds, "module", durations)) == 2
+
+
+def test_persistent_workers_run_the_queue_until_empty(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text(
+        "def test_1():\n    pass\n\ndef test_2():\n    assert False\n\ndef test_3():\n    pass\n"
+    )
+
+    queue = WorkQueue(tmp_path / "queue")
+    for nodeId in ["test_1", "test_2", "test_3"]:
+        queue.put([testDir.joinpath(f"test_a.py::{nodeId}").as_posix()])
+    queue.close()
+
+    workers = [
+        start_worker(testDir, queue.queueDir, RunSettings(doUseMainWindow=False), f"worker_{i}") for i in range(2)
+    ]
+    assert [worker.wait(timeout=120) for worker in workers] == [0, 0]
+
+    results = Results([])
+    results.extend([Results.fromReportFile(reportPath) for reportPath in queue.takeFinishedItems()])
+    assert results.executedNumber == 3
+    assert results.failuresNumber == 1
+    assert sorted(case.nodeid for case in results.getAllCases()) == [
+        "test_a.py::test_1",
+        "test_a.py::test_2",
+        "test_a.py::test_3",
+    ]
+    assert queue.takeLostItems() == []
+
+
+def test_workers_record_the_shared_fixtures_usage_and_set_up(tmp_path):
+    testDir = tmp_path / "tests"
+    testDir.mkdir()
+    testDir.joinpath("test_a.py").write_text(
+        "import pytest\n\n"
+        "@pytest.fixture(scope='module')\ndef volume():\n    return 1\n\n"
+        "def test_1(volume, tmp_path):\n    pass\n\ndef test_2(volume):\n    pass\n"
+    )
+
+    queue = WorkQueue(tmp_path / "queue")
+    queue.put([testDir.joinpath("test_a.py").as_posix()])
+    queue.close()
+
+    assert start_worker(testDir, queue.queueDir, RunSettings(doUseMainWindow=False)).wait(timeout=120) == 0
+
+    results = Results.fromReportFile(queue.takeFinishedItems()[0])
+    assert results.fixtureUsage == {
+        "test_a.py::test_1": ["tmp_path_factory", "test_a.py::volume"],
+        "test_a.py::test_2": ["test_a.py::volume"],
+    }
+    assert sorted(fixture[:2] for fixture in results.workerTimings[0].fixtures) == [
+        ["test_a.py::volume", "module"],
+        ["tmp_path_factory", "session"],
+    ]
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 
 
@@ -70,3 +72,19 @@ def write_file(tmpdir, file_path, file_content):
     with open(file_path, "w") as f:
         f.write(file_content)
     return file_path
+
+
+def start_worker(testDir, queueDir, runSettings, workerName="worker"):
+    """
+    Starts a persistent test worker process running the items of the input work queue until it is empty.
+    """
+    settingsPath = Path(testDir).parent.joinpath(f"{workerName}_settings.json")
+    runSettings.toFile(settingsPath)
+    libDir = Path(__file__).parent.parent.resolve().as_posix()
+    script = (
+        f"import sys; sys.path.insert(0, r'{libDir}')\n"
+        "from SlicerPythonTestRunnerLib.RunnerLogic import RunnerLogic\n"
+        "from SlicerPythonTestRunnerLib.Settings import RunSettings\n"
+        f"RunnerLogic.runWorkerAndExit(r'{testDir}', r'{queueDir}', '{workerName}', RunSettings.fromFile(r'{settingsPath}'))\n"
+    )
+    return subprocess.Popen([sys.executable, "-c", script], cwd=testDir)